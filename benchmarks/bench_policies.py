@@ -0,0 +1,106 @@
+"""
+Benchmark for the cost of the row level security policies. A test database with EVENTS copies of a small event is created, every other one of them private, and the same queries are timed as a member of admins, whose policies let every row through, and as a member of default_users. The difference between the two is the time spent on the policies.
+
+The test database and the two benchmark roles are removed at the end. Run from the root of the repository with nordb installed or on the PYTHONPATH::
+
+    PYTHONPATH=. python benchmarks/bench_policies.py
+"""
+import timeit
+
+from nordb import settings
+from nordb.core import nordic
+from nordb.core import usernameUtilities
+from nordb.database import norDBManagement
+from nordb.database import nordic2sql
+from nordb.database import sql2nordic
+from nordb.database.nordicSearch import NordicSearch
+
+EVENTS = 5000
+READ_EVENTS = 100
+REPEAT = 5
+ROLES = [("admin", "nordb_bench_admin", "admins"), ("default user", "nordb_bench_user", "default_users")]
+
+BENCH_EVENT = [
+    " 2013 0103 0614 00.1 LE 63.635  22.913  0.0F HEL 15 0.3 1.6LHEL 1.4LUPP        1\n",
+    " GAP= 80         0.1     0.391   0.477                  0.0                    5\n",
+    " CSS:2013003061203.WFDISC  (DET3C)                                             6\n",
+    " FULLY AUTOMATIC, EVENT TYPE & LOCATION & MAGNITUDE CHECKED (NIH)              3\n",
+    " 2013 0103 0613 04.0 LE 63.650  22.942  0.0FFHEL 11 0.4 1.6LHEL                1\n",
+    " STAT SP IPHASW D HRMM SECON CODA AMPLIT PERI AZIMU VELO SNR AR TRES W  DIS CAZ7\n",
+    " VAF  BZ EP       0613 15.30                    7.0              0.210   67 191 \n",
+    " VAF  BZ ES       0613 23.10                                     0.4 4          \n",
+    " UMAU BZ EP       0613 22.64                                     0.010  114 285 \n",
+    " BURU BZ EPB      0613 25.08                  141.0             -0.1 9  130 325 \n",
+    " BURU BZ ES       0613 39.82                                    -0.3 4          \n",
+    " KEF  BZ EPN      0613 35.36                                     0.0 4  192 148 \n",
+    " SUF  BZ  MSG     0613 55.58         3.6 0.20                                   \n",
+    " OUL  BZ EPG      0613 39.06                  224.0             -0.2 4  217  40 \n",
+    " KAF  BZ  MSG     0614 08.53         2.7 0.20                                   \n",
+    " TOF  BZ ESB      0614 20.10                                    -0.1 0          \n",
+]
+
+def createEvents(count, conn):
+    """
+    Function for inserting count copies of BENCH_EVENT into the database. Every other event is private.
+
+    :param int count: amount of events inserted
+    :param psycopg2.connection conn: connection to the database
+    """
+    for privacy_level in ["public", "private"]:
+        nordic2sql.events2Database([nordic.readNordic(BENCH_EVENT, False) for i in range(count // 2)],
+                                   privacy_level = privacy_level,
+                                   db_conn = conn)
+
+def countQuery(query):
+    def count(conn):
+        cur = conn.cursor()
+        cur.execute(query)
+        return cur.fetchone()[0]
+    return count
+
+def searchMagnitude(conn):
+    search = NordicSearch()
+    search.addSearchOver("magnitude_1", 1.5)
+    return sum(1 for row in search.iterEventIdAndDate(db_conn = conn))
+
+def readEvents(conn):
+    return len(sql2nordic.getNordic(list(range(1, READ_EVENTS + 1)), conn))
+
+QUERIES = [
+    ("count events", countQuery("SELECT COUNT(*) FROM nordic_event")),
+    ("count main headers", countQuery("SELECT COUNT(*) FROM nordic_header_main")),
+    ("count phases", countQuery("SELECT COUNT(*) FROM nordic_phase_data")),
+    ("search magnitude", searchMagnitude),
+    ("read {0} events".format(READ_EVENTS), readEvents),
+]
+
+def main():
+    settings.setTest()
+    norDBManagement.createDatabase()
+    conn = usernameUtilities.log2nordb()
+    cur = conn.cursor()
+    try:
+        for name, role, group in ROLES:
+            cur.execute("CREATE ROLE {0} IN ROLE {1}".format(role, group))
+        createEvents(EVENTS, conn)
+        conn.commit()
+        cur.execute("ANALYZE")
+
+        print("{0:<20} {1:>10} {2:>16} {3:>8}".format("query", "admin (s)", "default user (s)", "ratio"))
+        for query_name, query in QUERIES:
+            times = []
+            for name, role, group in ROLES:
+                cur.execute("SET ROLE {0}".format(role))
+                times.append(min(timeit.repeat(lambda: query(conn), number=1, repeat=REPEAT)))
+                cur.execute("RESET ROLE")
+            print("{0:<20} {1:>10.4f} {2:>16.4f} {3:>7.1f}x".format(query_name, times[0], times[1], times[1] / times[0]))
+    finally:
+        conn.rollback()
+        for name, role, group in ROLES:
+            cur.execute("DROP ROLE IF EXISTS {0}".format(role))
+        conn.commit()
+        conn.close()
+        norDBManagement.destroyDatabase()
+
+if __name__ == "__main__":
+    main()
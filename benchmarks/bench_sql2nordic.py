@@ -0,0 +1,143 @@
+"""
+Benchmark for reading nordic events from the database with :func:`~nordb.database.sql2nordic.getNordic` and with the single query loader :func:`~nordb.database.sql2nordic.getNordicJson`. A test database with EVENT_COUNTS[-1] copies of a small event is created and the events are read with both loaders in groups of EVENT_COUNTS events.
+
+A local database answers too fast for the amount of round trips to matter, so the connection goes through a proxy that delays every message between the client and the database by half of LATENCY seconds in both directions. The proxy connects to the database through POSTGRES_SOCKET, which is the unix socket the test database uses.
+
+The test database is destroyed at the end. Run from the root of the repository with nordb installed or on the PYTHONPATH::
+
+    PYTHONPATH=. python benchmarks/bench_sql2nordic.py
+"""
+import queue
+import socket
+import threading
+import time
+import timeit
+
+from nordb import settings
+from nordb.core import nordic
+from nordb.core import usernameUtilities
+from nordb.database import norDBManagement
+from nordb.database import nordic2sql
+from nordb.database import sql2nordic
+
+EVENT_COUNTS = [1, 100, 10000]
+LATENCY = 0.005
+POSTGRES_SOCKET = "/var/run/postgresql/.s.PGSQL.5432"
+REPEAT = 3
+
+BENCH_EVENT = [
+    " 2013 0103 0614 00.1 LE 63.635  22.913  0.0F HEL 15 0.3 1.6LHEL 1.4LUPP        1\n",
+    " GAP= 80         0.1     0.391   0.477                  0.0                    5\n",
+    " CSS:2013003061203.WFDISC  (DET3C)                                             6\n",
+    " FULLY AUTOMATIC, EVENT TYPE & LOCATION & MAGNITUDE CHECKED (NIH)              3\n",
+    " 2013 0103 0613 04.0 LE 63.650  22.942  0.0FFHEL 11 0.4 1.6LHEL                1\n",
+    " STAT SP IPHASW D HRMM SECON CODA AMPLIT PERI AZIMU VELO SNR AR TRES W  DIS CAZ7\n",
+    " VAF  BZ EP       0613 15.30                    7.0              0.210   67 191 \n",
+    " VAF  BZ ES       0613 23.10                                     0.4 4          \n",
+    " UMAU BZ EP       0613 22.64                                     0.010  114 285 \n",
+    " BURU BZ EPB      0613 25.08                  141.0             -0.1 9  130 325 \n",
+    " BURU BZ ES       0613 39.82                                    -0.3 4          \n",
+    " KEF  BZ EPN      0613 35.36                                     0.0 4  192 148 \n",
+    " SUF  BZ  MSG     0613 55.58         3.6 0.20                                   \n",
+    " OUL  BZ EPG      0613 39.06                  224.0             -0.2 4  217  40 \n",
+    " KAF  BZ  MSG     0614 08.53         2.7 0.20                                   \n",
+    " TOF  BZ ESB      0614 20.10                                    -0.1 0          \n",
+]
+
+class LatencyProxy:
+    """
+    Class for a tcp proxy to the database that delays every message by half of the latency in both directions.
+
+    :param str target: path to the unix socket of the database
+    :param float latency: round trip latency added by the proxy in seconds
+    :ivar int port: port of the proxy on localhost
+    """
+    def __init__(self, target, latency):
+        self.target = target
+        self.delay = latency / 2.0
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(16)
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target = self.accept, daemon = True).start()
+
+    def accept(self):
+        while True:
+            client, address = self.server.accept()
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            database = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            database.connect(self.target)
+            self.forward(client, database)
+            self.forward(database, client)
+
+    def forward(self, source, destination):
+        """
+        Method for starting the threads that forward the data from source to destination. The data is read as soon as it arrives and sent when it has been delayed long enough, so the proxy adds latency without limiting the bandwidth.
+        """
+        messages = queue.Queue()
+        threading.Thread(target = self.read, args = (source, messages), daemon = True).start()
+        threading.Thread(target = self.write, args = (destination, messages), daemon = True).start()
+
+    def read(self, source, messages):
+        try:
+            while True:
+                data = source.recv(65536)
+                messages.put((time.monotonic() + self.delay, data))
+                if not data:
+                    break
+        except OSError:
+            messages.put((time.monotonic(), b""))
+
+    def write(self, destination, messages):
+        try:
+            while True:
+                deadline, data = messages.get()
+                if not data:
+                    break
+                time.sleep(max(0.0, deadline - time.monotonic()))
+                destination.sendall(data)
+        except OSError:
+            pass
+        finally:
+            destination.close()
+
+def createEvents(count):
+    """
+    Function for inserting count copies of BENCH_EVENT into the database.
+
+    :param int count: amount of events inserted
+    """
+    conn = usernameUtilities.log2nordb()
+    nordic2sql.events2Database([nordic.readNordic(BENCH_EVENT, False) for i in range(count)], db_conn = conn)
+    conn.commit()
+    conn.close()
+
+def main():
+    settings.setTest()
+    norDBManagement.createDatabase()
+    try:
+        createEvents(EVENT_COUNTS[-1])
+
+        proxy = LatencyProxy(POSTGRES_SOCKET, LATENCY)
+        settings.database_settings["test database"]["host"] = "127.0.0.1"
+        settings.database_settings["test database"]["port"] = str(proxy.port)
+        conn = usernameUtilities.log2nordb()
+
+        print("round trip latency {0:.1f} ms".format(LATENCY * 1000))
+        print("{0:>8} {1:>14} {2:>14} {3:>8}".format("events", "getNordic (s)", "json (s)", "speedup"))
+        for count in EVENT_COUNTS:
+            event_ids = list(range(1, count + 1))
+            queries_time = min(timeit.repeat(lambda: sql2nordic.getNordic(event_ids, conn), number=1, repeat=REPEAT))
+            json_time = min(timeit.repeat(lambda: sql2nordic.getNordicJson(event_ids, conn), number=1, repeat=REPEAT))
+            print("{0:>8} {1:>14.4f} {2:>14.4f} {3:>7.2f}x".format(count, queries_time, json_time, queries_time / json_time))
+
+        conn.close()
+    finally:
+        usernameUtilities.closeConnectionPool()
+        settings.database_settings["test database"].pop("host", None)
+        settings.database_settings["test database"].pop("port", None)
+        norDBManagement.destroyDatabase()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark for attaching responses to instruments in sql2response. A synthetic inventory where every channel has its own instrument and response is assembled from the rows the database would return, so the benchmark measures only the assembly and not the queries. Half of the responses are fap responses with FAP_ROWS rows and half are paz responses with POLES poles and ZEROS zeros.
+
+The old nested loop implementation is timed up to LEGACY_MAX_CHANNELS channels, because it grows quadratically with the size of the inventory.
+
+Run from the root of the repository with nordb installed or on the PYTHONPATH::
+
+    PYTHONPATH=. python benchmarks/bench_sql2response.py
+"""
+import timeit
+
+from nordb.database import sql2response
+from nordb.nordic.instrument import Instrument
+from nordb.nordic.response import FapResponse, PazResponse
+
+CHANNEL_COUNTS = [1000, 2000, 5000, 10000]
+LEGACY_MAX_CHANNELS = 2000
+FAP_ROWS = 30
+POLES = 5
+ZEROS = 3
+REPEAT = 3
+
+def createInventory(channels):
+    """
+    Function for creating the rows of a synthetic inventory.
+
+    :param int channels: amount of channels in the inventory
+    :returns: tuple of instruments and the response, fap, paz, pole and zero rows ordered by the response id
+    """
+    response_rows = []
+    fap_rows = []
+    paz_rows = []
+    pole_rows = []
+    zero_rows = []
+    instruments = []
+
+    for response_id in range(1, channels + 1):
+        if response_id % 2:
+            response_rows.append(("fap_{0}".format(response_id), "theoretical", 0, "instrument", "fap", "bench", response_id))
+            for i in range(FAP_ROWS):
+                fap_rows.append((0.1 * (i + 1), 1.5 * i, 0.0, 0.0, 0.0, response_id))
+        else:
+            response_rows.append(("paz_{0}".format(response_id), "theoretical", 0, "instrument", "paz", "bench", response_id))
+            paz_rows.append((578164367.3, response_id))
+            for i in range(POLES):
+                pole_rows.append((-0.037 * (i + 1), 0.037, 0.0, 0.0, response_id))
+            for i in range(ZEROS):
+                zero_rows.append((0.0, 0.0, 0.0, 0.0, response_id))
+
+        instrument = Instrument()
+        instrument.response_id = response_id
+        instruments.append(instrument)
+
+    return instruments, (response_rows, fap_rows, paz_rows, pole_rows, zero_rows)
+
+def attachResponses(instruments, rows):
+    responses = sql2response.assembleResponses(*rows)
+    for instrument in instruments:
+        if instrument.response_id in responses:
+            instrument.response = responses[instrument.response_id]
+
+def legacyAttachResponses(instruments, rows):
+    """
+    The nested loops responses2instruments used before the responses were grouped by the response id.
+    """
+    ans, fap_resp, paz_resp, poles_resp, zeros_resp = rows
+    for resp in ans:
+        for instrument in instruments:
+            if instrument.response_id == resp[-1]:
+                if resp[4] == 'fap':
+                    faps = []
+                    for f in fap_resp:
+                        if f[-1] == resp[-1]:
+                            faps.append(f[:-1])
+                    instrument.response = FapResponse(resp, faps)
+
+                elif resp[4] == 'paz':
+                    poles = []
+                    zeros = []
+                    for pole in poles_resp:
+                        if pole[-1] == resp[-1]:
+                            poles.append(pole[:-1])
+                    for zero in zeros_resp:
+                        if zero[-1] == resp[-1]:
+                            zeros.append(zero[:-1])
+                    for paz in paz_resp:
+                        if paz[-1] == resp[-1]:
+                            instrument.response = PazResponse(resp,
+                                                            paz[0],
+                                                            poles,
+                                                            zeros)
+                            break
+
+def main():
+    print("{0:>8} {1:>12} {2:>14} {3:>12}".format("channels", "grouped (s)", "us per channel", "legacy (s)"))
+    for channels in CHANNEL_COUNTS:
+        instruments, rows = createInventory(channels)
+        grouped_time = min(timeit.repeat(lambda: attachResponses(instruments, rows), number=1, repeat=REPEAT))
+
+        legacy = "-"
+        if channels <= LEGACY_MAX_CHANNELS:
+            legacy_time = min(timeit.repeat(lambda: legacyAttachResponses(instruments, rows), number=1, repeat=1))
+            legacy = "{0:.3f}".format(legacy_time)
+
+        print("{0:>8} {1:>12.3f} {2:>14.1f} {3:>12}".format(channels, grouped_time, grouped_time / channels * 1e6, legacy))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Micro-benchmark for the datetime parsing of validationTools. The datetime strings of a bulletin of BULLETIN_EVENTS events with PHASES_PER_EVENT phase lines each are validated with the date cache and without it.
+
+Run from the root of the repository with nordb installed or on the PYTHONPATH::
+
+    PYTHONPATH=. python benchmarks/bench_validationTools.py
+"""
+import timeit
+from datetime import datetime
+from datetime import timedelta
+
+from nordb.core import validationTools
+
+BULLETIN_EVENTS = 2000
+PHASES_PER_EVENT = 30
+REPEAT = 5
+
+def createBulletin():
+    """
+    Function for creating the observation time strings of a bulletin. Every event is on a different day and has PHASES_PER_EVENT picks during two minutes after the origin time.
+
+    :returns: list of datetime strings
+    """
+    datetime_strings = []
+    origin = datetime(2013, 1, 3, 6, 13, 4)
+    for i in range(BULLETIN_EVENTS):
+        event_origin = origin + timedelta(days=i // 3, hours=i % 3)
+        for j in range(PHASES_PER_EVENT):
+            pick = event_origin + timedelta(seconds=4*j, microseconds=10000*j)
+            datetime_strings.append(pick.strftime("%Y %m%d %H%M %S.") + "{0:02d}".format(pick.microsecond // 10000))
+    return datetime_strings
+
+def validateBulletin(datetime_strings):
+    for datetime_string in datetime_strings:
+        validationTools.validateDatetime(datetime_string, "observation_time", 8)
+
+def main():
+    datetime_strings = createBulletin()
+    cached = validationTools.parseDateParts
+
+    validationTools.parseDateParts = cached.__wrapped__
+    uncached_time = min(timeit.repeat(lambda: validateBulletin(datetime_strings), number=1, repeat=REPEAT))
+
+    validationTools.parseDateParts = cached
+    cached.cache_clear()
+    cached_time = min(timeit.repeat(lambda: validateBulletin(datetime_strings), number=1, repeat=REPEAT))
+
+    print("{0} datetime strings".format(len(datetime_strings)))
+    print("without date cache: {0:.3f} s".format(uncached_time))
+    print("with date cache:    {0:.3f} s".format(cached_time))
+    print("speedup:            {0:.2f}x".format(uncached_time / cached_time))
+    print(cached.cache_info())
+
+if __name__ == "__main__":
+    main()
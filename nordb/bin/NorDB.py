@@ -6,8 +6,10 @@ This is the command line tool of the whole program. The command line tool is cre
 
 import os
 import fnmatch
+import itertools
 from subprocess import call
 from datetime import datetime
+from datetime import time
 
 import click
 from lxml import etree
@@ -41,7 +43,9 @@ from nordb.database import sql2response
 from nordb.core import nordic
 from nordb.core import nordic2quakeml
 from nordb.core import nordic2sc3
+from nordb.core import nordic2css
 from nordb.core import nordicRead
+from nordb.core import nordicWriter
 from nordb.core import station2stationxml
 from nordb.core import nordbConf
 
@@ -53,6 +57,8 @@ from nordb.nordic import response
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
+INSERT_BATCH_SIZE = 1000
+
 class Repo(object):
     def __init__(self):
         pass
@@ -172,9 +178,13 @@ def removeuser(repo, username):
 @click.option('--verbose', '-v', is_flag=True, help="Print the whole nordic file instead of the main header.")
 @click.option('--output', '-o', type=click.Path(writable=True), help="file to which all events found are appended")
 @click.option('--output-format', '-f', default="n", type = click.Choice(["n", "q", "sc3"]))
+@click.option('--limit', type=click.INT, help="maximum amount of events shown")
+@click.option('--offset', default=0, type=click.INT, help="amount of events skipped from the beginning")
+@click.option('--order-by', default="origin_datetime", type = click.Choice(["origin_datetime", "id"]), help="order of the events. Default 'origin_datetime'")
+@click.option('--count', is_flag=True, help="Only print the amount of events found.")
 @click.argument("criteria", nargs=-1, type=click.STRING)
 @click.pass_obj
-def search(repo, output_format, verbose, output, criteria):
+def search(repo, output_format, verbose, output, limit, offset, order_by, count, criteria):
     """
     This command searches for events by given criteria and prints them to the screen. Output works in a following way:
 
@@ -204,7 +214,15 @@ def search(repo, output_format, verbose, output, criteria):
         event_desc_id: event_desc_id, ed, eid
         event_id: event_id, id
 
+    Events can also be searched by the great-circle distance of the epicenter from a point in kilometers or by a polygon of latitude-longitude corners:
+
+    \b
+        radius=LAT,LON,KM           -> Epicenter is at most KM kilometers from (LAT, LON)
+        polygon=LAT,LON,LAT,LON,... -> Epicenter is inside the polygon
+
     This will print all nordic events from date 01.01.2009 onwards into the outputfile. Better way of getting files from the database is get command.
+
+    Events are printed in the order of their origin time, or their id with --order-by id, as soon as they are read from the database. --limit and --offset choose which part of the result is printed and --count only prints the amount of events found.
     """
     search = nordicSearch.NordicSearch()
 
@@ -245,6 +263,20 @@ def search(repo, output_format, verbose, output, criteria):
         except:
             click.echo("Criteria not in valid format! Use --help/-h for support. ({0})".format(crit))
             return
+        if tpe in ["radius", "polygon"]:
+            try:
+                coordinates = [float(val) for val in values.split(',')]
+            except:
+                click.echo("{0} values not floats! ({1})".format(tpe, values))
+                return
+            if tpe == "radius" and len(coordinates) == 3:
+                search.addSearchRadius(coordinates[0], coordinates[1], coordinates[2])
+            elif tpe == "polygon" and len(coordinates) >= 6 and len(coordinates) % 2 == 0:
+                search.addSearchPolygon(list(zip(coordinates[::2], coordinates[1::2])))
+            else:
+                click.echo("{0} not in a correct format! ({1})".format(tpe, values))
+                return
+            continue
         if tpe not in search_types.keys():
             click.echo("Criteria type not a valid type! ({0})".format(tpe))
             return
@@ -305,7 +337,19 @@ def search(repo, output_format, verbose, output, criteria):
             else:
                 real_vals.append(val)
 
-        if len(real_vals) == 2:
+        if search_types[tpe] == "origin_date":
+            limits = [originDatetimeLimits(val) for val in real_vals]
+            if len(limits) == 2:
+                search.addSearchBetween("origin_datetime", limits[0][0], limits[1][1])
+            elif values[-1] == "-":
+                search.addSearchUnder("origin_datetime", limits[0][1])
+            elif values[-1] == "+":
+                search.addSearchOver("origin_datetime", limits[0][0])
+            elif limits[0][0] == limits[0][1]:
+                search.addSearchExactly("origin_datetime", limits[0][0])
+            else:
+                search.addSearchBetween("origin_datetime", limits[0][0], limits[0][1])
+        elif len(real_vals) == 2:
             search.addSearchBetween(search_types[tpe], real_vals[0], real_vals[1])
         elif values[-1] == "-":
             search.addSearchUnder(search_types[tpe], real_vals[0])
@@ -314,23 +358,33 @@ def search(repo, output_format, verbose, output, criteria):
         else:
             search.addSearchExactly(search_types[tpe], real_vals[0])
 
+    if count:
+        click.echo(search.countEvents())
+        return
+
     if search.getCriteriaAmount() == 0:
-        click.echo("No criteria given to search. NorDB will print all events. This might take a while. Ctrl-C will abort the search")
+        click.echo("No criteria given to search. NorDB will print all events. Ctrl-C will abort the search")
 
-    events = search.searchEvents()
+    conn = usernameUtilities.log2nordb()
+    if not verbose and output is None:
+        n_events = search.iterEventSummaries(order_by = order_by, limit = limit, offset = offset, db_conn = conn)
+    else:
+        n_events = search.iterEvents(order_by = order_by, limit = limit, offset = offset, db_conn = conn)
+    first_event = next(n_events, None)
 
-    if not events:
+    if first_event is None:
         click.echo("No events found with criteria: \n{0}".format(search.getCriteriaString()[:-1]))
+        conn.close()
         return
 
+    n_events = itertools.chain([first_event], n_events)
+
     type_len = 4
-    id_len = 3
+    id_len = max(3, len(str(sql2nordic.getMaxEventId(db_conn = conn))))
 
-    for e in events:
-        if len(str(e.solution_type)) > type_len:
-            type_len = len(str(e.solution_type))
-        if len(str(e.event_id)) > id_len:
-            id_len = len(str(e.event_id))
+    for s_type in solutionTypeHandler.getSolutionTypes():
+        if len(str(s_type[0])) > type_len:
+            type_len = len(str(s_type[0]))
 
     if criteria:
         click.echo("Event Search \nCriteria: \n{0}".format(search.getCriteriaString()[:-1]))
@@ -342,32 +396,42 @@ def search(repo, output_format, verbose, output, criteria):
         click.echo(" id" + (id_len-3)*" " + " | type"+(type_len-3)*" " + "|" + help_string)
         click.echo((type_len+id_len+len(help_string)+5)*"-")
 
-    root_id = -1
-    for e in events:
-        if root_id != e.root_id:
-            root_id = e.root_id
-        if not verbose:
-            click.echo((" {0:<" + str(id_len) + "}| {1:<" + str(type_len) + "} |{2}" + " | {3}").format(e.event_id, e.solution_type, str(e.main_h[0])[:-1], e.creation_info.creation_date))
-        else:
-            click.echo(str(e))
+    def listEvents():
+        for e in n_events:
+            if not verbose:
+                click.echo((" {0:<" + str(id_len) + "}| {1:<" + str(type_len) + "} |{2}" + " | {3}").format(e.event_id, e.solution_type, nordicWriter.formatMainHeader(e.main_h[0])[:-2], e.creation_info.creation_date))
+            else:
+                click.echo(nordicWriter.formatNordicEvent(e))
+            yield e
 
-    if output is not None:
+    if output is None:
+        for e in listEvents():
+            pass
+    elif output_format == "q":
+        with open(output, 'wb') as f_output:
+            nordic2quakeml.writeQuakeML(listEvents(), f_output, True)
+    elif output_format == "sc3":
+        with open(output, 'wb') as f_output:
+            nordic2sc3.writeSC3(listEvents(), f_output)
+    else:
         f_output = open(output, 'w')
+        for e in listEvents():
+            nordicWriter.writeNordicEvents([e], f_output)
 
-        if output_format == "n":
-            for event in events:
-                f_output.write(str(event))
-                f_output.write("\n")
+        f_output.close()
 
-        elif output_format == "q":
-            qml = nordic2quakeml.nordicEvents2QuakeML(events, True)
-            f_output.write(etree.tostring(qml, pretty_print=True).decode('utf8'))
+    conn.close()
 
-        elif output_format == "sc3":
-            sc3 = nordic2sc3.nordicEvents2SC3(events)
-            f_output.write(etree.tostring(sc3, pretty_print=True).decode('utf8'))
+def originDatetimeLimits(value):
+    """
+    Function for converting a date or datetime given to the search command into the first and the last moment of the origin_datetime range it covers. A date covers the whole day and a datetime only itself.
 
-        f_output.close()
+    :param date,datetime value: value given by the user
+    :returns: tuple of the lower and upper datetime limits
+    """
+    if isinstance(value, datetime):
+        return (value, value)
+    return (datetime.combine(value, time.min), datetime.combine(value, time.max))
 
 @cli.command('network', short_help = "Manage networks")
 @click.argument('network_command',
@@ -758,135 +822,225 @@ def stype(repo, stype_option):
 @click.option('--add-automatic', '-a', is_flag=True, help="In case of duplicate events, the event will be added automatically to the first event found. All similar events will be ignored")
 @click.option('--force-add', '-f', is_flag=True)
 @click.option('--verbose', '-v', is_flag=True, help="print all errors to screen instead of errorlog")
+@click.option('--jobs', '-j', default=1, type=click.IntRange(1, None), help="number of processes used for parsing the nordic files")
 @click.argument('privacy-level', required=True, type=click.Choice(['private', 'public', 'secure']))
 @click.argument('solution-type', required=True)
 @click.argument('filenames', required=True, nargs=-1, type=click.Path(exists=True, readable=True))
 @click.pass_obj
-def insert(repo, solution_type, nofix, ignore_duplicates, no_duplicates, add_automatic, force_add, filenames, verbose, privacy_level):
+def insert(repo, solution_type, nofix, ignore_duplicates, no_duplicates, add_automatic, force_add, filenames, verbose, privacy_level, jobs):
     """This command adds an nordic file to the Database. The SOLUTION-TYPE tells the database what's the  solution type of the event."""
     conn = usernameUtilities.log2nordb()
 
     for filename in filenames:
         click.echo("reading {0}".format(filename.split("/")[len(filename.split("/")) - 1]))
-        f_nordic = open(filename, 'r')
+        f_nordic = open(filename, 'r', newline='')
+        failed_file = None
+        read_failed = []
+        nordic_failed = []
+        nordic_batch = []
+
+        creation_id = creationInfo.createCreationInfo(privacy_level, db_conn=conn)
+
         try:
-            nordic_strings = nordicRead.readNordicFile(f_nordic)
+            for nord in nordic.iterNordicEvents(f_nordic, not nofix, solution_type, read_failed, jobs):
+                for emsg, n_string in read_failed:
+                    click.echo("Error reading nordic: {0}".format(emsg))
+                    click.echo(n_string[0])
+                    nordic_failed.append("Errors:\n{0}\n------------------------------\n".format(emsg))
+                    nordic_failed.append(n_string)
+                read_failed.clear()
+
+                nordic_batch.append(nord)
+                if len(nordic_batch) >= INSERT_BATCH_SIZE:
+                    if no_duplicates:
+                        insertBatch(nordic_batch, solution_type, f_nordic.name, creation_id, conn, nordic_failed)
+                    else:
+                        insertWithDuplicateCheck(nordic_batch, solution_type, f_nordic.name, creation_id, conn, nordic_failed,
+                                                 ignore_duplicates, add_automatic, force_add)
+                    nordic_batch = []
+
+                failed_file = writeFailedNordics(nordic_failed, failed_file, f_nordic.name)
         except Exception as e:
             click.echo("Error reading nordic file: {0}".format(e))
-            continue
 
-        nordic_events = []
-        nordic_failed = []
+        for emsg, n_string in read_failed:
+            click.echo("Error reading nordic: {0}".format(emsg))
+            click.echo(n_string[0])
+            nordic_failed.append("Errors:\n{0}\n------------------------------\n".format(emsg))
+            nordic_failed.append(n_string)
 
-        for n_string in nordic_strings:
-            try:
-                nordic_events.append(nordic.readNordic(n_string, not nofix, -1, -1, solution_type))
-            except Exception as e:
-                click.echo("Error reading nordic: {0}".format(e))
-                click.echo(n_string[0])
-                nordic_failed.append("Errors:\n{0}\n------------------------------\n".format(e))
-                nordic_failed.append(n_string)
+        if no_duplicates:
+            insertBatch(nordic_batch, solution_type, f_nordic.name, creation_id, conn, nordic_failed)
+        else:
+            insertWithDuplicateCheck(nordic_batch, solution_type, f_nordic.name, creation_id, conn, nordic_failed,
+                                     ignore_duplicates, add_automatic, force_add)
 
-        creation_id = creationInfo.createCreationInfo(privacy_level, db_conn=conn)
-        for nord in nordic_events:
-            event_id = -1
-            if not no_duplicates and nord.root_id == -1:
-                same_events = nordicSearch.searchSameEvents(nord)
-                if add_automatic and same_events:
-                    event_id = same_events[0].event_id
-                elif same_events:
+        creationInfo.deleteCreationInfoIfUnnecessary(creation_id)
+
+        failed_file = writeFailedNordics(nordic_failed, failed_file, f_nordic.name)
+        if failed_file is not None:
+            failed_file.close()
+
+        f_nordic.close()
+    conn.commit()
+    conn.close()
+
+def writeFailedNordics(nordic_failed, failed_file, filename):
+    """
+    Function for writing the failed nordics of the insert command into the f_<filename> file. The file is opened when the first failed nordic is written to it.
+
+    :param list nordic_failed: list of error messages and nordic strings that will be written. The list is emptied.
+    :param file failed_file: already opened failed file or None
+    :param str filename: name of the nordic file being inserted
+    :returns: the failed file or None if nothing has been written into it
+    """
+    if nordic_failed and failed_file is None:
+        failed_file = open("f_" + os.path.basename(filename), "w")
+
+    for n in nordic_failed:
+        for line in n:
+            failed_file.write(line)
+        failed_file.write("\n")
+    nordic_failed.clear()
+
+    return failed_file
+
+def insertBatch(nordic_events, solution_type, filename, creation_id, conn, nordic_failed):
+    """
+    Function for pushing a batch of events without duplicate checks into the database with the bulk insert. If the bulk insert fails, the events are pushed one by one so that only the broken events fail.
+    """
+    if not nordic_events:
+        return
+    try:
+        nordic2sql.events2Database(nordic_events, solution_type, filename, creation_id, db_conn=conn)
+        return
+    except Exception as e:
+        click.echo("Error pushing nordics to database in bulk, adding them one by one: {0}".format(e))
+
+    for nord in nordic_events:
+        try:
+            nordic2sql.event2Database(nord, solution_type, filename, creation_id, -1, db_conn=conn)
+        except Exception as e:
+            click.echo("Error pushing nordic to database: {0}".format(e))
+            click.echo(nord.main_h[0])
+            nordic_failed.append("Errors:\n{0}\n------------------------------\n".format(e))
+            nordic_failed.append(str(nord))
+
+def insertWithDuplicateCheck(nordic_events, solution_type, filename, creation_id, conn, nordic_failed, ignore_duplicates, add_automatic, force_add):
+    """
+    Function for pushing a batch of events into the database one by one after checking for same and similar events. The duplicate candidates of the whole batch are searched with one query and only the candidate events that are shown to the user are fetched from the database. The user is asked what to do with the duplicates unless the flags of the insert command tell otherwise.
+    """
+    if not nordic_events:
+        return
+
+    candidates = nordicSearch.searchDuplicateCandidates(nordic_events, db_conn=conn)
+    inserted = [False] * len(nordic_events)
+
+    for idx, nord in enumerate(nordic_events):
+        event_id = -1
+        if nord.root_id == -1:
+            same_events = duplicateEventIds(candidates[idx].same, candidates[idx].same_in_batch, nordic_events, inserted)
+            if add_automatic and same_events:
+                event_id = same_events[0][0]
+            elif same_events:
+                if ignore_duplicates:
+                    click.echo("Duplicate found! Ignoring event:\n{0}".format(nord.main_h[0]))
+                    continue
+
+                click.echo("Identical events to current found! Is any of these a duplicate of yours?")
+                click.echo("{0} - (Yours)".format(nord.main_h[0]))
+                click.echo("-----------------------------------------------------------------------------------------")
+                echoDuplicateEvents(same_events, conn)
+                while True:
+                    try:
+                        event_id = int(input("Event id of the same event: "))
+                        break
+                    except:
+                        click.echo("Not a valid id!")
+            if event_id == -1 and not add_automatic:
+                similar_events = duplicateEventIds(candidates[idx].similar, candidates[idx].similar_in_batch, nordic_events, inserted)
+
+                if similar_events:
                     if ignore_duplicates:
                         click.echo("Duplicate found! Ignoring event:\n{0}".format(nord.main_h[0]))
                         continue
 
-                    click.echo("Identical events to current found! Is any of these a duplicate of yours?")
-                    click.echo("{0} - (Yours)".format(nord.main_h[0]))
-                    click.echo("-----------------------------------------------------------------------------------------")
-                    root_id = -1
-                    for e in same_events:
-                        if root_id != e.root_id:
-                            root_id = e.root_id
-                            click.echo("Root id: {0}".format(root_id))
-                        click.echo(" id: {0} - {1}".format(e.event_id, e.main_h[0]))
-                    while True:
-                        try:
-                            event_id = int(input("Event id of the same event: "))
-                            break
-                        except:
-                            click.echo("Not a valid id!")
-                if event_id == -1 and not add_automatic:
-                    similar_events = nordicSearch.searchSimilarEvents(nord)
-
-                    if similar_events:
-                        if ignore_duplicates:
-                            click.echo("Duplicate found! Ignoring event:\n{0}".format(nord.main_h[0]))
-                            continue
-
-                        if force_add:
-                            click.echo(similar_events[0].main_h[0])
-                            root_id = similar_events[0].root_id
-                        else:
-                            click.echo("Similar events to current found! Is any of these a duplicate of yours?")
-                            click.echo("{0} (Yours)".format(nord.main_h[0]))
-                            click.echo("-----------------------------------------------------------------------------------------")
-                            root_id = -1
-                            for e in similar_events:
-                                if root_id != e.root_id:
-                                    root_id = e.root_id
-                                    click.echo("Root id: {0}".format(root_id))
-                                click.echo(" id: {0} - {1}".format(e.event_id, e.main_h[0]))
-                            while True:
-                                try:
-                                    event_id = int(input("Event id of the same event: "))
-                                    break
-                                except:
-                                    click.echo("Not a valid id!")
-
-            try:
-                nordic2sql.event2Database(nord, solution_type, f_nordic.name, creation_id, event_id, db_conn=conn)
-            except Exception as e:
-                click.echo("Error pushing nordic to database: {0}".format(e))
-                click.echo(nord.main_h[0])
-                nordic_failed.append("Errors:\n{0}\n------------------------------\n".format(e))
-                nordic_failed.append(str(nord))
-
-        creationInfo.deleteCreationInfoIfUnnecessary(creation_id)
+                    if force_add:
+                        click.echo(sql2nordic.getNordicJson([similar_events[0][0]], db_conn=conn)[0].main_h[0])
+                    else:
+                        click.echo("Similar events to current found! Is any of these a duplicate of yours?")
+                        click.echo("{0} (Yours)".format(nord.main_h[0]))
+                        click.echo("-----------------------------------------------------------------------------------------")
+                        echoDuplicateEvents(similar_events, conn)
+                        while True:
+                            try:
+                                event_id = int(input("Event id of the same event: "))
+                                break
+                            except:
+                                click.echo("Not a valid id!")
 
-        if len(nordic_failed) > 0:
-            failed = open("f_" + os.path.basename(f_nordic.name), "w")
+        try:
+            nordic2sql.event2Database(nord, solution_type, filename, creation_id, event_id, db_conn=conn)
+            inserted[idx] = True
+        except Exception as e:
+            click.echo("Error pushing nordic to database: {0}".format(e))
+            click.echo(nord.main_h[0])
+            nordic_failed.append("Errors:\n{0}\n------------------------------\n".format(e))
+            nordic_failed.append(str(nord))
 
-            for n in nordic_failed:
-                for line in n:
-                    failed.write(line)
-                failed.write("\n")
+def duplicateEventIds(db_events, batch_indices, nordic_events, inserted):
+    """
+    Function for combining the duplicate candidates found from the database and the ones found earlier in the same batch into a list of (event_id, root_id) tuples ordered by root_id. Candidates from the batch that were not pushed to the database are left out.
+    """
+    events = list(db_events)
+    for i in batch_indices:
+        if inserted[i]:
+            events.append((nordic_events[i].event_id, nordic_events[i].root_id))
+    events.sort(key = lambda e: (e[1], e[0]))
+    return events
+
+def echoDuplicateEvents(duplicate_events, conn):
+    """
+    Function for fetching the duplicate candidates from the database and printing them grouped by their root ids.
+    """
+    fetched = {}
+    for e in sql2nordic.getNordic([e_id for e_id, r_id in duplicate_events], db_conn=conn):
+        fetched[e.event_id] = e
 
-        f_nordic.close()
-    conn.commit()
-    conn.close()
+    root_id = -1
+    for e_id, r_id in duplicate_events:
+        if root_id != r_id:
+            root_id = r_id
+            click.echo("Root id: {0}".format(root_id))
+        click.echo(" id: {0} - {1}".format(e_id, fetched[e_id].main_h[0]))
 
 @cli.command('validate', short_help='validate a nordic file')
+@click.option('--jobs', '-j', default=1, type=click.IntRange(1, None), help="number of processes used for parsing the nordic files")
 @click.argument('filenames', required=True, nargs=-1, type=click.Path(exists=True, readable=True))
 @click.pass_obj
-def validate(repo, filenames):
+def validate(repo, filenames, jobs):
     """Command for validating a nordic files"""
     valid = True
     for filename in filenames:
         click.echo("reading {0}".format(filename.split("/")[len(filename.split("/")) - 1]))
-        f_nordic = open(filename, 'r')
+        f_nordic = open(filename, 'r', newline='')
+        failed = []
         try:
-            nordic_strings = nordicRead.readNordicFile(f_nordic)
+            for nord in nordic.iterNordicEvents(f_nordic, True, 'O', failed, jobs):
+                for emsg, n_string in failed:
+                    click.echo("Error reading nordic: {0}".format(emsg))
+                    click.echo(n_string[0])
+                valid = valid and not failed
+                failed.clear()
         except Exception as e:
             valid = False
             click.echo("Error reading nordic file: {0}".format(e))
-            continue
 
-        for n_string in nordic_strings:
-            try:
-                nordic.readNordic(n_string, True, -1, -1, 'O')
-            except Exception as e:
-                valid = False
-                click.echo("Error reading nordic: {0}".format(e))
-                click.echo(n_string[0])
+        for emsg, n_string in failed:
+            click.echo("Error reading nordic: {0}".format(emsg))
+            click.echo(n_string[0])
+        valid = valid and not failed
+        f_nordic.close()
 
     if valid:
         click.echo('All nordic files are valid')
@@ -898,6 +1052,13 @@ def create(repo):
     norDBManagement.createDatabase()
     click.echo("Database created!")
 
+@cli.command('migrate', short_help='migrate database')
+@click.pass_obj
+def migrate(repo):
+    """This command updates an existing database to match the current version of nordb. Missing columns and indexes are added to the database. Running the command on an up to date database does nothing."""
+    norDBManagement.migrateDatabase()
+    click.echo("Database migrated!")
+
 @cli.command('destroy', short_help='destroy database')
 @click.confirmation_option()
 @click.pass_obj
@@ -930,25 +1091,26 @@ def reset(repo, reset_type):
 @click.argument('event-ids', nargs=-1, type=click.INT)
 @click.argument('output-name', type=click.Path(exists=False))
 @click.option('--event-root', is_flag=True, help="search as event_root_ids instead")
-@click.option('--output-format', '-f', default="n", type = click.Choice(["n", "q", "sc3"]), help="What format you want to use. Default 'n'")
+@click.option('--output-format', '-f', default="n", type = click.Choice(["n", "q", "sc3", "css"]), help="What format you want to use. Default 'n'")
 @click.pass_obj
 def get(repo, output_format, event_ids, output_name, event_root):
     """
-    Command for getting files out from the database. ID tells which event you want, FORMAT tells the program that in what format you want the file(n - nordic, q - quakeml, sc3 - seiscomp3) and output-name tells the output file's name if you want to specify it.
+    Command for getting files out from the database. ID tells which event you want, FORMAT tells the program that in what format you want the file(n - nordic, q - quakeml, sc3 - seiscomp3, css - css3.0) and output-name tells the output file's name if you want to specify it. With css the output-name is the name of the .origin, .arrival, .assoc and .event files without the extension.
 
     You can create an output file by searching events with search command using --output or -o flag or simply writing event_ids on a blank file with every id being on a new line.
     """
     conn = usernameUtilities.log2nordb()
-    n_events = []
     if event_root:
+        ids = []
         for e_id in event_ids:
-            n_events.extend(sql2nordic.getNordicsRoot(e_id, db_conn=conn))
+            ids.extend(sql2nordic.getNordicRootIds(e_id, db_conn=conn))
     else:
-        n_events = sql2nordic.getNordic(event_ids, db_conn=conn)
+        ids = list(event_ids)
 
-    n_events = [nordic_event for nordic_event in n_events if nordic_event is not None]
+    n_events = sql2nordic.iterNordic(ids, db_conn=conn)
+    first_event = next(n_events, None)
 
-    if not n_events:
+    if first_event is None:
         if event_root:
             click.echo("No event roots with id {0}".format(event_ids))
         else:
@@ -956,19 +1118,21 @@ def get(repo, output_format, event_ids, output_name, event_root):
         conn.close()
         return
 
-    f_output = open(output_name, 'w')
-    if output_format == "n":
-        for n_event in n_events:
-            f_output.write(str(n_event))
-            f_output.write("\n")
-    elif output_format == "q":
-        qml = nordic2quakeml.nordicEvents2QuakeML(n_events, True)
-        f_output.write(etree.tostring(qml, pretty_print=True).decode('utf8'))
+    n_events = itertools.chain([first_event], n_events)
+
+    if output_format == "q":
+        with open(output_name, 'wb') as f_output:
+            nordic2quakeml.writeQuakeML(n_events, f_output, True)
     elif output_format == "sc3":
-        sc3 = nordic2sc3.nordic2SC3(n_events)
-        f_output.write(etree.tostring(sc3, pretty_print=True).decode('utf8'))
+        with open(output_name, 'wb') as f_output:
+            nordic2sc3.writeSC3(n_events, f_output)
+    elif output_format == "css":
+        nordic2css.nordicEvents2CSS(n_events, output_name)
+    else:
+        with open(output_name, 'w') as f_output:
+            for n_event in n_events:
+                nordicWriter.writeNordicEvents([n_event], f_output)
 
-    f_output.close()
     conn.close()
 
 @cli.command('backup', short_help='manage backups')
@@ -119,7 +119,9 @@ def writeDBConf(db_settings, active_database):
     """
     config_file = ".nordb.config"
 
-    conf_string = "Active database: {0}\n\n".format(active_database)
+    conf_string = "Active database: {0}\n".format(active_database)
+    conf_string += "Pool minimum size: {0}\n".format(settings.pool_min_size)
+    conf_string += "Pool maximum size: {0}\n\n".format(settings.pool_max_size)
     for conf_name in db_settings.keys():
         conf_string += "-{0}-\n".format(conf_name)
         conf_string += "name: {0}\n".format(db_settings[conf_name]['dbname'])
@@ -10,11 +10,15 @@ Functions and Classes
 ---------------------
 """
 
+import collections
+import multiprocessing
+
 from datetime import date
 from datetime import datetime
 from datetime import time
 from nordb.core import nordicRead
 from nordb.core import nordicFix
+from nordb.core import nordicPhaseParser
 from nordb.core.nordicRead import readNordicFile
 from nordb.core.utils import addString2String
 from nordb.core.utils import addInteger2String
@@ -28,6 +32,8 @@ from nordb.nordic.nordicWaveform import NordicWaveform
 from nordb.nordic.nordicData import NordicData
 from nordb.database.sql2nordic import getEventRootId
 
+PARSE_CHUNK_SIZE = 100
+
 def createStringMainHeader(header, fix_nordic):
     """
     Function that creates NordicMain object with a list with values being strings
@@ -248,6 +254,27 @@ def readNordic(nordic_string, fix_nordic=True, root_id = -1, creation_id = -1, e
     :param str event_type: Type of the event.
     :return: Nordic Event object
     """
+    event, headers_size, obs_date = readNordicHeaders(nordic_string, fix_nordic, root_id, creation_id, event_type)
+
+    event.data, errors = nordicPhaseParser.parsePhaseLines(nordic_string[headers_size:],
+                                                           obs_date,
+                                                           fix_nordic)
+    if errors:
+        raise Exception(errors[0][1])
+
+    return event
+
+def readNordicHeaders(nordic_string, fix_nordic, root_id = -1, creation_id = -1, event_type = "O"):
+    """
+    Function for creating a NordicEvent object with only the headers of a nordic read into it. The phase data is read separately so that the phase lines of many events can be parsed in one batch.
+
+    :param Array nordic_string: String array representation of a nordic
+    :param bool fix_nordic: Flag for fixing some common mistakes with nordic files. See nordicFix module.
+    :param int root_id: id of the root event
+    :param int creation_id: id of the creation id in the database
+    :param str event_type: Type of the event.
+    :return: NordicEvent object, amount of headers and the datetime of the first main header or None if the event has no phase data
+    """
     event = NordicEvent(-1, root_id, creation_id, event_type)
 
     headers_size = readHeaders(event, nordic_string, fix_nordic)
@@ -255,19 +282,17 @@ def readNordic(nordic_string, fix_nordic=True, root_id = -1, creation_id = -1, e
     if headers_size == 0:
         raise Exception("No headers!")
 
-    for x in range(headers_size, len(nordic_string)):
-        if event.main_h[0].origin_time is None:
-            obs_date = datetime.combine(event.main_h[0].origin_date,
-                                       time(hour=0, minute=0, second= 0))
-        else:
-            obs_date = datetime.combine(event.main_h[0].origin_date,
-                                        event.main_h[0].origin_time)
+    if headers_size == len(nordic_string):
+        return event, headers_size, None
 
-        event.data.append(createStringPhaseData(nordic_string[x],
-                                                fix_nordic,
-                                                obs_date))
+    if event.main_h[0].origin_time is None:
+        obs_date = datetime.combine(event.main_h[0].origin_date,
+                                   time(hour=0, minute=0, second= 0))
+    else:
+        obs_date = datetime.combine(event.main_h[0].origin_date,
+                                    event.main_h[0].origin_time)
 
-    return event
+    return event, headers_size, obs_date
 
 def createNordicEvents(nordic_file, solution_type="O"):
     """
@@ -293,3 +318,137 @@ def createNordicEvents(nordic_file, solution_type="O"):
             raise e
 
     return nordic_events, nordic_failed
+
+
+def iterNordicEvents(nordic_file, fix_nordic=True, solution_type="O", failed=None, jobs=1, chunk_size=PARSE_CHUNK_SIZE):
+    """
+    Generator for reading NordicEvent objects from a python file object one at a time. The events are read in chunks of chunk_size events and the phase lines of a chunk are parsed together in one batch. Only the chunks being read are kept in memory, so files of any size can be read with it. If a failed list is given, events that cannot be read are appended to it as (error message, nordic_string) tuples and reading continues from the next event. Otherwise the error is raised. Error messages contain the line number and byte offset of the start of the event in the file.
+
+    With jobs larger than 1 the events are parsed in a pool of worker processes in chunks of chunk_size events. The events are still yielded in the order they are in the file and at most a couple of chunks per worker are kept in memory at a time.
+
+    :param file nordic_file: file to be read
+    :param bool fix_nordic: Flag for fixing some common mistakes with nordic files. See nordicFix module.
+    :param str solution_type: solution type of the events
+    :param list failed: list into which the failed events are added
+    :param int jobs: number of worker processes used for parsing
+    :param int chunk_size: number of events sent to a worker at a time
+    :returns: generator of NordicEvent objects
+    """
+    if jobs > 1:
+        parsed_chunks = iterParsedChunks(nordic_file, fix_nordic, solution_type, jobs, chunk_size)
+    else:
+        parsed_chunks = (readNordicChunk(chunk, fix_nordic, solution_type)
+                            for chunk in iterNordicChunks(nordic_file, chunk_size))
+
+    for parsed_chunk in parsed_chunks:
+        for nordic_event, emsg, nordic_string in parsed_chunk:
+            if nordic_event is not None:
+                yield nordic_event
+            elif failed is None:
+                raise Exception(emsg)
+            else:
+                failed.append((emsg, nordic_string))
+
+def readNordicChunk(nordic_positions, fix_nordic, solution_type):
+    """
+    Function for reading a chunk of events. The headers are read event by event, but the phase lines of all events are parsed together in one batch with :func:`nordicPhaseParser.parsePhaseLines`. The function is also used in worker processes and the results are sent back to the main process pickled. Pickled NordicEvent objects only carry the already validated attribute values, so they are rebuilt in the main process without validating them again.
+
+    :param list nordic_positions: list of (nordic_string, line_number, byte_offset) tuples
+    :param bool fix_nordic: Flag for fixing some common mistakes with nordic files. See nordicFix module.
+    :param str solution_type: solution type of the events
+    :returns: list of (NordicEvent, None, None) tuples or (None, error message, nordic_string) tuples for the events that could not be read
+    """
+    results = []
+    phase_lines = []
+    obs_dates = []
+    line_results = []
+
+    for nordic_string, line_number, byte_offset in nordic_positions:
+        try:
+            event, headers_size, obs_date = readNordicHeaders(nordic_string, fix_nordic, -1, -1, solution_type)
+        except Exception as e:
+            emsg = "Event starting at line {0} (byte {1}): {2}".format(line_number, byte_offset, e)
+            results.append((None, emsg, nordic_string))
+            continue
+
+        for line in nordic_string[headers_size:]:
+            phase_lines.append(line)
+            obs_dates.append(obs_date)
+            line_results.append(len(results))
+        results.append((event, None, None))
+
+    phase_data, errors = nordicPhaseParser.parsePhaseLines(phase_lines, obs_dates, fix_nordic)
+
+    for pos, data in zip(line_results, phase_data):
+        if data is not None:
+            results[pos][0].data.append(data)
+
+    for i, error in errors:
+        pos = line_results[i]
+        if results[pos][0] is None:
+            continue
+        nordic_string, line_number, byte_offset = nordic_positions[pos]
+        emsg = "Event starting at line {0} (byte {1}): {2}".format(line_number, byte_offset, error)
+        results[pos] = (None, emsg, nordic_string)
+
+    return results
+
+def iterNordicChunks(nordic_file, chunk_size):
+    """
+    Generator that reads the events of a nordic file in chunks of chunk_size events. If reading the file fails, the events read before the faulty line are still yielded before the error is raised.
+
+    :param file nordic_file: file to be read
+    :param int chunk_size: number of events in a chunk
+    :returns: generator of lists of (nordic_string, line_number, byte_offset) tuples
+    """
+    chunk = []
+    try:
+        for nordic_position in nordicRead.iterNordicFile(nordic_file):
+            chunk.append(nordic_position)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    except Exception:
+        if chunk:
+            yield chunk
+        raise
+
+    if chunk:
+        yield chunk
+
+def iterParsedChunks(nordic_file, fix_nordic, solution_type, jobs, chunk_size):
+    """
+    Generator that reads the nordic file in the main process and parses it in chunks in a pool of worker processes. The parsed chunks are yielded in the order of the file.
+
+    :param file nordic_file: file to be read
+    :param bool fix_nordic: Flag for fixing some common mistakes with nordic files. See nordicFix module.
+    :param str solution_type: solution type of the events
+    :param int jobs: number of worker processes
+    :param int chunk_size: number of events in a chunk
+    :returns: generator of lists of results of :func:`readNordicChunk`
+    """
+    pending = collections.deque()
+    read_error = None
+
+    with multiprocessing.Pool(jobs) as pool:
+        chunk = []
+        try:
+            for nordic_position in nordicRead.iterNordicFile(nordic_file):
+                chunk.append(nordic_position)
+                if len(chunk) < chunk_size:
+                    continue
+                pending.append(pool.apply_async(readNordicChunk, (chunk, fix_nordic, solution_type)))
+                chunk = []
+                if len(pending) > 2 * jobs:
+                    yield pending.popleft().get()
+        except Exception as e:
+            read_error = e
+
+        if chunk:
+            pending.append(pool.apply_async(readNordicChunk, (chunk, fix_nordic, solution_type)))
+
+        while pending:
+            yield pending.popleft().get()
+
+    if read_error is not None:
+        raise read_error
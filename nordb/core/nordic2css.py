@@ -1,8 +1,17 @@
+"""
+This module contains tools to convert nordic events to CSS3.0 origin, arrival, assoc and event tables. :func:`nordic2css` converts a single event and :func:`nordicEvents2CSS` a whole catalog of events into one set of files with unique ids.
+
+Functions and Classes
+---------------------
+"""
+
 from datetime import date
 from datetime import datetime
 from dateutil import tz
 import time
 
+CSS_BUFFER_SIZE = 1024 * 1024
+
 def nordic2Arrival(data, arrival_id):
     """
     Function for converting a nordic file into a Arrival string
@@ -181,21 +190,36 @@ def nordic2Assoc(data, arrival_id, origin_id):
 
     return assoc_string
 
-def nordic2Origin(main_h, origin_id):
+def nordic2Origin(main_h, origin_id, event_id = -1):
     """
     Function for converting a nordic file into a Origin string
 
     :param NordicMain main_h: NordicMain object to be converted
+    :param int origin_id: origin id of the origin
+    :param int event_id: event id of the origin. -1 if the origin doesn't belong to an event
+    :returns: origin string
     """
     origin_string = ""
 
-    latitude = main_h.epicenter_latitude
-    longitude = main_h.epicenter_longitude
-    depth = main_h.depth
+    if main_h.epicenter_latitude is not None:
+        latitude = main_h.epicenter_latitude
+    else:
+        latitude = -999.0
+    if main_h.epicenter_longitude is not None:
+        longitude = main_h.epicenter_longitude
+    else:
+        longitude = -999.0
+    if main_h.depth is not None:
+        depth = main_h.depth
+    else:
+        depth = -999.0
     ar_time = datetime.combine(main_h.origin_date, main_h.origin_time).replace(tzinfo=tz.tzutc()).timestamp()
     jdate = main_h.origin_date
     nass =  -1
-    ndef = main_h.stations_used
+    if main_h.stations_used is not None:
+        ndef = main_h.stations_used
+    else:
+        ndef = -1
     npd = -1
     grn = -1
     srn = -1
@@ -252,7 +276,7 @@ def nordic2Origin(main_h, origin_id):
                                     depth = depth,
                                     ar_time = ar_time,
                                     orid = origin_id,
-                                    evid = -1,
+                                    evid = event_id,
                                     jdate = int(jdate.strftime("%Y%j")),
                                     nass = nass,
                                     ndef = ndef,
@@ -301,3 +325,62 @@ def nordic2css(nordic_event, css_filename):
     assoc_file.write(assoc_string)
     assoc_file.close()
 
+
+def nordic2Event(event_id, preferred_origin_id):
+    """
+    Function for creating a Event string
+
+    :param int event_id: event id of the event
+    :param int preferred_origin_id: origin id of the preferred origin of the event
+    :returns: event string
+    """
+    e_format = "{evid:8d} {evname:15s} {prefor:8d} {auth:15s} {commid:8d} {lddate:17s}\n"
+
+    return e_format.format(evid = event_id,
+                           evname = "-",
+                           prefor = preferred_origin_id,
+                           auth = "-",
+                           commid = -1,
+                           lddate = "-")
+
+def nordicEvents2CSS(nordic_events, css_filename):
+    """
+    Function for converting many nordic events into css format and writing them into origin, arrival, assoc and event files. Every main header of an event becomes an origin of the event and the first main header is the preferred origin to which the arrivals are associated. Event, origin and arrival ids are unique in all files.
+
+    The files are written one event at a time through large write buffers, so nordic_events can be a generator like :func:`sql2nordic.iterNordic` and the memory needed doesn't depend on the amount of events.
+
+    :param iterable nordic_events: nordic event objects that will be written
+    :param str css_filename: name of the files without the .origin, .arrival, .assoc and .event extensions
+    :returns: amount of events written
+    """
+    event_id = 0
+    origin_id = 0
+    arrival_id = 0
+
+    origin_file = open(css_filename + ".origin", "w", buffering = CSS_BUFFER_SIZE)
+    arrival_file = open(css_filename + ".arrival", "w", buffering = CSS_BUFFER_SIZE)
+    assoc_file = open(css_filename + ".assoc", "w", buffering = CSS_BUFFER_SIZE)
+    event_file = open(css_filename + ".event", "w", buffering = CSS_BUFFER_SIZE)
+
+    try:
+        for nordic_event in nordic_events:
+            event_id += 1
+            preferred_origin_id = origin_id + 1
+
+            for main_h in nordic_event.main_h:
+                origin_id += 1
+                origin_file.write(nordic2Origin(main_h, origin_id, event_id))
+
+            for data in nordic_event.data:
+                arrival_id += 1
+                arrival_file.write(nordic2Arrival(data, arrival_id) + "\n")
+                assoc_file.write(nordic2Assoc(data, arrival_id, preferred_origin_id))
+
+            event_file.write(nordic2Event(event_id, preferred_origin_id))
+    finally:
+        origin_file.close()
+        arrival_file.close()
+        assoc_file.close()
+        event_file.close()
+
+    return event_id
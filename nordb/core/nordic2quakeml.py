@@ -1,6 +1,8 @@
 """
 This module contains all functions for converting a nordic file to a quakeml file. Description of quakeml format is found `here`_.
 
+:func:`nordicEvents2QuakeML` builds one etree object of all events. For large catalogs :func:`writeQuakeML` writes the events to a file one event at a time, so only one event is held in memory at once.
+
 .. _here: https://quake.ethz.ch/quakeml/QuakeML
 
 Functions and Classes
@@ -11,6 +13,7 @@ from lxml import etree
 
 import math
 import datetime
+import functools
 import os
 
 MODULE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + os.sep
@@ -21,6 +24,12 @@ QUAKEML_ROOT_STRING =   (
     '</q:quakeml>'
                         )
 
+QUAKEML_NSMAP = {
+                    "q":"http://quakeml.org/xmlns/quakeml/1.2",
+                    None:"http://quakeml.org/xmlns/bed/1.2",
+                    "ingv":"http://webservices.ingv.it/fdsnws/event/1"
+                }
+
 AUTHORITY_ID = "wh.atis.ids"
 
 EVENT_TYPE_CONVERSION = {
@@ -97,8 +106,11 @@ def addEvent(eventParameters, nordic, long_quakeML):
             event_comment_txt = etree.SubElement(event_comment, "text")
             event_comment_txt.text = header_comment.h_comment
 
+    preferred_origins = []
     for i in range(0,len(nordic.main_h)):
-        addOrigin(event, nordic, nordic.main_h[i])
+        origin = addOrigin(event, nordic, nordic.main_h[i])
+        if nordic.main_h[i].h_id == nordic.main_h[0].h_id:
+            preferred_origins.append(origin)
 
     for i in range(0,len(nordic.main_h)):
         if long_quakeML:
@@ -116,9 +128,8 @@ def addEvent(eventParameters, nordic, long_quakeML):
             addAmplitude(event, phase_data)
 
         for phase_data in nordic.data:
-            for origin in event.iter("origin"):
-                if origin.get("publicID") == event_preferred_origin.text:
-                    addArrival(origin, phase_data)
+            for origin in preferred_origins:
+                addArrival(origin, phase_data)
 
 def addPick(event, nordic, phase_data):
     """
@@ -200,7 +211,8 @@ def addOrigin(event, nordic, main):
 
     :param etree.XML event: event object
     :param NordicEvent nordic: nordic event_file
-    :param NordicData phase_data: nordic phase data object
+    :param NordicMain main: nordic main header object
+    :returns: the origin etree object
     """
     origin = etree.SubElement(event, "origin")
     origin.attrib["publicID"] = "smi:" + AUTHORITY_ID + "/origin/" + str(main.h_id)
@@ -245,6 +257,8 @@ def addOrigin(event, nordic, main):
         origin_quality_standard_error = etree.SubElement(origin_quality, "standardError")
         origin_quality_standard_error.text = str(main.rms_time_residuals)
 
+    return origin
+
 def addMagnitude(event, nordic, main):
     """
     Function for adding a magnitude etree object to a event object
@@ -329,32 +343,75 @@ def addFocalMech(event, h_error):
         focal_mechanism_gap = etree.SubElement(focal_mechanism, "azimuthalGap")
         focal_mechanism_gap.text = str(h_error.gap)
 
-def nordicEvents2QuakeML(nordic_events, long_quakeML=True):
+@functools.lru_cache(maxsize=1)
+def getQuakeMLSchema():
     """
-    Function that turns a array of NordicEvent objects into a quakeml etree object, validates it and returns it.
+    Function for getting the QuakeML 1.2 schema. The schema is parsed only once.
 
-    :param array nordic_events: nordic event object array that will be transformed into a quakeml single file
-    :param bool long_quakeML: Boolean value for if you want the file to be long
-    :return: validated etree object
+    :returns: etree.XMLSchema object
     """
-    if nordic_events is None or not nordic_events:
-        return None
-
-    f = open(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + os.sep + "xml" + os.sep + "QuakeML-1.2.xsd")
+    f = open(MODULE_PATH + "xml" + os.sep + "QuakeML-1.2.xsd")
     xmlschema_doc = etree.parse(f)
     f.close()
 
+    return etree.XMLSchema(xmlschema_doc)
+
+def createQuakeML(nordic_events, long_quakeML):
+    """
+    Function for creating a quakeml etree object out of nordic events without validating it.
+
+    :param array nordic_events: array of nordic event objects
+    :param bool long_quakeML: flag for if the required file is a long or a short one
+    :returns: etree object
+    """
     utf8_parser = etree.XMLParser(encoding='utf-8')
     quakeml = etree.fromstring(QUAKEML_ROOT_STRING.encode('utf-8'), utf8_parser)
 
     addEventParameters(quakeml, nordic_events, long_quakeML)
 
-    xmlschema = etree.XMLSchema(xmlschema_doc)
-
     #Parse the tree to a string and back to the object because of a weird bug on validating the tree. Probably an encoding problem or something
-    test = etree.tostring(quakeml)
-    quakeml = etree.XML(test)
+    return etree.XML(etree.tostring(quakeml))
+
+def nordicEvents2QuakeML(nordic_events, long_quakeML=True):
+    """
+    Function that turns a array of NordicEvent objects into a quakeml etree object, validates it and returns it.
+
+    :param array nordic_events: nordic event object array that will be transformed into a quakeml single file
+    :param bool long_quakeML: Boolean value for if you want the file to be long
+    :return: validated etree object
+    """
+    if nordic_events is None or not nordic_events:
+        return None
 
-    xmlschema.assertValid(quakeml)
+    quakeml = createQuakeML(nordic_events, long_quakeML)
+
+    getQuakeMLSchema().assertValid(quakeml)
 
     return quakeml
+
+def writeQuakeML(nordic_events, f, long_quakeML=True, validate=True):
+    """
+    Function for writing nordic events to a quakeml file one event at a time. Every event is converted and validated on its own and written to the file before the next event is read from nordic_events, so nordic_events can be a generator like :func:`sql2nordic.iterNordic` and the memory needed doesn't depend on the amount of events.
+
+    :param iterable nordic_events: nordic event objects that will be written
+    :param file f: binary file object to which the quakeml is written
+    :param bool long_quakeML: Boolean value for if you want the file to be long
+    :param bool validate: flag for validating every event against the QuakeML schema
+    :returns: amount of events written
+    """
+    event_count = 0
+
+    with etree.xmlfile(f, encoding='utf-8') as xf:
+        xf.write_declaration(standalone=True)
+        with xf.element("{" + QUAKEML_NSMAP["q"] + "}quakeml", nsmap=QUAKEML_NSMAP):
+            with xf.element("{" + QUAKEML_NSMAP[None] + "}eventParameters",
+                            publicID="smi:" + AUTHORITY_ID + "/eventParameter"):
+                for nordic in nordic_events:
+                    quakeml = createQuakeML([nordic], long_quakeML)
+                    if validate:
+                        getQuakeMLSchema().assertValid(quakeml)
+
+                    xf.write(quakeml[0][0], pretty_print=True)
+                    event_count += 1
+
+    return event_count
@@ -1,5 +1,7 @@
 """
-This module contains tools to convert a nordic file to a `SC3 file`_. This is done by converting the nordic first to a quakeml etree.XML object and then converting it to SC3 from there using the schema in the geofon website.
+This module contains tools to convert a nordic file to a `SC3 file`_. :func:`nordicEvents2SC3` converts the nordic first to a quakeml etree.XML object and then converts it to SC3 from there using the schema in the geofon website.
+
+:func:`writeSC3` writes the SC3 file directly from the nordic events without the quakeml step. SC3ML requires all picks of the file to be before all amplitudes, origins, focal mechanisms and events, so the elements of every type are collected into their own temporary file while the events are read and the temporary files are copied to the output file in the end. Only one event is held in memory at once.
 
 .. _SC3 file: http://geofon.gfz-potsdam.de/schema/0.9/
 
@@ -8,9 +10,58 @@ Functions and Classes
 """
 
 from lxml import etree
+import functools
+import math
 import os
+import shutil
+import tempfile
 
 from nordb.core import nordic2quakeml
+from nordb.core.nordic2quakeml import AUTHORITY_ID
+
+SC3_NAMESPACE = "http://geofon.gfz-potsdam.de/ns/seiscomp3-schema/0.9"
+SC3 = "{" + SC3_NAMESPACE + "}"
+
+SC3_ROOT_START =    (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<seiscomp xmlns="' + SC3_NAMESPACE + '" version="0.9">\n'
+    '<EventParameters publicID="smi:' + AUTHORITY_ID + '/eventParameter">\n'
+                    ).encode('utf-8')
+
+SC3_ROOT_END = b'</EventParameters>\n</seiscomp>\n'
+
+SC3_SECTIONS = ["pick", "amplitude", "origin", "focalMechanism", "event"]
+
+QUAKEML_EVENT_TYPE_CONVERSION = {
+                                    "not reported": "other",
+                                    "induced or triggered event": "induced earthquake"
+                                }
+
+@functools.lru_cache(maxsize=1)
+def getSC3Transform():
+    """
+    Function for getting the XSLT transform from QuakeML 1.2 to SC3ML 0.9. The stylesheet is parsed and compiled only once.
+
+    :returns: etree.XSLT object
+    """
+    f = open(nordic2quakeml.MODULE_PATH + "xml" + os.sep + "quakeml_1.2__sc3ml_0.9.xsl")
+    qml2scc3 = etree.parse(f)
+    f.close()
+
+    return etree.XSLT(qml2scc3)
+
+@functools.lru_cache(maxsize=1)
+def getSC3Schema():
+    """
+    Function for getting the SC3ML 0.9 schema. The schema is parsed only once.
+
+    :returns: etree.XMLSchema object
+    """
+    f = open(nordic2quakeml.MODULE_PATH + "xml" + os.sep + "sc3ml_0.9.xsd")
+    xmlschema_doc = etree.parse(f)
+    f.close()
+
+    return etree.XMLSchema(xmlschema_doc)
 
 def nordicEvents2SC3(nordic_events):
     """
@@ -24,10 +75,352 @@ def nordicEvents2SC3(nordic_events):
 
     qmls = nordic2quakeml.nordicEvents2QuakeML(nordic_events, True)
 
-    f = open(os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + os.sep +"xml" + os.sep + "quakeml_1.2__sc3ml_0.9.xsl")
-    qml2scc3 = etree.parse(f)
-    f.close()
+    return getSC3Transform()(qmls)
+
+def addElement(parent, tag, text = None):
+    """
+    Function for adding a SC3 element with text to a parent element.
+
+    :param etree.XML parent: parent element
+    :param str tag: name of the element without the namespace
+    :param text: text of the element. Converted to a string if given
+    :returns: the new element
+    """
+    element = etree.SubElement(parent, SC3 + tag)
+    if text is not None:
+        element.text = str(text)
+    return element
+
+def addQuantity(parent, tag, value, uncertainty = None):
+    """
+    Function for adding a RealQuantity or TimeQuantity element to a parent element.
+
+    :param etree.XML parent: parent element
+    :param str tag: name of the element without the namespace
+    :param value: value of the quantity
+    :param uncertainty: uncertainty of the quantity if known
+    :returns: the new element
+    """
+    quantity = addElement(parent, tag)
+    addElement(quantity, "value", value)
+    if uncertainty is not None:
+        addElement(quantity, "uncertainty", uncertainty)
+    return quantity
+
+def isNewPublicID(public_id, written_ids):
+    """
+    Function for checking if an element with public_id hasn't been written to the file yet. Duplicates are left out like in the XSLT conversion.
+
+    :param str public_id: public id of the element
+    :param set written_ids: public ids written to the file so far. public_id is added to it if it's new
+    :returns: True or False
+    """
+    if public_id in written_ids:
+        return False
+    written_ids.add(public_id)
+    return True
+
+def createSC3Event(nordic, written_ids):
+    """
+    Function for creating a SC3 etree object that has the picks, amplitudes, origins, focal mechanisms and the event of one nordic event in SC3ML order.
+
+    :param NordicEvent nordic: nordic event object
+    :param set written_ids: public ids written to the file so far
+    :returns: seiscomp etree object
+    """
+    seiscomp = etree.Element(SC3 + "seiscomp", nsmap={None:SC3_NAMESPACE})
+    event_parameters = addElement(seiscomp, "EventParameters")
+
+    for phase_data in nordic.data:
+        addPick(event_parameters, nordic, phase_data, written_ids)
+
+    for phase_data in nordic.data:
+        addAmplitude(event_parameters, phase_data, written_ids)
+
+    origin_ids = []
+    for main in nordic.main_h:
+        if addOrigin(event_parameters, nordic, main, written_ids):
+            origin_ids.append("smi:" + AUTHORITY_ID + "/origin/" + str(main.h_id))
+
+    focal_mechanism_ids = []
+    for main in nordic.main_h:
+        if main.error_h is not None and addFocalMech(event_parameters, main.error_h, written_ids):
+            focal_mechanism_ids.append("smi:" + AUTHORITY_ID + "/path/to/focalMech")
+
+    addEvent(event_parameters, nordic, origin_ids, focal_mechanism_ids)
+
+    return seiscomp
+
+def addPick(event_parameters, nordic, phase_data, written_ids):
+    """
+    Function for adding a pick etree object to a EventParameters object
+
+    :param etree.XML event_parameters: EventParameters object
+    :param NordicEvent nordic: nordic event object
+    :param NordicData phase_data: nordic phase data object
+    :param set written_ids: public ids written to the file so far
+    """
+    public_id = "smi:" + AUTHORITY_ID + "/pick/" + str(phase_data.d_id)
+    if not isNewPublicID(public_id, written_ids):
+        return
+
+    pick = addElement(event_parameters, "pick")
+    pick.attrib["publicID"] = public_id
+
+    addQuantity(pick, "time", phase_data.observation_time.strftime("%Y-%m-%dT%H:%M:%S.%fZ"))
+
+    waveform_id = addElement(pick, "waveformID")
+    waveform_id.attrib["networkCode"] = nordic.main_h[0].magnitude_reporting_agency_1 or ""
+    waveform_id.attrib["stationCode"] = phase_data.station_code
+    if phase_data.sp_instrument_type is not None and phase_data.sp_component is not None:
+        waveform_id.attrib["channelCode"] = nordic2quakeml.INSTRUMENT_TYPE_CONVERSION[phase_data.sp_instrument_type] + phase_data.sp_component
+
+    if phase_data.back_azimuth is not None:
+        addQuantity(pick, "backazimuth", phase_data.back_azimuth)
+
+    if phase_data.quality_indicator is not None:
+        addElement(pick, "onset", nordic2quakeml.PICK_ONSET_CONVERSION[phase_data.quality_indicator])
+
+    if phase_data.phase_type is not None:
+        addElement(pick, "phaseHint", phase_data.phase_type)
+
+    if phase_data.first_motion is not None and phase_data.first_motion in nordic2quakeml.PICK_POLARITY_CONVERSION:
+        addElement(pick, "polarity", nordic2quakeml.PICK_POLARITY_CONVERSION[phase_data.first_motion])
+
+    addElement(pick, "evaluationMode", "manual")
+
+def addAmplitude(event_parameters, phase_data, written_ids):
+    """
+    Function for adding a amplitude etree object to a EventParameters object. The time window of the amplitude starts from the observation time and lasts for the signal duration.
+
+    :param etree.XML event_parameters: EventParameters object
+    :param NordicData phase_data: nordic phase data object
+    :param set written_ids: public ids written to the file so far
+    """
+    if phase_data.max_amplitude is None:
+        return
+
+    public_id = "smi:" + AUTHORITY_ID + "/amplitude/" + str(phase_data.d_id)
+    if not isNewPublicID(public_id, written_ids):
+        return
+
+    amplitude = addElement(event_parameters, "amplitude")
+    amplitude.attrib["publicID"] = public_id
+
+    addElement(amplitude, "type", "A")
+    addQuantity(amplitude, "amplitude", math.pow(phase_data.max_amplitude, -9)) #Convert to meters from nanometers
+
+    if phase_data.signal_duration is not None:
+        time_window = addElement(amplitude, "timeWindow")
+        addElement(time_window, "reference", phase_data.observation_time.strftime("%Y-%m-%dT%H:%M:%S.%fZ"))
+        addElement(time_window, "begin", 0)
+        addElement(time_window, "end", phase_data.signal_duration)
+
+    if phase_data.max_amplitude_period is not None:
+        addQuantity(amplitude, "period", phase_data.max_amplitude_period)
+
+    if phase_data.signal_to_noise is not None:
+        addElement(amplitude, "snr", phase_data.signal_to_noise)
+
+    addElement(amplitude, "unit", "m")
+
+def addOrigin(event_parameters, nordic, main, written_ids):
+    """
+    Function for adding a origin etree object with its arrivals and magnitude to a EventParameters object. Arrivals are added only to the origins of the preferred main header.
+
+    :param etree.XML event_parameters: EventParameters object
+    :param NordicEvent nordic: nordic event object
+    :param NordicMain main: nordic main header object
+    :param set written_ids: public ids written to the file so far
+    :returns: True if the origin was added
+    """
+    public_id = "smi:" + AUTHORITY_ID + "/origin/" + str(main.h_id)
+    if not isNewPublicID(public_id, written_ids):
+        return False
+
+    origin = addElement(event_parameters, "origin")
+    origin.attrib["publicID"] = public_id
+
+    error_h = main.error_h
+
+    time_value = main.origin_date.strftime("%Y-%m-%dT") + main.origin_time.strftime("%H:%M:%S.%fZ")
+    if error_h is not None:
+        addQuantity(origin, "time", time_value, error_h.second_error)
+    else:
+        addQuantity(origin, "time", time_value)
+
+    if main.epicenter_latitude is not None:
+        addQuantity(origin, "latitude", main.epicenter_latitude,
+                    None if error_h is None else error_h.epicenter_latitude_error)
+
+    if main.epicenter_longitude is not None:
+        addQuantity(origin, "longitude", main.epicenter_longitude,
+                    None if error_h is None else error_h.epicenter_longitude_error)
+
+    if main.depth is not None:
+        addQuantity(origin, "depth", main.depth,
+                    None if error_h is None else error_h.depth_error)
+
+    if main.rms_time_residuals is not None:
+        origin_quality = addElement(origin, "quality")
+        addElement(origin_quality, "standardError", main.rms_time_residuals)
+
+    if main.h_id == nordic.main_h[0].h_id:
+        for phase_data in nordic.data:
+            addArrival(origin, phase_data)
+
+    addMagnitude(origin, main)
+
+    return True
+
+def addArrival(origin, phase_data):
+    """
+    Function for adding a arrival etree object to a origin object
+
+    :param etree.XML origin: origin object
+    :param NordicData phase_data: nordic phase data object
+    """
+    if phase_data.phase_type is None:
+        return
+
+    arrival = addElement(origin, "arrival")
+    addElement(arrival, "pickID", "smi:" + AUTHORITY_ID + "/pick/" + str(phase_data.d_id))
+    addElement(arrival, "phase", phase_data.phase_type)
+
+    if phase_data.epicenter_to_station_azimuth is not None:
+        addElement(arrival, "azimuth", phase_data.epicenter_to_station_azimuth)
+
+    if phase_data.epicenter_distance is not None:
+        addElement(arrival, "distance", phase_data.epicenter_distance/nordic2quakeml.MAGIC_KM2DEG_CONSTANT)
+
+    if phase_data.travel_time_residual is not None:
+        addElement(arrival, "timeResidual", phase_data.travel_time_residual)
+
+def addMagnitude(origin, main):
+    """
+    Function for adding a magnitude etree object to a origin object
+
+    :param etree.XML origin: origin object
+    :param NordicMain main: nordic main header object
+    """
+    if main.magnitude_1 is None:
+        return
+
+    magnitude = addElement(origin, "magnitude")
+    magnitude.attrib["publicID"] = "smi:" + AUTHORITY_ID + "/magnitude/" + str(main.h_id)
+
+    if main.error_h is not None:
+        addQuantity(magnitude, "magnitude", main.magnitude_1, main.error_h.magnitude_error)
+    else:
+        addQuantity(magnitude, "magnitude", main.magnitude_1)
+
+    if main.type_of_magnitude_1 is not None and main.type_of_magnitude_1 in nordic2quakeml.MAGNITUDE_TYPE_CONVERSION:
+        addElement(magnitude, "type", nordic2quakeml.MAGNITUDE_TYPE_CONVERSION[main.type_of_magnitude_1])
+
+    addElement(magnitude, "originID", "smi:" + AUTHORITY_ID + "/origin/" + str(main.h_id))
+
+    if main.stations_used is not None:
+        addElement(magnitude, "stationCount", main.stations_used)
+
+    if main.magnitude_reporting_agency_1 is not None:
+        magnitude_creation_info = addElement(magnitude, "creationInfo")
+        addElement(magnitude_creation_info, "agencyID", main.magnitude_reporting_agency_1)
+        addElement(magnitude_creation_info, "agencyURI", "smi:" + AUTHORITY_ID + "/agency/")
+
+def addFocalMech(event_parameters, h_error, written_ids):
+    """
+    Function for adding a focal mechanism etree object to a EventParameters object
+
+    :param etree.XML event_parameters: EventParameters object
+    :param NordicError h_error: nordic error header object
+    :param set written_ids: public ids written to the file so far
+    :returns: True if the focal mechanism was added
+    """
+    if h_error.gap is None:
+        return False
+
+    public_id = "smi:" + AUTHORITY_ID + "/path/to/focalMech"
+    if not isNewPublicID(public_id, written_ids):
+        return False
+
+    focal_mechanism = addElement(event_parameters, "focalMechanism")
+    focal_mechanism.attrib["publicID"] = public_id
+    addElement(focal_mechanism, "azimuthalGap", h_error.gap)
+
+    return True
+
+def addEvent(event_parameters, nordic, origin_ids, focal_mechanism_ids):
+    """
+    Function for adding a event etree object to a EventParameters object
+
+    :param etree.XML event_parameters: EventParameters object
+    :param NordicEvent nordic: nordic event object
+    :param list origin_ids: public ids of the origins added for the event
+    :param list focal_mechanism_ids: public ids of the focal mechanisms added for the event
+    """
+    event = addElement(event_parameters, "event")
+    event.attrib["publicID"] = "smi:" + AUTHORITY_ID + "/event/" + str(nordic.main_h[0].h_id)
+
+    addElement(event, "preferredOriginID", "smi:" + AUTHORITY_ID + "/origin/" + str(nordic.main_h[0].h_id))
+    addElement(event, "preferredMagnitudeID", "smi:" + AUTHORITY_ID + "/magnitude/" + str(nordic.main_h[0].h_id))
+
+    event_type_txt = " "
+    for header in nordic.main_h:
+        if header.event_desc_id is not None:
+            event_type_txt = header.event_desc_id
+
+    event_type = nordic2quakeml.EVENT_TYPE_CONVERSION[event_type_txt]
+    addElement(event, "type", QUAKEML_EVENT_TYPE_CONVERSION.get(event_type, event_type))
+
+    event_description = addElement(event, "description")
+    if nordic.main_h[0].event_desc_id is None:
+        addElement(event_description, "text", nordic.main_h[0].distance_indicator + " ")
+    else:
+        addElement(event_description, "text", nordic.main_h[0].distance_indicator + nordic.main_h[0].event_desc_id)
+    addElement(event_description, "type", "region name")
+
+    for header_comment in nordic.comment_h:
+        if header_comment.h_comment is not None:
+            event_comment = addElement(event, "comment")
+            addElement(event_comment, "text", header_comment.h_comment)
+
+    for origin_id in origin_ids:
+        addElement(event, "originReference", origin_id)
+
+    for focal_mechanism_id in focal_mechanism_ids:
+        addElement(event, "focalMechanismReference", focal_mechanism_id)
+
+def writeSC3(nordic_events, f, validate=True):
+    """
+    Function for writing nordic events to a SC3 file without converting them to quakeml first. The elements of every event are written to temporary files before the next event is read from nordic_events, so nordic_events can be a generator like :func:`sql2nordic.iterNordic` and the memory needed doesn't depend on the amount of events.
+
+    :param iterable nordic_events: nordic event objects that will be written
+    :param file f: binary file object to which the SC3 is written
+    :param bool validate: flag for validating every event against the SC3ML 0.9 schema
+    :returns: amount of events written
+    """
+    sections = [tempfile.TemporaryFile() for section in SC3_SECTIONS]
+    written_ids = set()
+    event_count = 0
+
+    try:
+        for nordic in nordic_events:
+            seiscomp = createSC3Event(nordic, written_ids)
+            if validate:
+                getSC3Schema().assertValid(seiscomp)
+
+            for element in seiscomp[0]:
+                section = sections[SC3_SECTIONS.index(etree.QName(element).localname)]
+                section.write(etree.tostring(element, pretty_print=True))
+            event_count += 1
 
-    qml2sc3_transform = etree.XSLT(qml2scc3)
+        f.write(SC3_ROOT_START)
+        for section in sections:
+            section.seek(0)
+            shutil.copyfileobj(section, f)
+        f.write(SC3_ROOT_END)
+    finally:
+        for section in sections:
+            section.close()
 
-    return qml2sc3_transform(qmls)
+    return event_count
@@ -0,0 +1,263 @@
+"""
+This module contains a batch parser for the type 4 phase lines of nordic files. Instead of slicing and validating the lines one at a time like :func:`nordic.createStringPhaseData`, all lines are packed into a single byte buffer and every column is cut out of it as a fixed-width NumPy view. The numeric columns are converted in bulk and their ranges are checked with array comparisons. Faulty lines do not stop the parsing, every faulty line gets its own error message instead.
+
+The values and the error messages are the same as the ones :func:`nordic.createStringPhaseData` gives for the same line, because the lines that fail a check are read once more with it to get the exact error.
+
+Functions and Classes
+---------------------
+"""
+import numpy as np
+
+from nordb.core import nordic
+from nordb.nordic.nordicData import NordicData
+
+PHASE_LINE_LENGTH = 80
+
+STRING_COLUMNS =    [
+                        (NordicData.STATION_CODE, 1, 6, None),
+                        (NordicData.SP_INSTRUMENT_TYPE, 6, 7, "LSBHEPD"),
+                        (NordicData.SP_COMPONENT, 7, 8, "ZNEH012VRTP"),
+                        (NordicData.QUALITY_INDICATOR, 9, 10, None),
+                        (NordicData.PHASE_TYPE, 10, 14, None),
+                    ]
+
+INT64_LIMIT = 2.0 ** 63
+
+INTEGER_COLUMNS =   [
+                        (NordicData.WEIGHT, 14, 15, 0, 9),
+                        (NordicData.SIGNAL_DURATION, 29, 33, 0, 9999),
+                        (NordicData.AZIMUTH_RESIDUAL, 60, 63, -99, 999),
+                        (NordicData.LOCATION_WEIGHT, 68, 70, -9, 99),
+                        (NordicData.EPICENTER_DISTANCE, 70, 75, 0, 99999),
+                        (NordicData.EPICENTER_TO_STATION_AZIMUTH, 76, 79, 0, 359),
+                    ]
+
+FLOAT_COLUMNS = [
+                    (NordicData.MAX_AMPLITUDE, 34, 40, -1.0, 99999.9),
+                    (NordicData.MAX_AMPLITUDE_PERIOD, 41, 45, -1.0, 99.9),
+                    (NordicData.BACK_AZIMUTH, 46, 52, 0.0, 359.9),
+                    (NordicData.APPARENT_VELOCITY, 52, 56, 0.0, 99.9),
+                    (NordicData.SIGNAL_TO_NOISE, 56, 60, 0.0, 99.9),
+                    (NordicData.TRAVEL_TIME_RESIDUAL, 63, 68, -999.9, 9999.9),
+                ]
+
+MICROSECONDS = {"hour":3600000000, "minute":60000000, "second":1000000}
+
+def parsePhaseLines(lines, obs_datetimes, fix_nordic = False):
+    """
+    Function for parsing a batch of nordic phase lines into NordicData objects. The lines can come from any number of events as long as every line gets the datetime of the first main header of its own event.
+
+    :param list lines: phase lines as strings
+    :param obs_datetimes: datetime of the first main header for all lines or a list with a datetime for every line
+    :param bool fix_nordic: Flag for fixing some common mistakes with nordic files. See nordicFix module.
+    :returns: list with a NordicData object for every line or None for the faulty lines and a list of (line index, error message) tuples
+    """
+    if not isinstance(obs_datetimes, (list, tuple)):
+        obs_datetimes = [obs_datetimes] * len(lines)
+
+    if len(lines) == 0:
+        return [], []
+
+    columns, invalid = parsePhaseColumns(lines, obs_datetimes, fix_nordic)
+
+    phase_data = [NordicData.fromDatabase(row) for row in zip(*columns)]
+    errors = []
+
+    for i in np.flatnonzero(invalid).tolist():
+        try:
+            phase_data[i] = nordic.createStringPhaseData(lines[i], fix_nordic, obs_datetimes[i])
+        except Exception as e:
+            phase_data[i] = None
+            errors.append((i, str(e)))
+
+    return phase_data, errors
+
+def parsePhaseColumns(lines, obs_datetimes, fix_nordic):
+    """
+    Function for cutting the phase lines into columns and converting them into python values. Lines that fail any of the checks or contain characters that are not printable ascii are only marked as invalid.
+
+    :param list lines: phase lines as strings
+    :param list obs_datetimes: datetime of the first main header for every line
+    :param bool fix_nordic: Flag for fixing some common mistakes with nordic files. See nordicFix module.
+    :returns: list of the columns in the order of NordicData and a boolean array of the invalid lines
+    """
+    buf, invalid = phaseLineBuffer(lines)
+    main_datetimes = list(dict.fromkeys(obs_datetimes))
+    main_positions = dict(zip(main_datetimes, range(len(main_datetimes))))
+    main_index = np.array([main_positions[d] for d in obs_datetimes], dtype = np.intp)
+    invalid |= np.array([d.year < 1000 for d in main_datetimes])[main_index]
+
+    columns = [None] * 21
+    columns[NordicData.FIRST_MOTION] = [None] * len(lines)
+    columns[NordicData.EVENT_ID] = [-1] * len(lines)
+    columns[NordicData.D_ID] = [-1] * len(lines)
+
+    for index, start, end, allowed in STRING_COLUMNS:
+        values = fixedWidthColumn(buf, start, end)
+        present = values != b""
+        if allowed is not None:
+            invalid |= present & ~np.isin(values, [c.encode() for c in allowed])
+        columns[index] = maskedList(values.astype("U{0}".format(end - start)), present)
+
+    for index, start, end, low, high in FLOAT_COLUMNS:
+        values = fixedWidthColumn(buf, start, end)
+        if fix_nordic and index == NordicData.BACK_AZIMUTH:
+            values = np.where(values == b"360.0", b"0.0", values)
+        numbers, present, bad = parseFloats(values)
+        invalid |= bad | (present & ~((numbers >= low) & (numbers <= high)))
+        columns[index] = maskedList(numbers, present)
+
+    for index, start, end, low, high in INTEGER_COLUMNS:
+        values = fixedWidthColumn(buf, start, end)
+        if fix_nordic and index == NordicData.EPICENTER_TO_STATION_AZIMUTH:
+            values = np.where(values == b"360", b"0", values)
+        numbers, present, bad = parseIntegers(values)
+        if fix_nordic and index == NordicData.EPICENTER_DISTANCE:
+            floats, float_present, float_bad = parseFloats(values)
+            truncate = float_present & ~float_bad & (np.abs(floats) < INT64_LIMIT)
+            numbers = np.where(truncate, np.trunc(np.where(truncate, floats, 0)), numbers).astype(np.int64)
+            bad &= ~truncate
+        invalid |= bad | (present & ((numbers < low) | (numbers > high)))
+        columns[index] = maskedList(numbers, present)
+
+    times, bad = parseObservationTimes(buf, main_datetimes, main_index, fix_nordic)
+    invalid |= bad
+    columns[NordicData.OBSERVATION_TIME] = times.tolist()
+
+    return columns, invalid
+
+def phaseLineBuffer(lines):
+    """
+    Function for packing the phase lines into a two dimensional array of bytes with one line per row. Lines are cut or padded with spaces to the length of a nordic line.
+
+    :param list lines: phase lines as strings
+    :returns: uint8 array of shape (len(lines), 80) and a boolean array of the lines that contain characters that are not printable ascii
+    """
+    text = "".join([line[:PHASE_LINE_LENGTH].ljust(PHASE_LINE_LENGTH) for line in lines])
+    try:
+        buf = np.frombuffer(text.encode("ascii"), dtype = np.uint8).reshape(len(lines), PHASE_LINE_LENGTH)
+    except UnicodeEncodeError:
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype = np.uint32).reshape(len(lines), PHASE_LINE_LENGTH)
+        buf = np.where(codes > 0x7e, 0x20, codes).astype(np.uint8)
+        irregular = ((codes < 0x20) | (codes > 0x7e)).any(axis = 1)
+    else:
+        irregular = ((buf < 0x20) | (buf > 0x7e)).any(axis = 1)
+
+    return buf, irregular
+
+def fixedWidthColumn(buf, start, end, strip = True):
+    """
+    Function for cutting a column out of the phase line buffer as an array of byte strings.
+
+    :param numpy.ndarray buf: buffer from :func:`phaseLineBuffer`
+    :param int start: first character of the column
+    :param int end: character after the last character of the column
+    :param bool strip: strip the whitespace around the values
+    :returns: array of byte strings
+    """
+    values = buf[:, start:end].copy().view("S{0}".format(end - start)).ravel()
+    if strip:
+        return np.char.strip(values)
+    return values
+
+def parseIntegers(values):
+    """
+    Function for converting an array of byte strings into integers in bulk. Empty values are missing. If the bulk conversion fails the values are converted one at a time to find the faulty ones.
+
+    :param numpy.ndarray values: array of byte strings
+    :returns: int64 array of the values, boolean array of the values that are present and boolean array of the values that are not integers
+    """
+    present = values != b""
+    numbers = np.zeros(len(values), dtype = np.int64)
+    bad = np.zeros(len(values), dtype = bool)
+    try:
+        numbers[present] = values[present].astype(np.int64)
+    except (ValueError, OverflowError):
+        for i in np.flatnonzero(present).tolist():
+            try:
+                numbers[i] = int(values[i])
+            except (ValueError, OverflowError):
+                bad[i] = True
+
+    return numbers, present, bad
+
+def parseFloats(values):
+    """
+    Function for converting an array of byte strings into floats in bulk. Empty values are missing. If the bulk conversion fails the values are converted one at a time to find the faulty ones. NaN and infinite values are also faulty.
+
+    :param numpy.ndarray values: array of byte strings
+    :returns: float64 array of the values, boolean array of the values that are present and boolean array of the faulty values
+    """
+    present = values != b""
+    numbers = np.zeros(len(values), dtype = np.float64)
+    bad = np.zeros(len(values), dtype = bool)
+    try:
+        numbers[present] = values[present].astype(np.float64)
+    except ValueError:
+        for i in np.flatnonzero(present).tolist():
+            try:
+                numbers[i] = float(values[i])
+            except ValueError:
+                bad[i] = True
+
+    bad |= present & ~np.isfinite(numbers)
+
+    return numbers, present, bad
+
+def parseObservationTimes(buf, main_datetimes, main_index, fix_nordic):
+    """
+    Function for creating the observation times of the phase lines from the date of the first main header and the hour, minute and second columns of the lines.
+
+    :param numpy.ndarray buf: buffer from :func:`phaseLineBuffer`
+    :param list main_datetimes: distinct datetimes of the first main headers
+    :param numpy.ndarray main_index: position of the datetime of every line in main_datetimes
+    :param bool fix_nordic: Flag for fixing some common mistakes with nordic files. See nordicFix module.
+    :returns: datetime64[us] array of the observation times and boolean array of the faulty times
+    """
+    hour, present, hour_bad = parseIntegers(fixedWidthColumn(buf, 18, 20, strip = False))
+    minute, present, minute_bad = parseIntegers(fixedWidthColumn(buf, 20, 22, strip = False))
+    second, present, second_bad = parseIntegers(fixedWidthColumn(buf, 23, 25, strip = False))
+    hundredths = np.char.ljust(fixedWidthColumn(buf, 26, 28), 6, b"0")
+    microsecond, present, microsecond_bad = parseIntegers(hundredths)
+
+    bad = hour_bad | minute_bad | second_bad | microsecond_bad
+    bad |= (hour < 0) | (hour > 23) | (minute < 0) | (minute > 59) | (microsecond < 0) | (microsecond > 999999)
+
+    if fix_nordic:
+        leap = fixedWidthColumn(buf, 23, 28, strip = False) == b"60.00"
+        bad |= (second < 0) | ((second > 59) & ~leap)
+    else:
+        bad |= (second < 0) | (second > 59)
+
+    dates = np.array([d.date() for d in main_datetimes], dtype = "datetime64[D]")[main_index]
+    times = (dates.astype("datetime64[us]") +
+             (hour * MICROSECONDS["hour"] +
+              minute * MICROSECONDS["minute"] +
+              second * MICROSECONDS["second"] +
+              microsecond).astype("timedelta64[us]"))
+
+    if fix_nordic:
+        main_hours = np.array([d.hour for d in main_datetimes])[main_index]
+        hours = (times - times.astype("datetime64[D]")).astype(np.int64) // MICROSECONDS["hour"]
+        next_day = hours < main_hours
+        hundredths = microsecond // 10000
+        rounded = np.where(hundredths < 10, hundredths * 100000, hundredths * 10000)
+        times = np.where(next_day,
+                         times - microsecond.astype("timedelta64[us]")
+                               + rounded.astype("timedelta64[us]")
+                               + np.timedelta64(1, "D"),
+                         times)
+
+    return times.astype("datetime64[us]"), bad
+
+def maskedList(values, present):
+    """
+    Function for converting an array into a list of python values with None for the missing values.
+
+    :param numpy.ndarray values: array of the values
+    :param numpy.ndarray present: boolean array of the values that are present
+    :returns: list of the values
+    """
+    values = values.astype(object)
+    values[~present] = None
+    return values.tolist()
@@ -1,5 +1,5 @@
 """
-NordicRead module contains a function readNordicFile that reads a single file and separates all separate events inside it to different string arrays.
+NordicRead module contains a function readNordicFile that reads a single file and separates all separate events inside it to different string arrays. For large files iterNordicFile does the same one event at a time.
 
 Functions and Classes
 ---------------------
@@ -12,25 +12,46 @@ def readNordicFile(f):
 
     :param file f: python file object for the Nordic File
     """
-    nordics = []
-    emsg = "Nordic Read: The following line is too short: {0}\n{1}"
-    i = 0
-    nordics.append([])
+    return [nordic_string for nordic_string, line_number, byte_offset in iterNordicFile(f)]
+
+def iterNordicFile(f):
+    """
+    Generator version of :func:`readNordicFile`. Reads the file line by line and yields every event as soon as it has been read, so only one event is kept in memory at a time. Every event is yielded together with the line number and the byte offset of its first line in the file so that errors can be traced back to the file. Errors raised by the generator also contain the position of the faulty line. Open the file in binary mode or with newline="" so that the offsets also count the carriage returns of files with CRLF line endings. The lines are yielded with the carriage returns removed.
+
+    :param file f: python file object for the Nordic File
+    :returns: generator of (nordic_string, line_number, byte_offset) tuples where nordic_string is a list of the lines of the event, line_number starts from 1 and byte_offset from 0
+    """
+    encoding = getattr(f, "encoding", None) or "utf-8"
+    nordic_string = []
+    line_number = 0
+    byte_offset = 0
+    start_line = 0
+    start_offset = 0
 
     for line in f:
-        if line.strip() == "" or line is None:
-            if len(nordics[i]) == 0:
-                continue
-            i += 1;
-            nordics.append([])
-        elif(len(line) < 81):
-            raise Exception("Line not long enough (len:{0}):\n{1}".format(len(line), line))
-        elif (line[79] == "7"):
+        line_number += 1
+        line_offset = byte_offset
+        if isinstance(line, bytes):
+            byte_offset += len(line)
+            line = line.decode(encoding)
+        else:
+            byte_offset += len(line.encode(encoding))
+        if line.endswith("\r\n"):
+            line = line[:-2] + "\n"
+
+        if line.strip() == "":
+            if nordic_string:
+                yield nordic_string, start_line, start_offset
+                nordic_string = []
+        elif len(line) < 81:
+            raise Exception("Line not long enough (len:{0}, line:{1}, byte:{2}):\n{3}".format(len(line), line_number, line_offset, line))
+        elif line[79] == "7":
             continue
         else:
-            nordics[i].append(line)
+            if not nordic_string:
+                start_line = line_number
+                start_offset = line_offset
+            nordic_string.append(line)
 
-    if not nordics[-1]:
-        return nordics[:-1]
-    else:
-        return nordics
+    if nordic_string:
+        yield nordic_string, start_line, start_offset
@@ -0,0 +1,432 @@
+"""
+This module contains a faster way of writing NordicEvent objects into nordic format. The output is exactly the same as from the __str__ functions of the nordic classes, but instead of building a format string for every value, the formats of all record types are compiled once when the module is imported. Every record is then written with a single format call.
+
+Examples::
+
+    with open("events.n", "w") as f:
+        writeNordicEvents(nordic_events, f)
+
+Functions and Classes
+---------------------
+"""
+import operator
+
+from nordb.core.utils import addString2String
+from nordb.core.utils import addInteger2String
+from nordb.core.utils import addFloat2String
+
+def stringFormatter(val_len, front):
+    """
+    Function for creating a function that formats a string value the same way as :func:`utils.addString2String`.
+
+    :param int val_len: int on how long the string needs to be
+    :param str front: formatting character
+    :returns: function that takes the value and returns the formatted string
+    """
+    parser = ("{:" + front + str(val_len) + "s}").format
+    empty = val_len * " "
+
+    def formatString(value):
+        if value is None:
+            return empty
+        string = parser(value)
+        if len(string) != val_len:
+            return addString2String(value, val_len, front)
+        return string
+
+    return formatString
+
+def integerFormatter(val_len, front):
+    """
+    Function for creating a function that formats an integer value the same way as :func:`utils.addInteger2String`.
+
+    :param int val_len: int on how long the string needs to be
+    :param str front: formatting character
+    :returns: function that takes the value and returns the formatted string
+    """
+    parser = ("{:" + front + str(val_len) + "d}").format
+    empty = val_len * " "
+
+    def formatInteger(value):
+        if value is None:
+            return empty
+        string = parser(value)
+        if len(string) != val_len:
+            return addInteger2String(value, val_len, front)
+        return string
+
+    return formatInteger
+
+def floatFormatter(val_len, decimal_len, front):
+    """
+    Function for creating a function that formats a float value the same way as :func:`utils.addFloat2String`. Values that do not fit into val_len directly are given to addFloat2String, which handles the rounding and the errors.
+
+    :param int val_len: int on how long the string needs to be
+    :param int decimal_len: value that tells how many of the letters will be allocated for the fraction
+    :param str front: formatting character
+    :returns: function that takes the value and returns the formatted string
+    """
+    parser = ("{:" + front + str(val_len) + "." + str(decimal_len) + "f}").format
+    empty = val_len * " "
+
+    def formatFloat(value):
+        if value is None:
+            return empty
+        string = parser(value)
+        if len(string) != val_len:
+            return addFloat2String(value, val_len, decimal_len, front)
+        return string
+
+    return formatFloat
+
+def dateFormatter():
+    """
+    Function for creating a function that formats the origin date of a main header.
+
+    :returns: function that takes a date and returns the formatted string
+    """
+    year = integerFormatter(4, '<')
+    day = integerFormatter(2, '0')
+
+    def formatDate(value):
+        if value is None:
+            return "         "
+        return " " + year(value.year) + " " + day(value.month) + day(value.day)
+
+    return formatDate
+
+def timeFormatter(second_len, decimal_len):
+    """
+    Function for creating a function that formats a time in the HRMM SECON format of nordic files.
+
+    :param int second_len: length of the seconds
+    :param int decimal_len: amount of decimals of the seconds
+    :returns: function that takes a time or datetime and returns the formatted string
+    """
+    hour = integerFormatter(2, '0')
+    second = floatFormatter(second_len, decimal_len, '0')
+    empty = (second_len + 5) * " "
+
+    def formatTime(value):
+        if value is None:
+            return empty
+        return (hour(value.hour) + hour(value.minute) + " " +
+                second(float(value.second) + float(value.microsecond)/1000000))
+
+    return formatTime
+
+FORMATTERS = {
+                "string": stringFormatter,
+                "integer": integerFormatter,
+                "float": floatFormatter,
+                "date": dateFormatter,
+                "time": timeFormatter,
+            }
+
+FLAGS = {"<": "-", ">": "", "0": "0"}
+
+FIELD_SPECS =   {
+                    "string": lambda val_len, front: "%" + FLAGS[front] + str(val_len) + "s",
+                    "integer": lambda val_len, front: "%" + FLAGS[front] + str(val_len) + "d",
+                    "float": lambda val_len, decimal_len, front: "%" + FLAGS[front] + str(val_len) + "." + str(decimal_len) + "f",
+                    "date": lambda: "%s",
+                    "time": lambda second_len, decimal_len: "%s",
+                }
+
+FIELD_WIDTHS =  {
+                    "string": lambda val_len, front: val_len,
+                    "integer": lambda val_len, front: val_len,
+                    "float": lambda val_len, decimal_len, front: val_len,
+                    "date": lambda: 10,
+                    "time": lambda second_len, decimal_len: second_len + 5,
+                }
+
+def dateSplitter():
+    """
+    Function for creating a function that writes a date in the YEAR MODA format with a single format operation.
+
+    :returns: function that takes a date and returns the formatted string
+    """
+    template = " %-4d %02d%02d"
+
+    def splitDate(value):
+        return template % (value.year, value.month, value.day)
+
+    return splitDate
+
+def timeSplitter(second_len, decimal_len):
+    """
+    Function for creating a function that writes a time in the HRMM SECON format with a single format operation.
+
+    :param int second_len: length of the seconds
+    :param int decimal_len: amount of decimals of the seconds
+    :returns: function that takes a time or datetime and returns the formatted string
+    """
+    template = "%02d%02d %0" + str(second_len) + "." + str(decimal_len) + "f"
+
+    def splitTime(value):
+        return template % (value.hour, value.minute, float(value.second) + float(value.microsecond)/1000000)
+
+    return splitTime
+
+FIELD_SPLITTERS = {"date": dateSplitter, "time": timeSplitter}
+
+def compileFormat(fields):
+    """
+    Function for compiling a record format into a function. The format is a list of fields where every field is either a literal string or a tuple with the name of the attribute, the type of the value and the arguments for the formatter of the type.
+
+    All attributes of a record are fetched with a single attrgetter and the record is written with a single format operation. The format string is built once for every combination of missing values, where the missing values are already written into the format string as spaces. If the line does not come out with the right length, some value did not fit into its field and the record is written again value by value with the same rules as in :mod:`utils`. Missing dates also change the length of the line, so they are always written value by value.
+
+    :param list fields: fields of the record
+    :returns: function that takes the record and returns it as a string
+    """
+    names = []
+    parts = []
+    slow_template = ""
+    formatters = []
+    splitters = []
+    slow_missing = []
+    line_length = 0
+
+    for field in fields:
+        if isinstance(field, str):
+            parts.append((None, field.replace("%", "%%"), len(field)))
+            slow_template += field.replace("{", "{{").replace("}", "}}")
+            line_length += len(field)
+        else:
+            width = FIELD_WIDTHS[field[1]](*field[2:])
+            parts.append((len(names), FIELD_SPECS[field[1]](*field[2:]), width))
+            slow_template += "{" + str(len(names)) + "}"
+            line_length += width
+            if field[1] in FIELD_SPLITTERS:
+                splitters.append((len(names), FIELD_SPLITTERS[field[1]](*field[2:])))
+            if field[1] == "date":
+                slow_missing.append(len(names))
+            names.append(field[0])
+            formatters.append(FORMATTERS[field[1]](*field[2:]))
+
+    slow_template = slow_template.format
+    getter = operator.attrgetter(*names)
+    if len(names) == 1:
+        getter = lambda record, attr = getter: (attr(record),)
+    templates = {}
+
+    def buildTemplate(missing):
+        if any([missing[i] for i in slow_missing]):
+            return None
+        return "".join([spec if i is None or not missing[i] else width * " "
+                        for i, spec, width in parts])
+
+    def formatRecordSlowly(record):
+        return slow_template(*[f(v) for f, v in zip(formatters, getter(record))])
+
+    def formatRecord(record):
+        values = getter(record)
+        missing = tuple([v is None for v in values])
+        try:
+            template = templates[missing]
+        except KeyError:
+            template = templates[missing] = buildTemplate(missing)
+
+        if template is None:
+            return formatRecordSlowly(record)
+
+        if splitters:
+            values = list(values)
+            for i, splitter in splitters:
+                if values[i] is not None:
+                    values[i] = splitter(values[i])
+
+        try:
+            line = template % tuple([v for v in values if v is not None])
+        except (TypeError, ValueError):
+            return formatRecordSlowly(record)
+        if len(line) != line_length:
+            return formatRecordSlowly(record)
+        return line
+
+    return formatRecord
+
+MAIN_FORMAT =   [
+                    ("origin_date", "date"),
+                    " ",
+                    ("origin_time", "time", 4, 1),
+                    ("location_model", "string", 1, '<'),
+                    ("distance_indicator", "string", 1, '<'),
+                    ("event_desc_id", "string", 1, '<'),
+                    ("epicenter_latitude", "float", 7, 3, '>'),
+                    ("epicenter_longitude", "float", 8, 3, '>'),
+                    ("depth", "float", 5, 1, '>'),
+                    ("depth_control", "string", 1, '>'),
+                    ("locating_indicator", "string", 1, '>'),
+                    ("epicenter_reporting_agency", "string", 3, '<'),
+                    ("stations_used", "integer", 3, '>'),
+                    ("rms_time_residuals", "float", 4, 1, '>'),
+                    " ",
+                    ("magnitude_1", "float", 3, 1, '>'),
+                    ("type_of_magnitude_1", "string", 1, '>'),
+                    ("magnitude_reporting_agency_1", "string", 3, '>'),
+                    " ",
+                    ("magnitude_2", "float", 3, 1, '>'),
+                    ("type_of_magnitude_2", "string", 1, '>'),
+                    ("magnitude_reporting_agency_2", "string", 3, '>'),
+                    " ",
+                    ("magnitude_3", "float", 3, 1, '>'),
+                    ("type_of_magnitude_3", "string", 1, '>'),
+                    ("magnitude_reporting_agency_3", "string", 3, '>'),
+                    "1\n",
+                ]
+
+ERROR_FORMAT =  [
+                    " GAP=",
+                    ("gap", "integer", 3, '>'),
+                    "        ",
+                    ("second_error", "float", 4, 1, '>'),
+                    "   ",
+                    ("epicenter_latitude_error", "float", 7, 3, '>'),
+                    ("epicenter_longitude_error", "float", 8, 3, '>'),
+                    ("depth_error", "float", 5, 1, '>'),
+                    "             ",
+                    ("magnitude_error", "float", 3, 1, '>'),
+                    "                    5\n",
+                ]
+
+MACROSEISMIC_FORMAT =   [
+                            "     ",
+                            ("description", "string", 15, '<'),
+                            " ",
+                            ("diastrophism_code", "string", 1, '>'),
+                            ("tsunami_code", "string", 1, '>'),
+                            ("seiche_code", "string", 1, '>'),
+                            ("cultural_effects", "string", 1, '>'),
+                            ("unusual_effects", "string", 1, '>'),
+                            " ",
+                            ("maximum_observed_intensity", "integer", 2, '>'),
+                            ("maximum_intensity_qualifier", "string", 1, '>'),
+                            ("intensity_scale", "string", 2, '>'),
+                            " ",
+                            ("macroseismic_latitude", "float", 6, 2, '>'),
+                            " ",
+                            ("macroseismic_longitude", "float", 7, 2, '>'),
+                            " ",
+                            ("macroseismic_magnitude", "float", 3, 1, '>'),
+                            ("type_of_magnitude", "string", 1, '>'),
+                            ("logarithm_of_radius", "float", 4, 2, '>'),
+                            ("logarithm_of_area_1", "float", 5, 2, '>'),
+                            ("bordering_intensity_1", "integer", 2, '>'),
+                            ("logarithm_of_area_2", "float", 5, 2, '>'),
+                            ("bordering_intensity_2", "integer", 2, '>'),
+                            " ",
+                            ("quality_rank", "string", 1, '>'),
+                            ("reporting_agency", "string", 3, '>'),
+                            "    2\n",
+                        ]
+
+COMMENT_FORMAT =    [
+                        " ",
+                        ("h_comment", "string", 78, '<'),
+                        "3\n",
+                    ]
+
+WAVEFORM_FORMAT =   [
+                        " ",
+                        ("waveform_info", "string", 78, '<'),
+                        "6\n",
+                    ]
+
+PHASE_DATA_FORMAT = [
+                        " ",
+                        ("station_code", "string", 5, '<'),
+                        ("sp_instrument_type", "string", 1, '<'),
+                        ("sp_component", "string", 1, '<'),
+                        " ",
+                        ("quality_indicator", "string", 1, '<'),
+                        ("phase_type", "string", 4, '<'),
+                        ("weight", "integer", 1, '<'),
+                        " ",
+                        ("first_motion", "string", 1, '<'),
+                        " ",
+                        ("observation_time", "time", 5, 2),
+                        " ",
+                        ("signal_duration", "integer", 4, '>'),
+                        " ",
+                        ("max_amplitude", "float", 6, 1, '>'),
+                        " ",
+                        ("max_amplitude_period", "float", 4, 2, '<'),
+                        " ",
+                        ("back_azimuth", "float", 5, 1, '>'),
+                        " ",
+                        ("apparent_velocity", "float", 4, 1, '>'),
+                        ("signal_to_noise", "float", 4, 1, '>'),
+                        ("azimuth_residual", "integer", 3, '>'),
+                        ("travel_time_residual", "float", 5, 1, '>'),
+                        ("location_weight", "integer", 2, '>'),
+                        ("epicenter_distance", "integer", 5, '>'),
+                        " ",
+                        ("epicenter_to_station_azimuth", "integer", 3, '>'),
+                        " \n",
+                    ]
+
+formatMainHeader = compileFormat(MAIN_FORMAT)
+formatErrorHeader = compileFormat(ERROR_FORMAT)
+formatMacroseismicHeader = compileFormat(MACROSEISMIC_FORMAT)
+formatCommentHeader = compileFormat(COMMENT_FORMAT)
+formatWaveformHeader = compileFormat(WAVEFORM_FORMAT)
+formatPhaseData = compileFormat(PHASE_DATA_FORMAT)
+
+ID_HEADER = " ID:{:<74d} I\n".format
+HELP_HEADER = " STAT SP IPHASW D HRMM SECON CODA AMPLIT PERI AZIMU VELO SNR AR TRES W  DIS CAZ7\n"
+
+def nordicEventLines(nordic_event):
+    """
+    Function for getting the lines of a NordicEvent in nordic format. The lines are in the same order as in the output of NordicEvent.__str__ and every line ends with a newline.
+
+    :param NordicEvent nordic_event: event to be written
+    :returns: list of the lines as strings
+    """
+    lines = []
+
+    if nordic_event.main_h:
+        lines.append(formatMainHeader(nordic_event.main_h[0]))
+        if nordic_event.main_h[0].error_h:
+            lines.append(formatErrorHeader(nordic_event.main_h[0].error_h))
+
+    if nordic_event.waveform_h:
+        lines.append(formatWaveformHeader(nordic_event.waveform_h[0]))
+
+    lines.extend([formatCommentHeader(h) for h in nordic_event.comment_h])
+
+    for main in nordic_event.main_h[1:]:
+        lines.append(formatMainHeader(main))
+        if main.error_h:
+            lines.append(formatErrorHeader(main.error_h))
+
+    lines.extend([formatMacroseismicHeader(h) for h in nordic_event.macro_h])
+
+    if nordic_event.event_id != -1:
+        lines.append(ID_HEADER(nordic_event.event_id))
+    lines.append(HELP_HEADER)
+
+    lines.extend([formatPhaseData(d) for d in nordic_event.data])
+
+    return lines
+
+def formatNordicEvent(nordic_event):
+    """
+    Function for writing a NordicEvent into a string in nordic format. The string is the same as str(nordic_event).
+
+    :param NordicEvent nordic_event: event to be written
+    :returns: the event as a string
+    """
+    return "".join(nordicEventLines(nordic_event))
+
+def writeNordicEvents(nordic_events, f):
+    """
+    Function for writing NordicEvents into a file in nordic format. Every event is followed by an empty line like in the nordic files read by NorDB.
+
+    :param list nordic_events: list or generator of NordicEvent objects
+    :param file f: python file object where the events are written
+    """
+    for nordic_event in nordic_events:
+        f.writelines(nordicEventLines(nordic_event))
+        f.write("\n")
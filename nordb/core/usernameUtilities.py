@@ -1,18 +1,27 @@
 """
-This module contains function for logging into the database
+This module contains function for logging into the database. All connections to the database are taken from a connection pool that is shared by the whole process. The minimum and maximum sizes of the pool are read from the .nordb.config file.
+
 Functions and Classes
 ---------------------
 """
 
 import os
+import time
 import logging
+import threading
 
 import psycopg2
+import psycopg2.extensions
 
 from nordb import settings
 
 MODULE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 
+POOL_CHECK_INTERVAL = 30.0
+
+connection_pool = None
+INHERITED_POOLS = []
+
 def databaseSettingsDict(db_dict):
     """
     Function for transfroming the database setting dict into a one that psycopg2 accepts.
@@ -26,15 +35,224 @@ def databaseSettingsDict(db_dict):
 
 def log2nordb(password = None):
     """
-    Function that logs to database and returns a psycopg2 Connect object.
+    Function that logs to database and returns a connection object. The connection is checked out from the connection pool of the process and behaves like a psycopg2 connection. Calling close on the connection returns it to the pool instead of closing it. The connection can also be used in a with block, in which case it is committed and returned to the pool at the end of the block or rolled back and returned if the block raises an exception.
 
-    :return: psycopg2.Connect object
+    :return: PooledConnection object
     """
     if password is not None:
         settings.database_settings[settings.active_database]["password"] = password
 
     if settings.test:
-        return psycopg2.connect(**databaseSettingsDict(settings.database_settings["test database"]))
+        db_settings = databaseSettingsDict(settings.database_settings["test database"])
     else:
-        return psycopg2.connect(**databaseSettingsDict(settings.database_settings[settings.active_database]))
+        db_settings = databaseSettingsDict(settings.database_settings[settings.active_database])
+
+    return getConnectionPool(db_settings).getConnection()
+
+def getConnectionPool(db_settings):
+    """
+    Function for getting the connection pool of the given database settings. If the settings differ from the ones of the current pool or the process has been forked after the pool was created, a new pool is created.
+
+    :param dict db_settings: database settings in the format psycopg2.connect accepts
+    :returns: ConnectionPool object
+    """
+    global connection_pool
+
+    pool_key = (os.getpid(), tuple(sorted(db_settings.items())), settings.pool_min_size, settings.pool_max_size)
+
+    if connection_pool is not None and connection_pool.pool_key != pool_key:
+        if connection_pool.pool_key[0] == os.getpid():
+            connection_pool.closeAll()
+        else:
+            INHERITED_POOLS.append(connection_pool)
+        connection_pool = None
+
+    if connection_pool is None:
+        connection_pool = ConnectionPool(pool_key, db_settings)
+
+    return connection_pool
+
+def closeConnectionPool():
+    """
+    Function for closing all connections of the connection pool of the process. This has to be done before dropping the database as idle pooled connections prevent it.
+    """
+    global connection_pool
+
+    if connection_pool is not None:
+        if connection_pool.pool_key[0] == os.getpid():
+            connection_pool.closeAll()
+        else:
+            INHERITED_POOLS.append(connection_pool)
+        connection_pool = None
+
+class ConnectionPool:
+    """
+    Class for a pool of connections to the database. Connections are opened when they are needed up to pool_max_size and pool_min_size connections are kept open after they have been used. Every connection is checked before it is given out and broken connections are replaced with new ones.
+
+    :param tuple pool_key: key that identifies the pool settings
+    :param dict db_settings: database settings in the format psycopg2.connect accepts
+    :ivar int hits: number of checkouts served with an existing connection
+    :ivar int misses: number of checkouts that opened a new connection
+    """
+    def __init__(self, pool_key, db_settings):
+        self.pool_key = pool_key
+        self.db_settings = db_settings
+        self.min_size = pool_key[2]
+        self.max_size = pool_key[3]
+        self.idle = []
+        self.checked_out = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def getConnection(self):
+        """
+        Method for checking out a connection from the pool.
+
+        :returns: PooledConnection object
+        """
+        with self.lock:
+            if self.checked_out >= self.max_size:
+                raise Exception("Connection pool exhausted! All {0} connections are in use".format(self.max_size))
+            self.checked_out += 1
+
+        try:
+            conn = None
+            while conn is None:
+                with self.lock:
+                    if self.idle:
+                        conn, returned = self.idle.pop()
+                    else:
+                        break
+                if not self.connectionIsHealthy(conn, returned):
+                    self.discardConnection(conn)
+                    conn = None
+
+            if conn is None:
+                conn = psycopg2.connect(**self.db_settings)
+                self.misses += 1
+            else:
+                self.hits += 1
+        except:
+            with self.lock:
+                self.checked_out -= 1
+            raise
+
+        return PooledConnection(self, conn)
+
+    def connectionIsHealthy(self, conn, returned):
+        """
+        Method for checking that a pooled connection can still be used. Connections that have been idle longer than POOL_CHECK_INTERVAL seconds are pinged with a query.
+
+        :param psycopg2.connection conn: connection to be checked
+        :param float returned: time when the connection was returned to the pool
+        :returns: True if the connection can be used
+        """
+        if conn.closed:
+            return False
+        if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if time.monotonic() - returned < POOL_CHECK_INTERVAL:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+        return True
+
+    def returnConnection(self, conn):
+        """
+        Method for returning a connection to the pool. All uncommitted changes of the connection are rolled back like they would be when closing a connection.
+
+        :param psycopg2.connection conn: connection to be returned
+        """
+        try:
+            if not conn.closed:
+                conn.rollback()
+                if conn.autocommit:
+                    conn.autocommit = False
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            pass
+
+        with self.lock:
+            self.checked_out -= 1
+            if conn.closed or len(self.idle) + self.checked_out >= self.max_size or len(self.idle) >= self.min_size:
+                keep = False
+            else:
+                self.idle.append((conn, time.monotonic()))
+                keep = True
+
+        if not keep:
+            self.discardConnection(conn)
+
+    def discardConnection(self, conn):
+        """
+        Method for closing a connection that is not returned to the pool
+
+        :param psycopg2.connection conn: connection to be closed
+        """
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def closeAll(self):
+        """
+        Method for closing all idle connections of the pool.
+        """
+        with self.lock:
+            idle = self.idle
+            self.idle = []
+        for conn, returned in idle:
+            self.discardConnection(conn)
+
+class PooledConnection:
+    """
+    Class that wraps a psycopg2 connection checked out from a ConnectionPool. All attributes of the psycopg2 connection can be used through this object. Closing it returns the connection to the pool.
+
+    :param ConnectionPool pool: pool from which the connection is from
+    :param psycopg2.connection conn: the wrapped connection
+    """
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise psycopg2.InterfaceError("connection already closed")
+        return getattr(self._conn, name)
+
+    @property
+    def closed(self):
+        if self._conn is None:
+            return 1
+        return self._conn.closed
+
+    def close(self):
+        """
+        Method for returning the connection back to the pool. The connection cannot be used after this.
+        """
+        if self._conn is not None:
+            conn = self._conn
+            self._conn = None
+            self._pool.returnConnection(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._conn is not None and not self._conn.closed:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        self.close()
 
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -1,11 +1,14 @@
 """
 Module containing all the tools for validation.
 
+The datetime strings of nordic files are parsed by slicing the fixed-width fields straight into integers. The date parts repeat for every phase line of an event and often for thousands of lines in a file, so they are parsed only once and kept in LRU caches of DATE_CACHE_SIZE entries.
+
 Functions and Classes
 ---------------------
 """
 import math
 import logging
+import functools
 from datetime import time
 from datetime import date
 from datetime import datetime
@@ -25,6 +28,8 @@ n_types = {  0: "Nordic Event",
             14: "Response Data",
             -999: "Validation Test",}
 
+DATE_CACHE_SIZE = 4096
+
 class values():
     maxInt = 9223372036854775807
 
@@ -168,20 +173,29 @@ def validateDatetime(datetime_val, datetime_name = None, n_type = None):
     if datetime_val.strip() == "":
         return None
     try:
-        return datetime (
-                        year = int(datetime_val[:4]),
-                        month = int(datetime_val[5:7]),
-                        day = int(datetime_val[7:9]),
-                        hour = int(datetime_val[10:12]),
-                        minute = int(datetime_val[12:14]),
-                        second = int(datetime_val[15:17]),
-                        microsecond = int("{0:<06s}".format(datetime_val[18:].strip()))
-                        )
+        year, month, day = parseDateParts(datetime_val[:9])
+        return datetime(year,
+                        month,
+                        day,
+                        int(datetime_val[10:12]),
+                        int(datetime_val[12:14]),
+                        int(datetime_val[15:17]),
+                        int(datetime_val[18:].strip().ljust(6, "0")))
     except:
         raise Exception("Validation Error - {0}: {1} is not in valid format ({2})".format(n_types[n_type],
                                                                                           datetime_name,
                                                                                           datetime_val))
 
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def parseDateParts(date_string):
+    """
+    Function for parsing the "YYYY MMDD" date part of a datetime string into integers. The results are cached, because the date part is the same for all phase lines of an event.
+
+    :param str date_string: first nine characters of the datetime string
+    :returns: tuple of year, month and day as integers
+    :raises: ValueError
+    """
+    return int(date_string[:4]), int(date_string[5:7]), int(date_string[7:9])
 
 def validateDate(date_string, date_name, n_type):
     """
@@ -202,20 +216,31 @@ def validateDate(date_string, date_name, n_type):
         return None
 
     try:
-        new_date = date(year=int(date_string[:4].strip()),
-                        month=int(date_string[5:7].strip()),
-                        day=int(date_string[7:].strip()))
+        new_date = parseDate(date_string)
     except:
-        try:
-            new_date = date(year=int(date_string[:4].strip()),
-                            month=int(date_string[5:7].strip()),
-                            day=int(date_string[8:].strip()))
-        except:
-            msg = "Validation Error - {0}: {1} is not parsable into date!({2})"
-            raise Exception(msg.format(n_types[n_type], date_name, date_string))
+        msg = "Validation Error - {0}: {1} is not parsable into date!({2})"
+        raise Exception(msg.format(n_types[n_type], date_name, date_string))
 
     return new_date
 
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def parseDate(date_string):
+    """
+    Function for parsing a date string in "YYYY MMDD" or "YYYY MM DD" format into a date. The results are cached, because the same dates repeat through the whole file.
+
+    :param str date_string: date string
+    :returns: the date
+    :raises: ValueError
+    """
+    try:
+        return date(int(date_string[:4].strip()),
+                    int(date_string[5:7].strip()),
+                    int(date_string[7:].strip()))
+    except ValueError:
+        return date(int(date_string[:4].strip()),
+                    int(date_string[5:7].strip()),
+                    int(date_string[8:].strip()))
+
 def validateTime(time_string, time_name, n_type):
     """
     Function that determines if a time_string is a valid time or not
@@ -232,10 +257,10 @@ def validateTime(time_string, time_name, n_type):
     if type(time_string) is str and time_string.strip() == "":
         return None
     try:
-        new_time = time(hour=int(time_string[:2]),
-                        minute=int(time_string[2:4]),
-                        second=int(time_string[5:7]),
-                        microsecond=100000*int(time_string[8:]))
+        new_time = time(int(time_string[:2]),
+                        int(time_string[2:4]),
+                        int(time_string[5:7]),
+                        100000*int(time_string[8:]))
     except:
         msg = "Validation Error - {0}: {1} is not parsable into time!({2})"
         raise Exception(msg.format(n_types[n_type], time_name, time_string))
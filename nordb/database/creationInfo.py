@@ -28,7 +28,7 @@ DELETE_UNNECESSARY_CREATION_INFO =  (
                                     "LEFT JOIN network ON"
                                     "       network.creation_id = creation_info.id "
                                     "WHERE "
-                                    "   creation_info.id = %s"
+                                    "   creation_info.id = %s "
                                     "AND "
                                     "   ("
                                     "   nordic_event.id IS NOT NULL OR "
@@ -0,0 +1,92 @@
+"""
+This module handles the event_summary table. The table has one row for every event with the values of its preferred main header, its solution type and its creation info, so events can be listed and counted without reading the header tables. The rows are refreshed with the refresh_event_summary function of the database every time an event is inserted or its solution type or root is changed.
+
+Functions and Classes
+---------------------
+"""
+from nordb.core import usernameUtilities
+
+REFRESH_EVENT_SUMMARY = (
+                        "SELECT "
+                        "   refresh_event_summary(%s::INTEGER[])"
+                        )
+
+REFRESH_ROOT_SUMMARY =  (
+                        "SELECT "
+                        "   refresh_event_summary(ARRAY("
+                        "       SELECT "
+                        "           id "
+                        "       FROM "
+                        "           nordic_event "
+                        "       WHERE "
+                        "           root_id = %s))"
+                        )
+
+REFRESH_ALL_SUMMARIES = (
+                        "SELECT "
+                        "   refresh_event_summary(ARRAY("
+                        "       SELECT "
+                        "           id "
+                        "       FROM "
+                        "           nordic_event))"
+                        )
+
+def refreshEventSummary(event_ids, db_conn = None):
+    """
+    Function for refreshing the summaries of the given events. The changes are not committed, so call this with the connection that changed the events before committing.
+
+    :param list event_ids: ids of the events
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    """
+    event_ids = list(event_ids)
+    if not event_ids:
+        return
+
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    cur = conn.cursor()
+    cur.execute(REFRESH_EVENT_SUMMARY, (event_ids,))
+
+    if db_conn is None:
+        conn.commit()
+        conn.close()
+
+def refreshRootSummary(root_id, db_conn = None):
+    """
+    Function for refreshing the summaries of all events attached to a root id like :func:`refreshEventSummary`.
+
+    :param int root_id: root id of the events
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    """
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    cur = conn.cursor()
+    cur.execute(REFRESH_ROOT_SUMMARY, (root_id,))
+
+    if db_conn is None:
+        conn.commit()
+        conn.close()
+
+def refreshAllEventSummaries(db_conn = None):
+    """
+    Function for rebuilding the summaries of all events in the database. This is used for filling the table when migrating an old database.
+
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    """
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    cur = conn.cursor()
+    cur.execute(REFRESH_ALL_SUMMARIES)
+
+    if db_conn is None:
+        conn.commit()
+        conn.close()
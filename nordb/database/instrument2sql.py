@@ -10,6 +10,7 @@ import unidecode
 
 from nordb.nordic.instrument import Instrument
 from nordb.core import usernameUtilities
+from nordb.database import metadataCache
 from nordb.core.utils import stringToDate
 
 INSTRUMENT_INSERT = (
@@ -73,5 +74,6 @@ def insertInstrument2Database(instrument):
         raise e
 
     conn.commit()
+    metadataCache.invalidate()
     conn.close()
 
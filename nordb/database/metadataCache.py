@@ -0,0 +1,206 @@
+"""
+This module contains the in-process cache for the station and response metadata read from the database. Processing pipelines ask for the same stations and responses for every pick, so the metadata objects are cached and the same objects are returned for every date inside the validity interval in which the database would return exactly the same rows.
+
+A validity interval is computed from the on and off times of all station, sitechan and sensor rows that could affect the answer. Inside the interval no row changes its state, so the cached answer is the answer the database would give. The cache is a LRU cache and the least recently used entries are evicted when the cache is full.
+
+All functions that write station or response information into the database clear the cache with :func:`invalidate`. Writes done by other processes are not seen by the cache, so long running processes should call :func:`invalidate` when the metadata in the database has been changed by someone else.
+
+The objects returned from the cache are shared between all callers and they should not be modified.
+
+Functions and Classes
+---------------------
+"""
+
+import datetime
+import time
+from collections import OrderedDict
+
+METADATA_CACHE_SIZE = 4096
+
+class MetadataCache(object):
+    """
+    Class for the LRU cache of metadata objects with time validity intervals. Every key can have several entries with different validity intervals.
+
+    :param int max_size: maximum amount of entries in the cache
+    :ivar int max_size: maximum amount of entries in the cache
+    :ivar int hits: amount of lookups that were found from the cache
+    :ivar int misses: amount of lookups that were not found from the cache
+    """
+    def __init__(self, max_size = METADATA_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, moment):
+        """
+        Method for getting a value from the cache.
+
+        :param tuple key: key of the value
+        :param moment: the moment for which the value is wanted
+        :returns: tuple of a boolean telling if the value was found and the value itself
+        """
+        for interval, value in self.entries.get(key, []):
+            if inInterval(moment, interval):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+
+        self.misses += 1
+        return False, None
+
+    def put(self, key, interval, value):
+        """
+        Method for adding a value to the cache.
+
+        :param tuple key: key of the value
+        :param tuple interval: validity interval of the value from :func:`validityInterval`
+        :param value: value to be cached
+        """
+        if self.max_size <= 0:
+            return
+
+        self.entries.setdefault(key, []).append((interval, value))
+        self.entries.move_to_end(key)
+        self.size += 1
+
+        while self.size > self.max_size:
+            old_key, old_entries = self.entries.popitem(last = False)
+            self.size -= len(old_entries)
+
+    def invalidate(self):
+        """
+        Method for removing all values from the cache.
+        """
+        self.entries.clear()
+        self.size = 0
+
+    def getStatistics(self):
+        """
+        Method for getting the statistics of the cache.
+
+        :returns: dict with the hits, misses, size and max_size of the cache
+        """
+        return {"hits":self.hits,
+                "misses":self.misses,
+                "size":self.size,
+                "max_size":self.max_size}
+
+cache = MetadataCache()
+
+def invalidate():
+    """
+    Function for clearing the metadata cache. This has to be called after the station or response information in the database has changed.
+    """
+    cache.invalidate()
+
+def getStatistics():
+    """
+    Function for getting the hit and miss counts and the size of the metadata cache.
+
+    :returns: dict with the hits, misses, size and max_size of the cache
+    """
+    return cache.getStatistics()
+
+def validityInterval(moment, rows):
+    """
+    Function for calculating the interval around moment in which none of the rows changes from valid to invalid or the other way around. A row is valid at moment if its start is less or equal to the moment and its end is None or greater than the moment. If end_inclusive is True the row is also valid when its end is equal to the moment.
+
+    :param moment: the moment for which the interval is calculated
+    :param list rows: list of (start, end, end_inclusive) tuples. Rows without start are never valid and ignored
+    :returns: tuple of (low, low_inclusive, high, high_inclusive) where low and high are None if the interval is unbounded
+    """
+    low, low_inclusive = None, False
+    high, high_inclusive = None, False
+
+    for start, end, end_inclusive in rows:
+        if start is None:
+            continue
+
+        if start <= moment:
+            low, low_inclusive = raiseLow(low, low_inclusive, start, True)
+        else:
+            high, high_inclusive = lowerHigh(high, high_inclusive, start, False)
+
+        if end is None:
+            continue
+
+        if end > moment or (end_inclusive and end == moment):
+            high, high_inclusive = lowerHigh(high, high_inclusive, end, end_inclusive)
+        else:
+            low, low_inclusive = raiseLow(low, low_inclusive, end, not end_inclusive)
+
+    return (low, low_inclusive, high, high_inclusive)
+
+def raiseLow(low, low_inclusive, value, inclusive):
+    """
+    Function for raising the low end of an interval to value if it is tighter than the old one.
+    """
+    if low is None or value > low or (value == low and not inclusive):
+        return value, inclusive
+    return low, low_inclusive
+
+def lowerHigh(high, high_inclusive, value, inclusive):
+    """
+    Function for lowering the high end of an interval to value if it is tighter than the old one.
+    """
+    if high is None or value < high or (value == high and not inclusive):
+        return value, inclusive
+    return high, high_inclusive
+
+def inInterval(moment, interval):
+    """
+    Function for checking if moment is inside an interval from :func:`validityInterval`.
+
+    :param moment: the moment that is checked
+    :param tuple interval: the interval
+    :returns: True or False
+    """
+    low, low_inclusive, high, high_inclusive = interval
+
+    if low is not None and (moment < low or (moment == low and not low_inclusive)):
+        return False
+    if high is not None and (moment > high or (moment == high and not high_inclusive)):
+        return False
+    return True
+
+def date2datetime(station_date):
+    """
+    Function for converting a date into a datetime at the midnight of that date. Datetimes are returned as they are.
+
+    :param date station_date: date or datetime
+    :returns: datetime object
+    """
+    if isinstance(station_date, datetime.datetime):
+        return station_date
+    return datetime.datetime.combine(station_date, datetime.time())
+
+def sensorRows2Datetimes(rows):
+    """
+    Function for converting the (time, endtime) rows of sensors into rows for :func:`validityInterval` in datetimes. The sensors are compared to the station date as whole unix seconds, so the sensor becomes valid at the first whole second after its time and stays valid until the next whole second after its endtime. Endtime 9999999999.999 means that the sensor is still open.
+
+    :param list rows: list of (time, endtime) tuples
+    :returns: list of (start, end, end_inclusive) tuples
+    """
+    datetime_rows = []
+    for start, end in rows:
+        if start is None or end is None:
+            continue
+        start = datetime.datetime.fromtimestamp(-int(-start // 1))
+        if end == 9999999999.999:
+            end = None
+        else:
+            end = datetime.datetime.fromtimestamp(int(end // 1) + 1)
+        datetime_rows.append((start, end, False))
+
+    return datetime_rows
+
+def date2timestamp(date):
+    """
+    Function for converting a datetime into the unix timestamp that is used for comparing it with sensor times.
+
+    :param datetime date: the datetime
+    :returns: float
+    """
+    return time.mktime(date.timetuple())
@@ -6,6 +6,7 @@ Classes and Functions
 """
 
 from nordb.core import usernameUtilities
+from nordb.database import metadataCache
 from nordb.database import creationInfo
 
 def addNetwork(network_code, privacy_level, db_conn = None):
@@ -57,6 +58,7 @@ def removeNetwork(network_code, db_conn = None):
     cur.execute("DELETE FROM network WHERE network = %s", (network_code,))
 
     conn.commit()
+    metadataCache.invalidate()
 
     if db_conn is None:
         conn.close()
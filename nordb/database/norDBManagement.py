@@ -7,8 +7,10 @@ Functions and Classes
 
 import sys
 import os
+import re
 import datetime
 import psycopg2
+from psycopg2 import sql
 from subprocess import call
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
@@ -16,7 +18,35 @@ MODULE_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__))) + os.
 
 BACKUP_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))) + os.sep + "backups" + os.sep
 
+POLICY_FILES = [
+    "nordb_user_policies.sql",
+    "creation_info_policies.sql",
+    "nordic_event_root_policies.sql",
+    "nordic_file_policies.sql",
+    "solution_type_policies.sql",
+    "nordic_event_policies.sql",
+    "nordic_header_main_policies.sql",
+    "nordic_header_error_policies.sql",
+    "nordic_header_comment_policies.sql",
+    "nordic_header_macroseismic_policies.sql",
+    "nordic_header_waveform_policies.sql",
+    "nordic_phase_data_policies.sql",
+    "network_policies.sql",
+    "station_policies.sql",
+    "sitechan_policies.sql",
+    "instrument_policies.sql",
+    "sensor_policies.sql",
+    "response_policies.sql",
+    "fap_response_policies.sql",
+    "paz_response_policies.sql",
+    "event_summary_policies.sql",
+]
+
+CREATE_POLICY_PATTERN = re.compile(r"CREATE POLICY (\w+) ON (\w+)")
+
 from nordb.core import usernameUtilities
+from nordb.database import metadataCache
+from nordb.database import eventSummary
 from nordb import settings
 
 def databaseIsRunning():
@@ -75,7 +105,7 @@ def getRoleLevel(role_str):
 
 def countEvents(solution_type = None, db_conn = None):
     """
-    Function for returning the number of all events in the database.
+    Function for returning the number of all events in the database. The events are counted from the event_summary table.
 
     :param solution_type str: If solution_type is defined, countEvents will only count all events of the chosen type. Otherwise it will return the amount of all events in the database.
     :returns: The number of events of the chosen type or number of all events
@@ -88,9 +118,9 @@ def countEvents(solution_type = None, db_conn = None):
     cur = conn.cursor()
 
     if solution_type is None:
-        cur.execute("SELECT COUNT(*) FROM nordic_event")
+        cur.execute("SELECT COUNT(*) FROM event_summary")
     elif len(solution_type) <= 6:
-        cur.execute("SELECT COUNT(*) FROM nordic_event WHERE solution_type = %s", (solution_type,))
+        cur.execute("SELECT COUNT(*) FROM event_summary WHERE solution_type = %s", (solution_type,))
     else:
         if db_conn is None:
             conn.close()
@@ -171,6 +201,7 @@ def createDatabase():
     cur.execute(open(MODULE_PATH + "sql/create_roles.sql", "r").read())
     cur.execute(open(MODULE_PATH + "sql/nordb_user.sql", "r").read())
     cur.execute(open(MODULE_PATH + "sql/creation_info.sql", "r").read())
+    cur.execute(open(MODULE_PATH + "sql/creation_info_visibility.sql", "r").read())
     cur.execute(open(MODULE_PATH + "sql/nordic_event_root.sql", "r").read())
     cur.execute(open(MODULE_PATH + "sql/nordic_file.sql", "r").read())
     cur.execute(open(MODULE_PATH + "sql/solution_type.sql", "r").read())
@@ -189,33 +220,62 @@ def createDatabase():
     cur.execute(open(MODULE_PATH + "sql/paz_response.sql", "r").read())
     cur.execute(open(MODULE_PATH + "sql/instrument.sql", "r").read())
     cur.execute(open(MODULE_PATH + "sql/sensor.sql", "r").read())
+    cur.execute(open(MODULE_PATH + "sql/event_summary.sql", "r").read())
+
+    cur.execute(open(MODULE_PATH + "sql/indexes.sql", "r").read())
 
-    cur.execute(open(MODULE_PATH + "sql/nordb_user_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/creation_info_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/nordic_event_root_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/nordic_file_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/solution_type_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/nordic_event_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/nordic_header_main_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/nordic_header_error_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/nordic_header_comment_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/nordic_header_macroseismic_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/nordic_header_waveform_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/nordic_phase_data_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/network_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/station_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/sitechan_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/instrument_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/sensor_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/response_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/fap_response_policies.sql", "r").read())
-    cur.execute(open(MODULE_PATH + "sql/paz_response_policies.sql", "r").read())
+    for policy_file in POLICY_FILES:
+        cur.execute(open(MODULE_PATH + "sql/" + policy_file, "r").read())
 
     cur.execute(open(MODULE_PATH + "sql/grant_access.sql", "r").read())
 
     conn.commit()
+    metadataCache.invalidate()
     conn.close()
 
+def migrateDatabase(db_conn = None):
+    """
+    Function for bringing an existing database up to date with the current table definitions. Adds the missing columns with migrate.sql, creates the event_summary table and fills it from the existing events if it is missing, recreates the row level security policies created by the files in POLICY_FILES, creates all indexes from indexes.sql that are missing from the database and updates the planner statistics afterwards. Running this function again on an up to date database does nothing harmful.
+    """
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    if not checkPermissions('owner', conn):
+        if db_conn is None:
+            conn.close()
+        raise Exception('You are not the owner of the database so you cannot run this command')
+
+    cur = conn.cursor()
+
+    cur.execute("SELECT to_regclass('event_summary')")
+    summary_exists = cur.fetchone()[0] is not None
+
+    cur.execute(open(MODULE_PATH + "sql/migrate.sql", "r").read())
+    cur.execute(open(MODULE_PATH + "sql/creation_info_visibility.sql", "r").read())
+    cur.execute(open(MODULE_PATH + "sql/event_summary.sql", "r").read())
+
+    for policy_file in POLICY_FILES:
+        policies = open(MODULE_PATH + "sql/" + policy_file, "r").read()
+        for policy_name, table_name in CREATE_POLICY_PATTERN.findall(policies):
+            cur.execute(sql.SQL("DROP POLICY IF EXISTS {0} ON {1}").format(sql.Identifier(policy_name), sql.Identifier(table_name)))
+        cur.execute(policies)
+
+    if not summary_exists:
+        cur.execute(open(MODULE_PATH + "sql/grant_access.sql", "r").read())
+        eventSummary.refreshAllEventSummaries(conn)
+    cur.execute(open(MODULE_PATH + "sql/indexes.sql", "r").read())
+    conn.commit()
+
+    old_isolation_level = conn.isolation_level
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    cur.execute("ANALYZE")
+    conn.set_isolation_level(old_isolation_level)
+
+    if db_conn is None:
+        conn.close()
+
 def createUser(username, user_role, password, db_conn = None):
     """
     Creates a new user to the database. Admin rights required.
@@ -357,6 +417,7 @@ def destroyDatabase():
 
     conn.commit()
     conn.close()
+    usernameUtilities.closeConnectionPool()
 
     conn = psycopg2.connect(**params)
     conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
@@ -368,6 +429,7 @@ def destroyDatabase():
         cur.execute("DROP DATABASE {0}".format(settings.getDBName()))
 
     conn.commit()
+    metadataCache.invalidate()
     conn.close()
 
 def createBackup():
@@ -403,3 +465,4 @@ def loadBackup(backup_path):
     conn.close()
 
     call(["pg_restore", "-d", "nordb", BACKUP_PATH+backup_path])
+    metadataCache.invalidate()
@@ -6,12 +6,15 @@ Functions and Classes
 """
 
 import psycopg2
+import psycopg2.extras
 import os
 import re
+import io
 import datetime
 
 from nordb.core import usernameUtilities
 from nordb.database import creationInfo
+from nordb.database import eventSummary
 
 INSERT_COMMANDS = {
                     1:  (
@@ -25,10 +28,10 @@ INSERT_COMMANDS = {
                             "type_of_magnitude_1, magnitude_reporting_agency_1, "
                             "magnitude_2, type_of_magnitude_2, magnitude_reporting_agency_2, "
                             "magnitude_3, type_of_magnitude_3, magnitude_reporting_agency_3, "
-                            "event_id) "
+                            "event_id, origin_datetime) "
                         "VALUES "
                             "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, "
-                            "%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
+                            "%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
                         "RETURNING "
                             "id;"
                         ),
@@ -94,6 +97,84 @@ INSERT_COMMANDS = {
                         ),
 }
 
+BULK_TABLES = {
+                    0:  (
+                        "nordic_event",
+                        "(id, solution_type, root_id, nordic_file_id, author_id, creation_id)"
+                        ),
+                    1:  (
+                        "nordic_header_main",
+                        "(id, origin_time, origin_date, location_model, "
+                        "distance_indicator, event_desc_id, epicenter_latitude, "
+                        "epicenter_longitude, depth, depth_control, "
+                        "locating_indicator, epicenter_reporting_agency, "
+                        "stations_used, rms_time_residuals, magnitude_1, "
+                        "type_of_magnitude_1, magnitude_reporting_agency_1, "
+                        "magnitude_2, type_of_magnitude_2, magnitude_reporting_agency_2, "
+                        "magnitude_3, type_of_magnitude_3, magnitude_reporting_agency_3, "
+                        "event_id, origin_datetime)"
+                        ),
+                    2:  (
+                        "nordic_header_macroseismic",
+                        "(id, description, diastrophism_code, tsunami_code, seiche_code, "
+                        "cultural_effects, unusual_effects, maximum_observed_intensity, "
+                        "maximum_intensity_qualifier, intensity_scale, macroseismic_latitude, "
+                        "macroseismic_longitude, macroseismic_magnitude, type_of_magnitude, "
+                        "logarithm_of_radius, logarithm_of_area_1, bordering_intensity_1, "
+                        "logarithm_of_area_2, bordering_intensity_2, quality_rank, "
+                        "reporting_agency, event_id)"
+                        ),
+                    3:  (
+                        "nordic_header_comment",
+                        "(id, h_comment, event_id)"
+                        ),
+                    5:  (
+                        "nordic_header_error",
+                        "(id, gap, second_error, epicenter_latitude_error, "
+                        "epicenter_longitude_error,  depth_error, "
+                        "magnitude_error, header_id)"
+                        ),
+                    6:  (
+                        "nordic_header_waveform",
+                        "(id, waveform_info, event_id)"
+                        ),
+                    7:  (
+                        "nordic_phase_data",
+                        "(id, station_code, sp_instrument_type, sp_component, quality_indicator, "
+                        "phase_type, weight, first_motion, observation_time, "
+                        "signal_duration, max_amplitude, max_amplitude_period, back_azimuth, "
+                        "apparent_velocity, signal_to_noise, azimuth_residual, "
+                        "travel_time_residual, location_weight, epicenter_distance, "
+                        "epicenter_to_station_azimuth, event_id)"
+                        ),
+}
+
+ALLOCATE_IDS =  (
+                "SELECT "
+                "   nextval(%s) "
+                "FROM "
+                "   generate_series(1, %s)"
+                )
+
+def getAuthorId(nordic_event):
+    """
+    Function for parsing the author id of the event from its comment headers. Author id is written into a comment header in parentheses, for example (ABC).
+
+    :param NordicEvent nordic_event: event from which the author is searched
+    :returns: author id as a string or '---' if there is no author in the comments
+    """
+    author_id = None
+
+    for header in nordic_event.comment_h:
+        search = re.search(r'\((\w{3})\)', header.h_comment)
+        if search is not None:
+            author_id = search.group(0)[1:-1]
+
+    if author_id is None:
+        author_id = '---'
+
+    return author_id
+
 def event2Database(nordic_event, solution_type = "O", nordic_filename = None, f_creation_id = None, e_id = -1, privacy_level='public', db_conn = None):
     """
     Function that pushes a NordicEvent object to the database
@@ -114,15 +195,7 @@ def event2Database(nordic_event, solution_type = "O", nordic_filename = None, f_
         creation_id = creationInfo.createCreationInfo(privacy_level, conn)
     else:
         creation_id = f_creation_id
-    author_id = None
-
-    for header in nordic_event.comment_h:
-        search = re.search(r'\((\w{3})\)', header.h_comment)
-        if search is not None:
-            author_id = search.group(0)[1:-1]
-
-    if author_id is None:
-        author_id = '---'
+    author_id = getAuthorId(nordic_event)
 
     cur = conn.cursor()
 
@@ -185,7 +258,7 @@ def event2Database(nordic_event, solution_type = "O", nordic_filename = None, f_
             main.event_id = event_id
             main.h_id = executeCommand( cur,
                                         INSERT_COMMANDS[1],
-                                        main.getAsList(),
+                                        mainHeader2List(main),
                                         True)[0][0]
 
             if main.error_h is not None:
@@ -224,6 +297,11 @@ def event2Database(nordic_event, solution_type = "O", nordic_filename = None, f_
                                     True)[0][0]
             phase_data.d_id = d_id
 
+        if e_id != -1:
+            eventSummary.refreshEventSummary([event_id, e_id], conn)
+        else:
+            eventSummary.refreshEventSummary([event_id], conn)
+
         conn.commit()
     except Exception as e:
         raise e
@@ -233,6 +311,198 @@ def event2Database(nordic_event, solution_type = "O", nordic_filename = None, f_
         if db_conn is None:
             conn.close()
 
+def events2Database(nordic_events, solution_type = "O", nordic_filename = None, f_creation_id = None, privacy_level='public', db_conn = None):
+    """
+    Function that pushes a list of NordicEvent objects to the database in a single transaction. This is the bulk version of :func:`event2Database`. The ids of all new rows are allocated from the table sequences beforehand with one query per table and the rows are then streamed into each table with a single COPY FROM STDIN. If row level security applies to the user, COPY cannot be used and the rows are inserted with multi-row INSERT statements instead.
+
+    Events that have a root_id are attached to that root, all other events get a new root of their own. The event_id, h_id and d_id values of the objects are set like in :func:`event2Database`.
+
+    :param list nordic_events: list of NordicEvent objects that will be pushed to the database
+    :param str solution_type: solution type id of the events
+    :param str nordic_filename: name of the file from which the nordic is read from
+    :param int f_creation_id: id of the creation_info entry in the database
+    :param str privacy_level: privacy level of the events in the database
+    """
+    if not nordic_events:
+        return
+
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    if f_creation_id is None:
+        creation_id = creationInfo.createCreationInfo(privacy_level, conn)
+    else:
+        creation_id = f_creation_id
+
+    cur = conn.cursor()
+    new_roots = []
+
+    try:
+        cur.execute("SELECT allow_multiple FROM solution_type WHERE type_id = %s", (solution_type,))
+        if cur.fetchone() is None:
+            raise Exception("{0} is not a valid solution_type! Either add the event type to the database or use another solution_type".format(solution_type))
+
+        cur.execute("SELECT id FROM nordic_file WHERE file_location = %s", (nordic_filename,))
+        filenameids = cur.fetchone()
+        if filenameids is not None:
+            filename_id = filenameids[0]
+        else:
+            cur.execute("INSERT INTO nordic_file (file_location) VALUES (%s) RETURNING id", (nordic_filename,))
+            filename_id = cur.fetchone()[0]
+
+        cur.execute("SELECT row_security_active('nordic_event')")
+        use_copy = not cur.fetchone()[0]
+
+        new_roots = [e for e in nordic_events if e.root_id == -1]
+        root_ids = allocateIds(cur, "nordic_event_root", len(new_roots))
+        copyRows(cur, "nordic_event_root", "(id)", [[r_id] for r_id in root_ids], use_copy)
+        for nordic_event, root_id in zip(new_roots, root_ids):
+            nordic_event.root_id = root_id
+
+        event_ids = allocateIds(cur, "nordic_event", len(nordic_events))
+        rows = {0:[], 1:[], 2:[], 3:[], 5:[], 6:[], 7:[]}
+
+        for nordic_event, event_id in zip(nordic_events, event_ids):
+            nordic_event.event_id = event_id
+            rows[0].append([event_id,
+                            solution_type,
+                            nordic_event.root_id,
+                            filename_id,
+                            getAuthorId(nordic_event),
+                            creation_id])
+
+        headers = {
+                    1: [h for e in nordic_events for h in e.main_h],
+                    2: [h for e in nordic_events for h in e.macro_h],
+                    3: [h for e in nordic_events for h in e.comment_h],
+                    6: [h for e in nordic_events for h in e.waveform_h],
+                    }
+
+        for nordic_event in nordic_events:
+            for header in (nordic_event.main_h + nordic_event.macro_h +
+                           nordic_event.comment_h + nordic_event.waveform_h):
+                header.event_id = nordic_event.event_id
+            for phase_data in nordic_event.data:
+                phase_data.event_id = nordic_event.event_id
+
+        for h_type in headers.keys():
+            h_ids = allocateIds(cur, BULK_TABLES[h_type][0], len(headers[h_type]))
+            for header, h_id in zip(headers[h_type], h_ids):
+                header.h_id = h_id
+                if h_type == 1:
+                    rows[h_type].append([h_id] + mainHeader2List(header))
+                else:
+                    rows[h_type].append([h_id] + header.getAsList())
+
+        errors = [h.error_h for h in headers[1] if h.error_h is not None]
+        error_ids = allocateIds(cur, BULK_TABLES[5][0], len(errors))
+        for main in headers[1]:
+            if main.error_h is not None:
+                main.error_h.header_id = main.h_id
+        for error, h_id in zip(errors, error_ids):
+            error.h_id = h_id
+            rows[5].append([h_id] + error.getAsList())
+
+        phase_data = [d for e in nordic_events for d in e.data]
+        d_ids = allocateIds(cur, BULK_TABLES[7][0], len(phase_data))
+        for data, d_id in zip(phase_data, d_ids):
+            data.d_id = d_id
+            rows[7].append([d_id] + data.getAsList())
+
+        for table_key in [0, 1, 5, 2, 3, 6, 7]:
+            copyRows(cur,
+                     BULK_TABLES[table_key][0],
+                     BULK_TABLES[table_key][1],
+                     rows[table_key],
+                     use_copy)
+
+        eventSummary.refreshEventSummary(event_ids, conn)
+
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        for nordic_event in new_roots:
+            nordic_event.root_id = -1
+        raise e
+    finally:
+        if f_creation_id is None:
+            creationInfo.deleteCreationInfoIfUnnecessary(creation_id, db_conn=conn)
+        if db_conn is None:
+            conn.close()
+
+def mainHeader2List(main):
+    """
+    Function for creating the list of values inserted into nordic_header_main from a NordicMain object. The values are the ones from getAsList with origin_datetime added to the end. If the origin time is not known, origin_datetime is the start of the origin date and if the origin date is not known, origin_datetime is None.
+
+    :param NordicMain main: main header to be converted
+    :returns: list of values
+    """
+    if main.origin_date is None:
+        origin_datetime = None
+    elif main.origin_time is None:
+        origin_datetime = datetime.datetime.combine(main.origin_date, datetime.time())
+    else:
+        origin_datetime = datetime.datetime.combine(main.origin_date, main.origin_time)
+
+    return main.getAsList() + [origin_datetime]
+
+def allocateIds(cur, table_name, count):
+    """
+    Function for reserving ids for new rows of a table from its id sequence with a single query.
+
+    :param Psycopg.Cursor cur: cursor object from psycopg2 library
+    :param str table_name: name of the table
+    :param int count: number of ids needed
+    :returns: list of the reserved ids
+    """
+    if count == 0:
+        return []
+    cur.execute(ALLOCATE_IDS, (table_name + "_id_seq", count))
+    return [a[0] for a in cur.fetchall()]
+
+def copyValue(value):
+    """
+    Function for converting a python value into the postgres COPY text format.
+
+    :param value: value to be converted
+    :returns: value as a string
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (str(value)
+                .replace("\\", "\\\\")
+                .replace("\t", "\\t")
+                .replace("\n", "\\n")
+                .replace("\r", "\\r"))
+
+def copyRows(cur, table_name, columns, rows, use_copy = True):
+    """
+    Function for streaming rows into a table. The rows are written with COPY FROM STDIN when possible and with a multi-row INSERT otherwise.
+
+    :param Psycopg.Cursor cur: cursor object from psycopg2 library
+    :param str table_name: name of the table
+    :param str columns: column list of the table in parentheses
+    :param list rows: list of rows where each row is a list of values in the order of the columns
+    :param bool use_copy: flag for if COPY can be used
+    """
+    if not rows:
+        return
+
+    if use_copy:
+        buf = io.StringIO()
+        buf.writelines("\t".join([copyValue(v) for v in row]) + "\n" for row in rows)
+        buf.seek(0)
+        cur.copy_expert("COPY {0} {1} FROM STDIN".format(table_name, columns), buf)
+    else:
+        psycopg2.extras.execute_values(cur,
+                                       "INSERT INTO {0} {1} VALUES %s".format(table_name, columns),
+                                       rows,
+                                       page_size = 1000)
+
 def executeCommand(cur, command, vals, returnValue):
     """
     Function for for executing a command with values and handling exceptions
@@ -7,6 +7,7 @@ Functions and Classes
 
 import psycopg2
 from nordb.core import usernameUtilities
+from nordb.database import eventSummary
 
 def changeSolutionType(event_id, solution_type):
     """
@@ -40,6 +41,8 @@ def changeSolutionType(event_id, solution_type):
     
     cur.execute("UPDATE nordic_event SET solution_type = %s WHERE id = %s", (solution_type, event_id))
 
+    eventSummary.refreshRootSummary(event[2], conn)
+
     conn.commit()
     conn.close()
 
@@ -85,6 +88,8 @@ def changeEventRoot(event_id, root_id):
         cur.execute("SELECT id FROM nordic_event WHERE root_id = %s", (old_root_id,))
         if cur.fetchone() is None:
             cur.execute("DELETE FROM nordic_event_root WHERE id = %s", (old_root_id,))
+
+        eventSummary.refreshRootSummary(root_id, conn)
     except Exception as e:
         conn.close()
         raise e
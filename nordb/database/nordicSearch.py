@@ -4,19 +4,27 @@ This module contains all commands for searching the database for events with giv
 Functions and Classes
 ---------------------
 """
-import numpy as np
+import bisect
+import itertools
+import psycopg2.extras
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
 from datetime import time
 from nordb.core import usernameUtilities
 from nordb.database import sql2nordic
+from nordb.database import spatialSearch
+from nordb.nordic.nordicEvent import NordicEvent
+from nordb.nordic.nordicMain import NordicMain
+from nordb.nordic.misc import CreationInfo
 
 SEARCH_TYPES = {
                     "origin_date":[date],
                     "origin_time":[time],
+                    "origin_datetime":[datetime],
                     "epicenter_latitude":[float],
                     "epicenter_longitude":[float],
+                    "epicenter":[float],
                     "magnitude_1":[float],
                     "solution_type":[str],
                     "distance_indicator":[str],
@@ -28,8 +36,10 @@ SEARCH_TYPES = {
 SEARCH_TYPE_HEADERS =   {
                             "origin_time":"nordic_header_main",
                             "origin_date":"nordic_header_main",
+                            "origin_datetime":"nordic_header_main",
                             "epicenter_latitude":"nordic_header_main",
                             "epicenter_longitude":"nordic_header_main",
+                            "epicenter":"nordic_header_main",
                             "magnitude_1":"nordic_header_main",
                             "solution_type":"nordic_event",
                             "distance_indicator":"nordic_header_main",
@@ -38,6 +48,78 @@ SEARCH_TYPE_HEADERS =   {
                             "depth":"nordic_header_main"
                         }
 
+SEARCH_PAGE_SIZE = 1000
+
+SEARCH_ORDERS = {
+                    "origin_datetime":(["COALESCE(preferred.origin_datetime, 'infinity'::TIMESTAMP)", "preferred.event_id"],
+                                       ["COALESCE(%s::TIMESTAMP, 'infinity'::TIMESTAMP)", "%s"],
+                                       3),
+                    "id":(["preferred.event_id"], ["%s"], 0)
+                }
+
+SUMMARY_SEARCH_TYPES = ["solution_type", "event_id"]
+
+SELECT_EVENT_PAGE = (
+                    "SELECT "
+                    "   preferred.event_id, preferred.origin_date, preferred.origin_time, preferred.origin_datetime, "
+                    "   preferred.root_id, preferred.creation_id, preferred.solution_type, "
+                    "   preferred.owner, preferred.creation_date, preferred.privacy_setting, "
+                    "   preferred.origin_time, preferred.origin_date, preferred.location_model, "
+                    "   preferred.distance_indicator, preferred.event_desc_id, preferred.epicenter_latitude, "
+                    "   preferred.epicenter_longitude, preferred.depth, preferred.depth_control, "
+                    "   preferred.locating_indicator, preferred.epicenter_reporting_agency, "
+                    "   preferred.stations_used, preferred.rms_time_residuals, "
+                    "   preferred.magnitude_1, preferred.type_of_magnitude_1, preferred.magnitude_reporting_agency_1, "
+                    "   preferred.magnitude_2, preferred.type_of_magnitude_2, preferred.magnitude_reporting_agency_2, "
+                    "   preferred.magnitude_3, preferred.type_of_magnitude_3, preferred.magnitude_reporting_agency_3, "
+                    "   preferred.event_id, preferred.main_id "
+                    "FROM "
+                    "   event_summary AS preferred "
+                    "WHERE "
+                    "   preferred.main_id IS NOT NULL "
+                    "   {criteria} "
+                    "   {keyset} "
+                    "ORDER BY "
+                    "   {order} "
+                    "LIMIT %s "
+                    "OFFSET %s"
+                    )
+
+SELECT_EVENT_COUNT =    (
+                        "SELECT "
+                        "   COUNT(*) "
+                        "FROM "
+                        "   event_summary AS preferred "
+                        "WHERE "
+                        "   preferred.main_id IS NOT NULL "
+                        "   {criteria}"
+                        )
+
+SUMMARY_HEADER_CRITERIA =   (
+                            "AND EXISTS "
+                            "   (SELECT "
+                            "       1 "
+                            "   FROM "
+                            "       nordic_event, nordic_header_main "
+                            "   WHERE "
+                            "       nordic_event.id = preferred.event_id "
+                            "       AND nordic_header_main.event_id = preferred.event_id "
+                            "       {criteria}) "
+                            )
+
+CREATE_SEARCH_RESULT =  (
+                        "CREATE TEMP TABLE {table} ON COMMIT DROP AS "
+                        "SELECT "
+                        "   DISTINCT nordic_event.id AS id "
+                        "FROM "
+                        "   nordic_event, nordic_header_main "
+                        "WHERE "
+                        "   nordic_event.id = nordic_header_main.event_id "
+                        "   {criteria}"
+                        )
+
+SEARCH_RESULT_COUNTER = itertools.count()
+
 class NordicSearch:
     """
     Class for searching events from database with multiple criteria.
@@ -57,6 +139,12 @@ class NordicSearch:
                criteria_string += " {0}: {1}-{2}\n".format(crit.search_type, crit.getValue()[0], crit.getValue()[1])
             elif crit.command_type == 3:
                criteria_string += " {0}: {1}-> \n".format(crit.search_type, crit.getValue()[0])
+            elif crit.command_type == 5:
+               criteria_string += " {0}: {1} km from ({2}, {3})\n".format(crit.search_type, crit.radius, crit.latitude, crit.longitude)
+            elif crit.command_type == 6:
+               criteria_string += " {0}: inside {1}\n".format(crit.search_type, crit.points)
+            elif crit.command_type == 7:
+               criteria_string += " {0}: known\n".format(crit.search_type)
             else:
                criteria_string += " {0}: <-{1} \n".format(crit.search_type, crit.getValue()[0])
 
@@ -111,6 +199,32 @@ class NordicSearch:
         """
         self.criteria.append(UnderValue(search_type, search_val))
 
+    def addSearchKnown(self, search_type):
+        """
+        Add SearchKnown criteria to the NordicSearch object. The value of the search type has to be known.
+
+        :param str search_type:
+        """
+        self.criteria.append(KnownValue(search_type))
+
+    def addSearchRadius(self, latitude, longitude, radius):
+        """
+        Add SearchRadius criteria to the NordicSearch object. The epicenter of the event has to be less than radius away from the given point.
+
+        :param float latitude: latitude of the point
+        :param float longitude: longitude of the point
+        :param float radius: maximum great-circle distance from the point in kilometers
+        """
+        self.criteria.append(RadiusValue(latitude, longitude, radius))
+
+    def addSearchPolygon(self, points):
+        """
+        Add SearchPolygon criteria to the NordicSearch object. The epicenter of the event has to be inside the polygon.
+
+        :param list points: list of (latitude, longitude) tuples of the polygon corners
+        """
+        self.criteria.append(PolygonValue(points))
+
     def getSearchQueryAndValues(self):
         query_str = ""
         query_vals = []
@@ -120,6 +234,30 @@ class NordicSearch:
 
         return query_str, query_vals
 
+    def getSummaryQueryAndValues(self):
+        """
+        Get the criteria of the NordicSearch as a query for the event_summary table. The criteria that are the same for all headers of an event are compared directly to the columns of event_summary and the rest are checked from the main headers of the event, so an event fits the criteria if any of its main headers does.
+
+        :returns: the query and the values for it
+        """
+        query_str = ""
+        query_vals = []
+        header_str = ""
+        header_vals = []
+        for query in self.criteria:
+            if query.search_type in SUMMARY_SEARCH_TYPES:
+                query_str += "AND " + query.getQuery("preferred")
+                query_vals.extend(query.getValue())
+            else:
+                header_str += "AND " + query.getQuery()
+                header_vals.extend(query.getValue())
+
+        if header_str:
+            query_str += SUMMARY_HEADER_CRITERIA.format(criteria = header_str)
+            query_vals.extend(header_vals)
+
+        return query_str, query_vals
+
     def searchEventIdAndDate(self, db_conn = None):
         """
         Search for all event ids and their dates that fit to the criteria given to the NordicSearch and return them
@@ -162,12 +300,184 @@ class NordicSearch:
 
         return ans
 
-    def searchEvents(self, db_conn = None):
+    def iterEventIdAndDate(self, order_by = "origin_datetime", limit = None, offset = 0, page_size = SEARCH_PAGE_SIZE, db_conn = None):
+        """
+        Generator for going through the ids and the dates of all events that fit to the criteria given to the NordicSearch. The date of an event is the date of its first main header. The events are fetched from the event_summary table a page at a time with keyset pagination, so the first events are returned before the whole result has been searched and the memory needed doesn't depend on the amount of events.
+
+        :param str order_by: order of the events. Either "origin_datetime" for ordering by the origin time of the first main header and the event id with the events without an origin date last or "id" for ordering only by the event id
+        :param int limit: maximum amount of events returned. None for all events
+        :param int offset: amount of events skipped from the beginning
+        :param int page_size: amount of events fetched from the database at once
+        :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+        :returns: generator of (event_id, origin_date, origin_time) tuples
+        """
+        for row in self.iterSummaryRows(order_by, limit, offset, page_size, db_conn):
+            yield row[:3]
+
+    def iterEventSummaries(self, order_by = "origin_datetime", limit = None, offset = 0, page_size = SEARCH_PAGE_SIZE, db_conn = None):
+        """
+        Generator for going through the summaries of all events that fit to the criteria given to the NordicSearch like in :func:`iterEventIdAndDate`. The summaries are NordicEvent objects that only have the first main header of the event and a creation info without the comment. Use this for listing events, as only the event_summary table is read.
+
+        :param str order_by: order of the events. See :func:`iterEventIdAndDate`
+        :param int limit: maximum amount of events returned. None for all events
+        :param int offset: amount of events skipped from the beginning
+        :param int page_size: amount of events fetched from the database at once
+        :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+        :returns: generator of NordicEvent objects
+        """
+        for row in self.iterSummaryRows(order_by, limit, offset, page_size, db_conn):
+            e = NordicEvent(row[0], row[4], row[5], row[6], CreationInfo(row[7], row[5], row[8], row[9]))
+            e.main_h.append(NordicMain.fromDatabase(row[10:]))
+            yield e
+
+    def iterSummaryRows(self, order_by, limit, offset, page_size, db_conn):
+        """
+        Generator for going through the rows of :data:`SELECT_EVENT_PAGE` of all events that fit to the criteria given to the NordicSearch. See :func:`iterEventIdAndDate` for the parameters.
+        """
+        if order_by not in SEARCH_ORDERS:
+            raise Exception("Not a valid order! ({0})".format(order_by))
+
+        order_columns, key_values, key_index = SEARCH_ORDERS[order_by]
+        query_str, query_vals = self.getSummaryQueryAndValues()
+
+        first_query = SELECT_EVENT_PAGE.format(criteria = query_str,
+                                               keyset = "",
+                                               order = ", ".join(order_columns))
+        next_query = SELECT_EVENT_PAGE.format(criteria = query_str,
+                                              keyset = "AND ({0}) > ({1})".format(", ".join(order_columns),
+                                                                                 ", ".join(key_values)),
+                                              order = ", ".join(order_columns))
+
+        if db_conn is None:
+            conn = usernameUtilities.log2nordb()
+        else:
+            conn = db_conn
+
+        try:
+            cur = conn.cursor()
+            last_row = None
+            returned = 0
+
+            while limit is None or returned < limit:
+                if limit is None:
+                    amount = page_size
+                else:
+                    amount = min(page_size, limit - returned)
+
+                if last_row is None:
+                    cur.execute(first_query, query_vals + [amount, offset])
+                elif key_index == 0:
+                    cur.execute(next_query, query_vals + [last_row[0], amount, 0])
+                else:
+                    cur.execute(next_query, query_vals + [last_row[key_index], last_row[0], amount, 0])
+
+                ans = cur.fetchall()
+                for row in ans:
+                    yield row
+
+                returned += len(ans)
+                if len(ans) < amount:
+                    break
+                last_row = ans[-1]
+        finally:
+            if db_conn is None:
+                conn.close()
+
+    def iterEvents(self, order_by = "origin_datetime", limit = None, offset = 0, page_size = SEARCH_PAGE_SIZE, db_conn = None):
+        """
+        Generator for going through all events that fit to the criteria given to the NordicSearch in the order given by order_by. The events are read from the database a page at a time like in :func:`iterEventIdAndDate`.
+
+        :param str order_by: order of the events. See :func:`iterEventIdAndDate`
+        :param int limit: maximum amount of events returned. None for all events
+        :param int offset: amount of events skipped from the beginning
+        :param int page_size: amount of events read from the database at once
+        :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+        :returns: generator of NordicEvent objects
+        """
+        if db_conn is None:
+            conn = usernameUtilities.log2nordb()
+        else:
+            conn = db_conn
+
+        try:
+            page = []
+            for row in self.iterEventIdAndDate(order_by, limit, offset, page_size, db_conn = conn):
+                page.append(row[0])
+                if len(page) == page_size:
+                    for e in orderedNordic(page, conn):
+                        yield e
+                    page = []
+
+            for e in orderedNordic(page, conn):
+                yield e
+        finally:
+            if db_conn is None:
+                conn.close()
+
+    def countEvents(self, db_conn = None):
+        """
+        Count the events that fit to the criteria given to the NordicSearch from the event_summary table without fetching them.
+
+        :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+        :returns: amount of events
+        """
+        if db_conn is None:
+            conn = usernameUtilities.log2nordb()
+        else:
+            conn = db_conn
+
+        query_str, query_vals = self.getSummaryQueryAndValues()
+        query = SELECT_EVENT_COUNT.format(criteria = query_str)
+
+        cur = conn.cursor()
+        cur.execute(query, query_vals)
+        ans = cur.fetchone()[0]
+
+        if db_conn is None:
+            conn.close()
+
+        return ans
+
+    def iterEventsOnServer(self, batch_size = sql2nordic.ITER_BATCH_SIZE, db_conn = None):
+        """
+        Generator for going through all the events that fit to the criteria given to the NordicSearch. The ids of the events are collected into a temporary table in the database and the events are read by joining the header tables to it with :func:`sql2nordic.iterNordicFromTable`, so the ids never travel between the database and python. The events are returned in the order of their event ids.
+
+        :param int batch_size: amount of rows fetched from the database at once from each table
+        :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+        :returns: generator of NordicEvent objects
+        """
+        if db_conn is None:
+            conn = usernameUtilities.log2nordb()
+        else:
+            conn = db_conn
+
+        table = "search_result_{0}".format(next(SEARCH_RESULT_COUNTER))
+        query_str, query_vals = self.getSearchQueryAndValues()
+
+        cur = conn.cursor()
+        try:
+            cur.execute(CREATE_SEARCH_RESULT.format(table = table, criteria = query_str), query_vals)
+            cur.execute("ANALYZE {0}".format(table))
+
+            for e in sql2nordic.iterNordicFromTable(table, batch_size, db_conn = conn):
+                yield e
+        finally:
+            if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+                cur.execute("DROP TABLE IF EXISTS {0}".format(table))
+            if db_conn is None:
+                conn.close()
+
+    def searchEvents(self, db_conn = None, server_side = False):
         """
         Search for all the events that fit to the criteria given to the NordicSearch and return them.
 
+        :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+        :param bool server_side: flag for keeping the ids of the events in the database with :func:`iterEventsOnServer` instead of fetching them first. Use this when there are lots of events
         :returns: array of NordicEvent objects
         """
+        if server_side:
+            return list(self.iterEventsOnServer(db_conn = db_conn))
+
         if db_conn is None:
             conn = usernameUtilities.log2nordb()
         else:
@@ -226,6 +536,19 @@ class NordicSearch:
 
         return ans
 
+def orderedNordic(event_ids, db_conn):
+    """
+    Helper function for reading the events with ids in event_ids from the database in the same order as the ids.
+    """
+    if not event_ids:
+        return []
+
+    events = {}
+    for e in sql2nordic.iterNordic(event_ids, db_conn = db_conn):
+        events[e.event_id] = e
+
+    return [events[e_id] for e_id in event_ids if e_id in events]
+
 class Command:
     """
     Class for command that is returned by string2Command.
@@ -236,24 +559,28 @@ class Command:
         if search_type not in SEARCH_TYPES.keys():
             raise Exception("Not a valid search type! ({0})".format(search_type))
 
-        if command_type != 1:
+        if command_type not in (1, 7):
             if search_type in ["solution_type", "distance_indicator", "event_desc_id"]:
                 raise Exception("Cannot search between string values! ({0})".format(search_type))
 
         self.command_type = command_type
         self.search_type = search_type
 
-    def getQuery(self):
+    def getQuery(self, table = None):
         """
         Functiong for creating the query for the command
+
+        :param str table: name of the table the column is compared from. Defaults to the table in SEARCH_TYPE_HEADERS
         """
         return None
 
     def getValue(self):
         return None
 
-    def createQuery(self, value):
-        search_criteria = "{0}.{1}".format(SEARCH_TYPE_HEADERS[self.search_type], self.search_type)
+    def createQuery(self, value, table = None):
+        if table is None:
+            table = SEARCH_TYPE_HEADERS[self.search_type]
+        search_criteria = "{0}.{1}".format(table, self.search_type)
 
         if self.command_type == 1:
             return "    {0} = %s ".format(search_criteria)
@@ -263,6 +590,8 @@ class Command:
             return "    {0} >= %s ".format(search_criteria)
         elif self.command_type == 4:
             return "    {0} <= %s ".format(search_criteria)
+        elif self.command_type == 7:
+            return "    {0} IS NOT NULL ".format(search_criteria)
 
 class ExactlyValue(Command):
     """
@@ -277,8 +606,8 @@ class ExactlyValue(Command):
             raise Exception("Given search value is not a correct type! (Given: {0}, Required: {1})".format(type(value), SEARCH_TYPES[search_type]))
         self.value = value
 
-    def getQuery(self):
-        return self.createQuery(self.value)
+    def getQuery(self, table = None):
+        return self.createQuery(self.value, table)
 
     def getValue(self):
         return (self.value,)
@@ -302,8 +631,8 @@ class BetweenValues(Command):
         self.value_lower = value_lower
         self.value_upper = value_upper
 
-    def getQuery(self):
-        return self.createQuery(self.value_lower)
+    def getQuery(self, table = None):
+        return self.createQuery(self.value_lower, table)
 
     def getValue(self):
         return self.value_lower, self.value_upper
@@ -323,8 +652,8 @@ class OverValue(Command):
 
         self.value = value
 
-    def getQuery(self):
-        return self.createQuery(self.value)
+    def getQuery(self, table = None):
+        return self.createQuery(self.value, table)
 
     def getValue(self):
         return (self.value,)
@@ -344,12 +673,86 @@ class UnderValue(Command):
 
         self.value = value
 
-    def getQuery(self):
-        return self.createQuery(self.value)
+    def getQuery(self, table = None):
+        return self.createQuery(self.value, table)
 
     def getValue(self):
         return (self.value,)
 
+class KnownValue(Command):
+    """
+    Command for determining if the value is known
+
+    :ivar int command_tpe: Type of command. In this case 7.
+    """
+    def __init__(self, search_type):
+        Command.__init__(self, 7, search_type)
+
+    def getQuery(self, table = None):
+        return self.createQuery(None, table)
+
+    def getValue(self):
+        return ()
+
+class RadiusValue(Command):
+    """
+    Command for determining if the epicenter is less than radius away from a point.
+
+    :ivar int command_tpe: Type of command. In this case 5.
+    :ivar float latitude: latitude of the point
+    :ivar float longitude: longitude of the point
+    :ivar float radius: maximum distance from the point in kilometers
+    """
+    def __init__(self, latitude, longitude, radius):
+        Command.__init__(self, 5, "epicenter")
+        for value in (latitude, longitude, radius):
+            if type(value) not in SEARCH_TYPES["epicenter"]:
+                raise Exception("Given search value is not a correct type! (Given: {0}, Required: {1})".format(type(value), SEARCH_TYPES["epicenter"]))
+
+        self.latitude = latitude
+        self.longitude = longitude
+        self.radius = radius
+
+    def getQuery(self):
+        return "    {0} ".format(spatialSearch.radiusQuery( "nordic_header_main.epicenter_latitude",
+                                                            "nordic_header_main.epicenter_longitude",
+                                                            self.latitude,
+                                                            self.longitude,
+                                                            self.radius)[0])
+
+    def getValue(self):
+        return spatialSearch.radiusQuery(   "nordic_header_main.epicenter_latitude",
+                                            "nordic_header_main.epicenter_longitude",
+                                            self.latitude,
+                                            self.longitude,
+                                            self.radius)[1]
+
+class PolygonValue(Command):
+    """
+    Command for determining if the epicenter is inside a polygon.
+
+    :ivar int command_tpe: Type of command. In this case 6.
+    :ivar list points: list of (latitude, longitude) tuples of the polygon corners
+    """
+    def __init__(self, points):
+        Command.__init__(self, 6, "epicenter")
+        for point in points:
+            for value in point:
+                if type(value) not in SEARCH_TYPES["epicenter"]:
+                    raise Exception("Given search value is not a correct type! (Given: {0}, Required: {1})".format(type(value), SEARCH_TYPES["epicenter"]))
+
+        self.points = points
+
+    def getQuery(self):
+        return "    {0} ".format(spatialSearch.polygonQuery("nordic_header_main.epicenter_latitude",
+                                                            "nordic_header_main.epicenter_longitude",
+                                                            self.points)[0])
+
+    def getValue(self):
+        return spatialSearch.polygonQuery(  "nordic_header_main.epicenter_latitude",
+                                            "nordic_header_main.epicenter_longitude",
+                                            self.points)[1]
+
 def searchSameEvents(nordic_event):
     """
     Function for searching and returning all events that are the same compared to the event given by the user.
@@ -398,12 +801,10 @@ def searchSimilarEvents(nordic_event, time_diff = 20.0, latitude_diff = 0.2, lon
 
     origin_datetime = datetime.combine(m_header.origin_date, m_header.origin_time)
 
-    search.addSearchBetween("origin_date",
-                            (origin_datetime - timedelta(seconds = time_diff)).date(),
-                            (origin_datetime + timedelta(seconds = time_diff)).date())
-    search.addSearchBetween("origin_time",
-                            (origin_datetime - timedelta(seconds = time_diff)).time(),
-                            (origin_datetime + timedelta(seconds = time_diff)).time())
+    search.addSearchBetween("origin_datetime",
+                            origin_datetime - timedelta(seconds = time_diff),
+                            origin_datetime + timedelta(seconds = time_diff))
+    search.addSearchKnown("origin_time")
     if m_header.epicenter_latitude is not None:
         search.addSearchBetween("epicenter_latitude", m_header.epicenter_latitude - latitude_diff, m_header.epicenter_latitude + latitude_diff)
     if m_header.epicenter_longitude is not None:
@@ -413,6 +814,179 @@ def searchSimilarEvents(nordic_event, time_diff = 20.0, latitude_diff = 0.2, lon
 
     return search.searchEvents()
 
+CREATE_DUPLICATE_CANDIDATES =   (
+                                "CREATE TEMP TABLE duplicate_candidates ( "
+                                "   idx INTEGER, "
+                                "   origin_date DATE, "
+                                "   origin_time TIME, "
+                                "   epicenter_latitude FLOAT, "
+                                "   epicenter_longitude FLOAT, "
+                                "   magnitude_1 FLOAT, "
+                                "   date_low DATE, "
+                                "   date_high DATE, "
+                                "   datetime_low TIMESTAMP, "
+                                "   datetime_high TIMESTAMP "
+                                ") ON COMMIT DROP"
+                                )
+
+INSERT_DUPLICATE_CANDIDATES =   (
+                                "INSERT INTO "
+                                "   duplicate_candidates "
+                                "VALUES %s"
+                                )
+
+SELECT_DUPLICATE_CANDIDATES =   (
+                                "SELECT "
+                                "   idx, event_id, root_id, bool_or(is_same), bool_or(is_similar) "
+                                "FROM "
+                                "   (SELECT "
+                                "       c.idx AS idx, nordic_event.id AS event_id, nordic_event.root_id AS root_id, "
+                                "       (h.origin_date = c.origin_date "
+                                "       AND (c.origin_time IS NULL OR h.origin_time = c.origin_time) "
+                                "       AND (c.epicenter_latitude IS NULL OR h.epicenter_latitude = c.epicenter_latitude) "
+                                "       AND (c.epicenter_longitude IS NULL OR h.epicenter_longitude = c.epicenter_longitude) "
+                                "       AND (c.magnitude_1 IS NULL OR h.magnitude_1 = c.magnitude_1)) AS is_same, "
+                                "       (c.datetime_low IS NOT NULL "
+                                "       AND h.origin_time IS NOT NULL "
+                                "       AND h.origin_datetime BETWEEN c.datetime_low AND c.datetime_high "
+                                "       AND (c.epicenter_latitude IS NULL OR h.epicenter_latitude BETWEEN c.epicenter_latitude - %(latitude_diff)s AND c.epicenter_latitude + %(latitude_diff)s) "
+                                "       AND (c.epicenter_longitude IS NULL OR h.epicenter_longitude BETWEEN c.epicenter_longitude - %(longitude_diff)s AND c.epicenter_longitude + %(longitude_diff)s) "
+                                "       AND (c.magnitude_1 IS NULL OR h.magnitude_1 BETWEEN c.magnitude_1 - %(magnitude_diff)s AND c.magnitude_1 + %(magnitude_diff)s)) AS is_similar "
+                                "   FROM "
+                                "       duplicate_candidates AS c "
+                                "   INNER JOIN nordic_header_main AS h ON "
+                                "       h.origin_date BETWEEN c.date_low AND c.date_high "
+                                "   INNER JOIN nordic_event ON "
+                                "       nordic_event.id = h.event_id "
+                                "   ) AS matches "
+                                "WHERE "
+                                "   is_same OR is_similar "
+                                "GROUP BY "
+                                "   idx, event_id, root_id "
+                                "ORDER BY "
+                                "   idx, root_id, event_id"
+                                )
+
+class DuplicateCandidates:
+    """
+    Class for the same and similar events of an event found by :func:`searchDuplicateCandidates`. Same events are identical to the event as in :func:`searchSameEvents` and similar events fit to the criteria of :func:`searchSimilarEvents`. Events of the database are given as (event_id, root_id) tuples ordered by root_id and events that were earlier in the same list of events as indices of that list.
+
+    :ivar list same: same events in the database
+    :ivar list similar: similar events in the database
+    :ivar list same_in_batch: indices of the same events earlier in the list
+    :ivar list similar_in_batch: indices of the similar events earlier in the list
+    """
+    def __init__(self):
+        self.same = []
+        self.similar = []
+        self.same_in_batch = []
+        self.similar_in_batch = []
+
+def searchDuplicateCandidates(nordic_events, time_diff = 20.0, latitude_diff = 0.2, longitude_diff = 0.2, magnitude_diff = 0.5, db_conn = None):
+    """
+    Function for searching same and similar events for a whole list of events at once. The first main headers of the events are loaded into a temporary table which is joined against the main headers in the database with a single query. Events earlier in the list are compared to the later ones in memory with an index sorted by origin time, so duplicates inside a file are found even though the earlier events are not yet in the database. The events themselves are not fetched from the database, only their ids.
+
+    :param list nordic_events: list of NordicEvent objects
+    :param float time_diff: maximum time difference in seconds
+    :param float latitude_diff: maximum latitude difference in degrees
+    :param float longitude_diff: maximum longitude difference in degrees
+    :param float magnitude_diff: maximum magnitude difference
+    :returns: list of DuplicateCandidates objects in the same order as nordic_events
+    """
+    candidates = [DuplicateCandidates() for e in nordic_events]
+    if not nordic_events:
+        return candidates
+
+    rows = []
+    for idx, nordic_event in enumerate(nordic_events):
+        m_header = nordic_event.main_h[0]
+        if m_header.origin_time is not None:
+            origin_datetime = datetime.combine(m_header.origin_date, m_header.origin_time)
+            datetime_low = origin_datetime - timedelta(seconds = time_diff)
+            datetime_high = origin_datetime + timedelta(seconds = time_diff)
+            date_low = min(m_header.origin_date, datetime_low.date())
+            date_high = max(m_header.origin_date, datetime_high.date())
+        else:
+            datetime_low = datetime_high = None
+            date_low = date_high = m_header.origin_date
+
+        rows.append((idx,
+                     m_header.origin_date,
+                     m_header.origin_time,
+                     m_header.epicenter_latitude,
+                     m_header.epicenter_longitude,
+                     m_header.magnitude_1,
+                     date_low,
+                     date_high,
+                     datetime_low,
+                     datetime_high))
+
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    cur = conn.cursor()
+    cur.execute(CREATE_DUPLICATE_CANDIDATES)
+    psycopg2.extras.execute_values(cur, INSERT_DUPLICATE_CANDIDATES, rows, page_size = 1000)
+    cur.execute(SELECT_DUPLICATE_CANDIDATES, {"latitude_diff":latitude_diff,
+                                              "longitude_diff":longitude_diff,
+                                              "magnitude_diff":magnitude_diff})
+    ans = cur.fetchall()
+    cur.execute("DROP TABLE duplicate_candidates")
+
+    if db_conn is None:
+        conn.close()
+
+    for idx, event_id, root_id, same, similar in ans:
+        if same:
+            candidates[idx].same.append((event_id, root_id))
+        if similar:
+            candidates[idx].similar.append((event_id, root_id))
+
+    time_index = []
+    for row in rows:
+        idx = row[0]
+        if row[8] is not None:
+            low = bisect.bisect_left(time_index, (row[8], -1))
+            high = bisect.bisect_right(time_index, (row[9], len(rows)))
+            for origin_datetime, other in time_index[low:high]:
+                if isSameRow(row, rows[other]):
+                    candidates[idx].same_in_batch.append(other)
+                if isSimilarRow(row, rows[other], latitude_diff, longitude_diff, magnitude_diff):
+                    candidates[idx].similar_in_batch.append(other)
+            bisect.insort(time_index, (datetime.combine(row[1], row[2]), idx))
+        else:
+            for other in range(idx):
+                if isSameRow(row, rows[other]):
+                    candidates[idx].same_in_batch.append(other)
+
+    for c in candidates:
+        c.same_in_batch.sort()
+        c.similar_in_batch.sort()
+
+    return candidates
+
+def isSameRow(row, other):
+    """
+    Helper function for comparing two rows of :func:`searchDuplicateCandidates` like :func:`searchSameEvents` does.
+    """
+    if row[1] != other[1]:
+        return False
+    for i in range(2, 6):
+        if row[i] is not None and row[i] != other[i]:
+            return False
+    return True
+
+def isSimilarRow(row, other, latitude_diff, longitude_diff, magnitude_diff):
+    """
+    Helper function for comparing two rows of :func:`searchDuplicateCandidates` like :func:`searchSimilarEvents` does. The times of the rows have already been compared.
+    """
+    for i, diff in ((3, latitude_diff), (4, longitude_diff), (5, magnitude_diff)):
+        if row[i] is not None and (other[i] is None or abs(row[i] - other[i]) > diff):
+            return False
+    return True
+
 def searchEvents(latitude = None, longitude = None, distance = 100.0,
                  magnitude = -9.0, magnitude_diff = 2.0,
                  date=None, date_diff=-9.0):
@@ -421,7 +995,7 @@ def searchEvents(latitude = None, longitude = None, distance = 100.0,
 
     :param float latitude: latitude coordinate of the point
     :param float longitude: longitude coordinate of the point
-    :param float distance: distance from the point in kilometers
+    :param float distance: maximum great-circle distance from the point in kilometers
     :param float magnitude: magnitude of the event
     :param float magnitude_diff: maximum allowed magnitude difference of the event. Set negative value for searching exactly for a magnitude
     :param date date: date of the event
@@ -429,12 +1003,8 @@ def searchEvents(latitude = None, longitude = None, distance = 100.0,
     """
     search = NordicSearch()
 
-    if latitude is not None:
-        lat_diff = (0.5*distance) / 110.574
-        search.addSearchBetween("epicenter_latitude", latitude-lat_diff, latitude+lat_diff)
-    if longitude is not None:
-        lon_diff = (0.5*distance) / (float(np.cos(np.deg2rad(latitude))) * 111.32)
-        search.addSearchBetween("epicenter_longitude", longitude-lon_diff, longitude+lon_diff)
+    if latitude is not None and longitude is not None:
+        search.addSearchRadius(latitude, longitude, distance)
 
     if magnitude > 0.0:
         if magnitude_diff < 0:
@@ -446,10 +1016,46 @@ def searchEvents(latitude = None, longitude = None, distance = 100.0,
 
     if date is not None:
         if date_diff < 0:
-            search.addSearchBetween("origin_date", date, date)
-        else:
-            search.addSearchBetween("origin_date",
-                                    date-timedelta(days=date_diff),
-                                    date+timedelta(days=date_diff))
+            date_diff = 0.0
+        search.addSearchBetween("origin_datetime",
+                                datetime.combine(date, time.min) - timedelta(days=date_diff),
+                                datetime.combine(date, time.max) + timedelta(days=date_diff))
 
     return search.searchEvents()
+
+def searchNearestEvents(latitude, longitude, count = 10, db_conn = None):
+    """
+    Function for searching the events with epicenters closest to a point. The distance of an event is the distance of its closest main header.
+
+    :param float latitude: latitude of the point
+    :param float longitude: longitude of the point
+    :param int count: maximum amount of events returned
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :returns: Array of :class:`NordicEvent` ordered by the distance
+    """
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    cur = conn.cursor()
+
+    ans = spatialSearch.searchNearestIds(   cur,
+                                            "nordic_header_main.event_id",
+                                            "FROM nordic_header_main WHERE TRUE",
+                                            [],
+                                            "nordic_header_main.epicenter_latitude",
+                                            "nordic_header_main.epicenter_longitude",
+                                            latitude,
+                                            longitude,
+                                            count)
+
+    events = {}
+    if ans:
+        for e in sql2nordic.getNordic([a[0] for a in ans], db_conn = conn):
+            events[e.event_id] = e
+
+    if db_conn is None:
+        conn.close()
+
+    return [events[a[0]] for a in ans if a[0] in events]
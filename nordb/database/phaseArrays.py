@@ -0,0 +1,192 @@
+"""
+This module contains the functions for reading the phase data of events from the database straight into columnar NumPy arrays. The rows are copied from the database in the binary COPY format where every value has a fixed width, so the whole result is turned into arrays with a single numpy.frombuffer call without creating any Python objects for the rows.
+
+Functions and Classes
+---------------------
+"""
+import io
+
+import numpy as np
+
+from nordb.core import usernameUtilities
+
+PHASE_EVENTS_QUERY =    (
+                        "SELECT "
+                        "   nordic_event.id "
+                        "FROM "
+                        "   nordic_event, nordic_header_main "
+                        "WHERE "
+                        "   nordic_event.id = nordic_header_main.event_id "
+                        )
+
+SELECT_CATEGORIES = (
+                    "SELECT "
+                    "   DISTINCT {0} "
+                    "FROM "
+                    "   nordic_phase_data "
+                    "WHERE "
+                    "   event_id IN ({1}) "
+                    "AND "
+                    "   {0} IS NOT NULL "
+                    "ORDER BY "
+                    "   {0}"
+                    )
+
+SELECT_PHASE_ARRAYS =   (
+                        "SELECT "
+                        "   event_id, "
+                        "   id, "
+                        "   COALESCE(array_position(%(station_codes)s::text[], station_code::text) - 1, -1), "
+                        "   COALESCE(array_position(%(phase_types)s::text[], phase_type::text) - 1, -1), "
+                        "   COALESCE((EXTRACT(EPOCH FROM observation_time) * 1000000)::bigint, -9223372036854775808), "
+                        "   COALESCE(travel_time_residual::float8, 'NaN'), "
+                        "   COALESCE(azimuth_residual::float8, 'NaN'), "
+                        "   COALESCE(epicenter_distance::float8, 'NaN'), "
+                        "   COALESCE(epicenter_to_station_azimuth::float8, 'NaN'), "
+                        "   COALESCE(back_azimuth::float8, 'NaN'), "
+                        "   COALESCE(apparent_velocity::float8, 'NaN'), "
+                        "   COALESCE(location_weight::float8, 'NaN'), "
+                        "   COALESCE(signal_to_noise::float8, 'NaN'), "
+                        "   COALESCE(max_amplitude::float8, 'NaN'), "
+                        "   COALESCE(max_amplitude_period::float8, 'NaN') "
+                        "FROM "
+                        "   nordic_phase_data "
+                        "WHERE "
+                        "   event_id IN ({0}) "
+                        "ORDER BY "
+                        "   event_id, id"
+                        )
+
+PHASE_COLUMNS = [
+                    ("event_id", ">i4", np.int32),
+                    ("d_id", ">i4", np.int32),
+                    ("station_code", ">i4", np.int32),
+                    ("phase_type", ">i4", np.int32),
+                    ("observation_time", ">i8", "datetime64[us]"),
+                    ("travel_time_residual", ">f8", np.float64),
+                    ("azimuth_residual", ">f8", np.float64),
+                    ("epicenter_distance", ">f8", np.float64),
+                    ("epicenter_to_station_azimuth", ">f8", np.float64),
+                    ("back_azimuth", ">f8", np.float64),
+                    ("apparent_velocity", ">f8", np.float64),
+                    ("location_weight", ">f8", np.float64),
+                    ("signal_to_noise", ">f8", np.float64),
+                    ("max_amplitude", ">f8", np.float64),
+                    ("max_amplitude_period", ">f8", np.float64),
+                ]
+
+CATEGORICAL_COLUMNS = ["station_code", "phase_type"]
+
+COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+
+def getPhaseArrays(search = None, as_arrow = False, db_conn = None):
+    """
+    Function for getting the phase data of all events that fit to the criteria of a NordicSearch as columnar arrays. The arrays are ordered by the event id and the id of the phase data.
+
+    The returned dict has the following arrays:
+
+        - event_id and d_id as int32 arrays
+        - observation_time as a datetime64[us] array where missing values are NaT
+        - travel_time_residual, azimuth_residual, epicenter_distance, epicenter_to_station_azimuth, back_azimuth, apparent_velocity, location_weight, signal_to_noise, max_amplitude and max_amplitude_period as float64 arrays where missing values are NaN
+        - station_code and phase_type as int32 category codes where missing values are -1. The categories are in station_code_categories and phase_type_categories arrays
+
+    With as_arrow the arrays are returned as a pyarrow Table instead and the categorical columns are dictionary arrays. pyarrow has to be installed for this.
+
+    :param NordicSearch search: criteria for the events. Defaults to None which returns the phase data of all events
+    :param bool as_arrow: return a pyarrow Table instead of a dict of arrays
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :returns: dict of NumPy arrays or a pyarrow Table
+    """
+    if as_arrow:
+        try:
+            import pyarrow
+        except ImportError:
+            raise Exception("pyarrow is required for getting the phase arrays as an arrow table!")
+
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    cur = conn.cursor()
+
+    events_query = PHASE_EVENTS_QUERY
+    events_values = []
+    if search is not None:
+        query_str, events_values = search.getSearchQueryAndValues()
+        events_query += query_str
+    events_query = cur.mogrify(events_query, events_values).decode()
+
+    categories = {}
+    for column in CATEGORICAL_COLUMNS:
+        cur.execute(SELECT_CATEGORIES.format(column, events_query))
+        categories[column] = [a[0] for a in cur.fetchall()]
+
+    query = cur.mogrify(SELECT_PHASE_ARRAYS.format(events_query.replace("%", "%%")),
+                        {"station_codes":categories["station_code"],
+                         "phase_types":categories["phase_type"]}).decode()
+
+    copy_buffer = io.BytesIO()
+    cur.copy_expert("COPY ({0}) TO STDOUT WITH (FORMAT binary)".format(query), copy_buffer)
+
+    if db_conn is None:
+        conn.close()
+
+    arrays = copyBuffer2Arrays(copy_buffer.getvalue())
+    for column in CATEGORICAL_COLUMNS:
+        arrays[column + "_categories"] = np.array(categories[column], dtype=str)
+
+    if as_arrow:
+        return phaseArrays2Arrow(arrays)
+
+    return arrays
+
+def copyBuffer2Arrays(copy_data):
+    """
+    Function for turning the output of a binary COPY of SELECT_PHASE_ARRAYS into NumPy arrays. Every value of the COPY is prefixed with its length and every row with the amount of values, so the rows can be read as a structured array.
+
+    :param bytes copy_data: output of the COPY command
+    :returns: dict of NumPy arrays
+    """
+    if copy_data[:len(COPY_SIGNATURE)] != COPY_SIGNATURE:
+        raise Exception("Not a binary COPY output!")
+
+    extension_length = int.from_bytes(copy_data[15:19], "big")
+    offset = 19 + extension_length
+
+    row_fields = [("field_count", ">i2")]
+    for name, db_type, array_type in PHASE_COLUMNS:
+        row_fields.append((name + "_length", ">i4"))
+        row_fields.append((name, db_type))
+    row_type = np.dtype(row_fields)
+
+    row_count = (len(copy_data) - offset - 2) // row_type.itemsize
+    rows = np.frombuffer(copy_data, dtype=row_type, count=row_count, offset=offset)
+
+    arrays = {}
+    for name, db_type, array_type in PHASE_COLUMNS:
+        if array_type == "datetime64[us]":
+            arrays[name] = rows[name].astype(np.int64).view(array_type)
+        else:
+            arrays[name] = rows[name].astype(array_type)
+
+    return arrays
+
+def phaseArrays2Arrow(arrays):
+    """
+    Function for converting the arrays of getPhaseArrays into a pyarrow Table. The categorical columns are converted into dictionary arrays and the NaN and NaT values into nulls.
+
+    :param dict arrays: arrays from getPhaseArrays
+    :returns: pyarrow Table
+    """
+    import pyarrow
+
+    columns = {}
+    for name, db_type, array_type in PHASE_COLUMNS:
+        if name in CATEGORICAL_COLUMNS:
+            codes = pyarrow.array(arrays[name], mask = arrays[name] < 0)
+            columns[name] = pyarrow.DictionaryArray.from_arrays(codes, pyarrow.array(arrays[name + "_categories"]))
+        else:
+            columns[name] = pyarrow.array(arrays[name], from_pandas = True)
+
+    return pyarrow.table(columns)
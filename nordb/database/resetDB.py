@@ -5,6 +5,7 @@ import psycopg2
 
 from nordb.database import norDBManagement
 from nordb.core import usernameUtilities
+from nordb.database import metadataCache
 
 def resetDatabase():
     """
@@ -61,5 +62,6 @@ def resetStations():
         conn.close()
         raise e
     conn.commit()
+    metadataCache.invalidate()
     conn.close()
 
@@ -4,9 +4,11 @@ This module contains all functions and classes for reading a response file and p
 Functions and Classes
 ---------------------
 """
+import math
 
 from nordb.database import sitechan2sql
 from nordb.core import usernameUtilities
+from nordb.database import metadataCache
 from nordb.database import creationInfo
 
 RESPONSE_INSERT =   (
@@ -56,6 +58,17 @@ FAP_INSERT =    (
                 "   (%s, %s, %s, %s, %s, %s)"
                 )
 
+def coefficient2Sql(value):
+    """
+    Function for converting a coefficient of a response into a value inserted to the database. Responses read from the database have NaN in place of the missing values, so NaN is inserted as NULL.
+
+    :param float value: value of the coefficient
+    :returns: the value as a float or None if it is missing
+    """
+    if value is None or math.isnan(value):
+        return None
+    return float(value)
+
 def insertResponse2Database(response, privacy_level = "public"):
     """
     Function for inserting the response object to the database
@@ -76,15 +89,15 @@ def insertResponse2Database(response, privacy_level = "public"):
             cur.execute(FAP_RESPONSE_INSERT, (response.response_id,))
             fap_id = cur.fetchone()[0]
             for fap in response.fap:
-                cur.execute(FAP_INSERT, fap + [fap_id])
+                cur.execute(FAP_INSERT, [coefficient2Sql(f) for f in fap] + [fap_id])
 
         elif response.response_format == 'paz':
             cur.execute(PAZ_RESPONSE_INSERT, (response.response_id, response.scale_factor))
             paz_id = cur.fetchone()[0]
             for pole in response.poles:
-                cur.execute(POLE_INSERT, pole + [paz_id])
+                cur.execute(POLE_INSERT, [coefficient2Sql(p) for p in pole] + [paz_id])
             for zero in response.zeros:
-                cur.execute(ZERO_INSERT, zero + [paz_id])
+                cur.execute(ZERO_INSERT, [coefficient2Sql(z) for z in zero] + [paz_id])
 
         else:
             raise Exception("No such response format! ({0})".format(response.response_format))
@@ -92,5 +105,6 @@ def insertResponse2Database(response, privacy_level = "public"):
         conn.close()
         raise e
     conn.commit()
+    metadataCache.invalidate()
     conn.close()
 
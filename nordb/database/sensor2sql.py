@@ -11,6 +11,7 @@ from datetime import datetime
 from nordb.nordic.sitechan import SiteChan
 from nordb.database import sitechan2sql
 from nordb.core import usernameUtilities
+from nordb.database import metadataCache
 
 FAKE_CHANNEL_LINE = {
                         "n":[None, None, None, None, "n", 0.0,  0.0, 90.0, "% AUTOMATICALLY GENERATED CHANNEL! PROBABLY NOT OK", None, -1, -1, -1],
@@ -97,5 +98,6 @@ def insertSensor2Database(sensor):
         conn.close()
         raise e
     conn.commit()
+    metadataCache.invalidate()
     conn.close()
 
@@ -10,6 +10,7 @@ import unidecode
 
 from nordb.nordic.sitechan import SiteChan
 from nordb.core import usernameUtilities
+from nordb.database import metadataCache
 from nordb.core.utils import stringToDate
 
 CHANNEL_INSERT = (  "INSERT INTO sitechan" +
@@ -54,5 +55,6 @@ def insertSiteChan2Database(channel):
         raise e
 
     conn.commit()
+    metadataCache.invalidate()
     conn.close()
 
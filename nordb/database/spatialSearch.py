@@ -0,0 +1,169 @@
+"""
+This module contains the functions for building spatial search criteria for events and stations. All searches first restrict the rows with bounding boxes that are answered by the GiST indexes on point(longitude, latitude) and then filter the remaining rows with the exact great-circle distance computed with the haversine formula.
+
+Functions and Classes
+---------------------
+"""
+import math
+
+EARTH_RADIUS = 6371.0
+HALF_CIRCUMFERENCE = math.pi * EARTH_RADIUS
+NEAREST_START_RADIUS = 50.0
+
+DISTANCE_QUERY =    (
+                    "(2 * {0} * ASIN(LEAST(1.0, SQRT( "
+                    "   POWER(SIN(RADIANS({1} - %s) / 2), 2) + "
+                    "   COS(RADIANS(%s)) * COS(RADIANS({1})) * "
+                    "   POWER(SIN(RADIANS({2} - %s) / 2), 2) "
+                    "))))"
+                    )
+
+def haversineDistance(latitude_1, longitude_1, latitude_2, longitude_2):
+    """
+    Function for calculating the great-circle distance between two points with the haversine formula.
+
+    :param float latitude_1: latitude of the first point
+    :param float longitude_1: longitude of the first point
+    :param float latitude_2: latitude of the second point
+    :param float longitude_2: longitude of the second point
+    :returns: distance between the points in kilometers
+    """
+    d_lat = math.radians(latitude_2 - latitude_1)
+    d_lon = math.radians(longitude_2 - longitude_1)
+    a = (math.sin(d_lat / 2)**2 +
+         math.cos(math.radians(latitude_1)) * math.cos(math.radians(latitude_2)) * math.sin(d_lon / 2)**2)
+
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+def boundingBoxes(latitude, longitude, radius):
+    """
+    Function for calculating the latitude-longitude boxes that contain all points less than radius away from the point (latitude, longitude). Normally there is only one box, but a circle crossing the antimeridian is split into two boxes and a circle containing a pole covers all longitudes.
+
+    :param float latitude: latitude of the center point
+    :param float longitude: longitude of the center point
+    :param float radius: radius of the circle in kilometers
+    :returns: list of (latitude_min, latitude_max, longitude_min, longitude_max) tuples
+    """
+    if radius < 0:
+        raise Exception("Radius cannot be negative! ({0})".format(radius))
+
+    angle = radius / EARTH_RADIUS
+    lat_min = math.radians(latitude) - angle
+    lat_max = math.radians(latitude) + angle
+
+    if lat_min <= -math.pi / 2 or lat_max >= math.pi / 2:
+        return [(max(math.degrees(lat_min), -90.0), min(math.degrees(lat_max), 90.0), -180.0, 180.0)]
+
+    lat_min = math.degrees(lat_min)
+    lat_max = math.degrees(lat_max)
+    lon_diff = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(latitude)))))
+    lon_min = longitude - lon_diff
+    lon_max = longitude + lon_diff
+
+    if lon_max - lon_min >= 360.0:
+        return [(lat_min, lat_max, -180.0, 180.0)]
+    if lon_min < -180.0:
+        return [(lat_min, lat_max, lon_min + 360.0, 180.0), (lat_min, lat_max, -180.0, lon_max)]
+    if lon_max > 180.0:
+        return [(lat_min, lat_max, lon_min, 180.0), (lat_min, lat_max, -180.0, lon_max - 360.0)]
+
+    return [(lat_min, lat_max, lon_min, lon_max)]
+
+def distanceQuery(latitude_column, longitude_column, latitude, longitude):
+    """
+    Function for creating the sql expression for the great-circle distance in kilometers between the point in the given columns and the point (latitude, longitude).
+
+    :param str latitude_column: name of the latitude column
+    :param str longitude_column: name of the longitude column
+    :param float latitude: latitude of the point
+    :param float longitude: longitude of the point
+    :returns: the expression and the list of values for it
+    """
+    return (DISTANCE_QUERY.format(EARTH_RADIUS, latitude_column, longitude_column),
+            [latitude, latitude, longitude])
+
+def radiusQuery(latitude_column, longitude_column, latitude, longitude, radius):
+    """
+    Function for creating the sql condition for all points that are less than radius away from the point (latitude, longitude). The bounding boxes of the circle are checked first so that the GiST index on point(longitude, latitude) can be used and the exact distance is only calculated for the rows inside them.
+
+    :param str latitude_column: name of the latitude column
+    :param str longitude_column: name of the longitude column
+    :param float latitude: latitude of the center point
+    :param float longitude: longitude of the center point
+    :param float radius: radius of the circle in kilometers
+    :returns: the condition and the list of values for it
+    """
+    point = "point({0}, {1})".format(longitude_column, latitude_column)
+    boxes = boundingBoxes(latitude, longitude, radius)
+    distance, values = distanceQuery(latitude_column, longitude_column, latitude, longitude)
+
+    box_values = []
+    for lat_min, lat_max, lon_min, lon_max in boxes:
+        box_values.extend([lon_min, lat_min, lon_max, lat_max])
+
+    query = "(({0}) AND {1} <= %s)".format(
+                " OR ".join(["{0} <@ box(point(%s, %s), point(%s, %s))".format(point)]*len(boxes)),
+                distance)
+
+    return query, box_values + values + [radius]
+
+def polygonQuery(latitude_column, longitude_column, points):
+    """
+    Function for creating the sql condition for all points inside a polygon. The edges of the polygon are straight lines on the latitude-longitude plane.
+
+    :param str latitude_column: name of the latitude column
+    :param str longitude_column: name of the longitude column
+    :param list points: list of (latitude, longitude) tuples of the polygon corners
+    :returns: the condition and the list of values for it
+    """
+    if len(points) < 3:
+        raise Exception("Polygon needs at least three points! ({0})".format(points))
+
+    polygon = "({0})".format(",".join(["({0},{1})".format(float(p[1]), float(p[0])) for p in points]))
+
+    return ("(point({0}, {1}) <@ CAST(%s AS polygon))".format(longitude_column, latitude_column),
+            [polygon])
+
+def searchNearestIds(cur, id_column, table_query, table_values, latitude_column, longitude_column, latitude, longitude, count):
+    """
+    Function for finding the ids of the rows closest to the point (latitude, longitude). The search is done with an expanding radius so that the indexed radius search is used until count rows have been found or the whole earth has been searched.
+
+    :param psycopg2.cursor cur: cursor used for the queries
+    :param str id_column: name of the id column. Rows with the same id are combined and the shortest distance is used
+    :param str table_query: FROM and WHERE parts of the query. The radius condition is appended to it with AND
+    :param list table_values: values for the table_query
+    :param str latitude_column: name of the latitude column
+    :param str longitude_column: name of the longitude column
+    :param float latitude: latitude of the point
+    :param float longitude: longitude of the point
+    :param int count: maximum amount of ids returned
+    :returns: list of (id, distance) tuples ordered by the distance
+    """
+    if count < 1:
+        return []
+
+    radius = NEAREST_START_RADIUS
+    distance, distance_values = distanceQuery(latitude_column, longitude_column, latitude, longitude)
+
+    while True:
+        criteria, criteria_values = radiusQuery(latitude_column, longitude_column, latitude, longitude, radius)
+        query = (
+                "SELECT "
+                "   {0}, MIN({1}) AS distance "
+                "{2} "
+                "AND "
+                "   {3} "
+                "GROUP BY "
+                "   {0} "
+                "ORDER BY "
+                "   distance, {0} "
+                "LIMIT %s"
+                ).format(id_column, distance, table_query, criteria)
+
+        cur.execute(query, distance_values + list(table_values) + criteria_values + [count])
+        ans = cur.fetchall()
+
+        if len(ans) >= count or radius >= HALF_CIRCUMFERENCE:
+            return ans
+
+        radius = min(radius * 4, HALF_CIRCUMFERENCE)
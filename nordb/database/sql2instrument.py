@@ -146,14 +146,17 @@ def instruments2sensors(sensors, db_conn = None):
 
     ans = cur.fetchall()
 
+    sensors_by_id = {}
+    for sen in sensors:
+        sensors_by_id.setdefault(sen.s_id, []).append(sen)
+
     instruments = []
 
     for a in ans:
         instrument = Instrument(a[:-2])
         instruments.append(instrument)
-        for sen in sensors:
-            if sen.s_id == a[-1]:
-                sen.instruments.append(instrument)
+        for sen in sensors_by_id.get(a[-1], []):
+            sen.instruments.append(instrument)
 
     responses2instruments(instruments, db_conn=conn)
 
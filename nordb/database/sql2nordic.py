@@ -5,7 +5,10 @@ Functions and Classes
 ---------------------
 """
 
+import itertools
 import psycopg2
+from psycopg2 import sql
+from datetime import datetime
 from nordb.core import usernameUtilities
 from nordb.nordic.nordicEvent import NordicEvent
 from nordb.nordic.nordicMain import NordicMain
@@ -14,18 +17,14 @@ from nordb.nordic.nordicComment import NordicComment
 from nordb.nordic.nordicError import NordicError
 from nordb.nordic.nordicWaveform import NordicWaveform
 from nordb.nordic.nordicData import NordicData
+from nordb.nordic.misc import CreationInfo
 from nordb.database.creationInfo import getCreationInfo
 
-SELECT_QUERY =   {
+HEADER_COLUMNS = {
                   0:(
-                    "SELECT "
                     "   id, root_id, creation_id, nordic_file_id, solution_type, author_id "
-                    "FROM "
-                    "   nordic_event "
-                    "WHERE id in %s"
                     ),
                   1:(
-                    "SELECT "
                     "   origin_time, origin_date, location_model, distance_indicator, "
                     "   event_desc_id, epicenter_latitude, epicenter_longitude, depth, "
                     "   depth_control, locating_indicator, epicenter_reporting_agency, "
@@ -34,13 +33,8 @@ SELECT_QUERY =   {
                     "   magnitude_2, type_of_magnitude_2, magnitude_reporting_agency_2, "
                     "   magnitude_3, type_of_magnitude_3, magnitude_reporting_agency_3, "
                     "   event_id, id "
-                    "FROM "
-                    "   nordic_header_main "
-                    "WHERE "
-                    "   event_id in %s"
                     ),
                   2:(
-                    "SELECT "
                     "   description, diastrophism_code, tsunami_code, seiche_code, "
                     "   cultural_effects, unusual_effects, maximum_observed_intensity, "
                     "   maximum_intensity_qualifier, intensity_scale, macroseismic_latitude, "
@@ -48,53 +42,157 @@ SELECT_QUERY =   {
                     "   logarithm_of_radius, logarithm_of_area_1, bordering_intensity_1, "
                     "   logarithm_of_area_2, bordering_intensity_2, quality_rank,  "
                     "   reporting_agency, event_id, id "
-                    "FROM "
-                    "   nordic_header_macroseismic "
-                    "WHERE "
-                    "   event_id in %s"
                     ),
                   3:(
-                    "SELECT "
                     "   h_comment, event_id, id "
-                    "FROM "
-                    "   nordic_header_comment "
-                    "WHERE "
-                    "   event_id in %s"
                     ),
                   5:(
-                    "SELECT "
                     "   gap, second_error, epicenter_latitude_error, epicenter_longitude_error, "
                     "   depth_error, magnitude_error, nordic_header_error.header_id, "
                     "   nordic_header_error.id, event_id "
-                    "FROM "
-                    "   nordic_header_error, nordic_header_main "
-                    "WHERE "
-                    "   header_id in %s "
-                    "AND "
-                    "   header_id = nordic_header_main.id "
                     ),
                   6:(
-                    "SELECT "
                     "   waveform_info, event_id, id "
-                    "FROM "
-                    "   nordic_header_waveform "
-                    "WHERE "
-                    "   event_id in %s"
                     ),
                   8:(
-                    "SELECT "
                     "   station_code, sp_instrument_type, sp_component, quality_indicator,  "
                     "   phase_type, weight, first_motion, observation_time, "
                     "   signal_duration, max_amplitude, max_amplitude_period, back_azimuth, "
                     "   apparent_velocity, signal_to_noise, azimuth_residual, "
                     "   travel_time_residual, location_weight, epicenter_distance, "
                     "   epicenter_to_station_azimuth, event_id, id "
+                    )
+                }
+
+SELECT_QUERY = {
+                0:(
+                    "SELECT " + HEADER_COLUMNS[0] +
+                    "FROM "
+                    "   nordic_event "
+                    "WHERE "
+                    "   id in %s"
+                  ),
+                1:(
+                    "SELECT " + HEADER_COLUMNS[1] +
+                    "FROM "
+                    "   nordic_header_main "
+                    "WHERE "
+                    "   event_id in %s"
+                  ),
+                2:(
+                    "SELECT " + HEADER_COLUMNS[2] +
+                    "FROM "
+                    "   nordic_header_macroseismic "
+                    "WHERE "
+                    "   event_id in %s"
+                  ),
+                3:(
+                    "SELECT " + HEADER_COLUMNS[3] +
+                    "FROM "
+                    "   nordic_header_comment "
+                    "WHERE "
+                    "   event_id in %s"
+                  ),
+                5:(
+                    "SELECT " + HEADER_COLUMNS[5] +
+                    "FROM "
+                    "   nordic_header_error, nordic_header_main "
+                    "WHERE "
+                    "   header_id in %s "
+                    "AND "
+                    "   header_id = nordic_header_main.id "
+                  ),
+                6:(
+                    "SELECT " + HEADER_COLUMNS[6] +
+                    "FROM "
+                    "   nordic_header_waveform "
+                    "WHERE "
+                    "   event_id in %s"
+                  ),
+                8:(
+                    "SELECT " + HEADER_COLUMNS[8] +
                     "FROM "
                     "   nordic_phase_data "
                     "WHERE "
                     "   event_id in %s"
-                    )
-                }
+                  )
+               }
+
+ITER_BATCH_SIZE = 1000
+
+ITER_QUERY = {
+                0:(
+                    "SELECT " + HEADER_COLUMNS[0] +
+                    "FROM "
+                    "   nordic_event "
+                    "WHERE "
+                    "   id {event_filter} "
+                    "ORDER BY "
+                    "   id"
+                  ),
+                1:(
+                    "SELECT " + HEADER_COLUMNS[1] +
+                    "FROM "
+                    "   nordic_header_main "
+                    "WHERE "
+                    "   event_id {event_filter} "
+                    "ORDER BY "
+                    "   event_id, id"
+                  ),
+                2:(
+                    "SELECT " + HEADER_COLUMNS[2] +
+                    "FROM "
+                    "   nordic_header_macroseismic "
+                    "WHERE "
+                    "   event_id {event_filter} "
+                    "ORDER BY "
+                    "   event_id, id"
+                  ),
+                3:(
+                    "SELECT " + HEADER_COLUMNS[3] +
+                    "FROM "
+                    "   nordic_header_comment "
+                    "WHERE "
+                    "   event_id {event_filter} "
+                    "ORDER BY "
+                    "   event_id, id"
+                  ),
+                5:(
+                    "SELECT " + HEADER_COLUMNS[5] +
+                    "FROM "
+                    "   nordic_header_error, nordic_header_main "
+                    "WHERE "
+                    "   event_id {event_filter} "
+                    "AND "
+                    "   header_id = nordic_header_main.id "
+                    "ORDER BY "
+                    "   event_id, header_id"
+                  ),
+                6:(
+                    "SELECT " + HEADER_COLUMNS[6] +
+                    "FROM "
+                    "   nordic_header_waveform "
+                    "WHERE "
+                    "   event_id {event_filter} "
+                    "ORDER BY "
+                    "   event_id, id"
+                  ),
+                8:(
+                    "SELECT " + HEADER_COLUMNS[8] +
+                    "FROM "
+                    "   nordic_phase_data "
+                    "WHERE "
+                    "   event_id {event_filter} "
+                    "ORDER BY "
+                    "   event_id, id"
+                  )
+             }
+
+ITER_IDS_FILTER = "in %s"
+
+ITER_TABLE_FILTER = "IN (SELECT id FROM {id_table})"
+
+CURSOR_COUNTER = itertools.count()
 
 SELECT_ROOT_ID =    (
                     "SELECT "
@@ -114,6 +212,209 @@ SELECT_EVENT_ROOT_ID =  (
                         "   nordic_event.id = %s "
                         )
 
+SELECT_MAX_EVENT_ID =   (
+                        "SELECT "
+                        "   MAX(nordic_event.id) "
+                        "FROM "
+                        "   nordic_event"
+                        )
+
+SELECT_NORDIC_JSON =   (
+                        "SELECT "
+                        "   nordic_event.id, nordic_event.root_id, nordic_event.creation_id, "
+                        "   nordic_event.solution_type, creation_info.creation_date, "
+                        "   creation_info.owner, creation_info.privacy_setting, "
+                        "   creation_info.creation_comment, "
+                        "   ("
+                        "   SELECT "
+                        "       json_agg(json_build_array("
+                        "           origin_time, origin_date, location_model, distance_indicator, "
+                        "           event_desc_id, epicenter_latitude, epicenter_longitude, depth, "
+                        "           depth_control, locating_indicator, epicenter_reporting_agency, "
+                        "           stations_used, rms_time_residuals, "
+                        "           magnitude_1, type_of_magnitude_1, magnitude_reporting_agency_1, "
+                        "           magnitude_2, type_of_magnitude_2, magnitude_reporting_agency_2, "
+                        "           magnitude_3, type_of_magnitude_3, magnitude_reporting_agency_3, "
+                        "           event_id, id, "
+                        "           ("
+                        "           SELECT "
+                        "               json_build_array("
+                        "                   gap, second_error, epicenter_latitude_error, "
+                        "                   epicenter_longitude_error, depth_error, magnitude_error, "
+                        "                   header_id, nordic_header_error.id, nordic_header_main.event_id"
+                        "               ) "
+                        "           FROM "
+                        "               nordic_header_error "
+                        "           WHERE "
+                        "               header_id = nordic_header_main.id "
+                        "           LIMIT 1"
+                        "           )"
+                        "       ) ORDER BY id) "
+                        "   FROM "
+                        "       nordic_header_main "
+                        "   WHERE "
+                        "       event_id = nordic_event.id"
+                        "   ), "
+                        "   ("
+                        "   SELECT "
+                        "       json_agg(json_build_array("
+                        "           description, diastrophism_code, tsunami_code, seiche_code, "
+                        "           cultural_effects, unusual_effects, maximum_observed_intensity, "
+                        "           maximum_intensity_qualifier, intensity_scale, macroseismic_latitude, "
+                        "           macroseismic_longitude, macroseismic_magnitude, type_of_magnitude, "
+                        "           logarithm_of_radius, logarithm_of_area_1, bordering_intensity_1, "
+                        "           logarithm_of_area_2, bordering_intensity_2, quality_rank, "
+                        "           reporting_agency, event_id, id"
+                        "       ) ORDER BY id) "
+                        "   FROM "
+                        "       nordic_header_macroseismic "
+                        "   WHERE "
+                        "       event_id = nordic_event.id"
+                        "   ), "
+                        "   ("
+                        "   SELECT "
+                        "       json_agg(json_build_array(h_comment, event_id, id) ORDER BY id) "
+                        "   FROM "
+                        "       nordic_header_comment "
+                        "   WHERE "
+                        "       event_id = nordic_event.id"
+                        "   ), "
+                        "   ("
+                        "   SELECT "
+                        "       json_agg(json_build_array(waveform_info, event_id, id) ORDER BY id) "
+                        "   FROM "
+                        "       nordic_header_waveform "
+                        "   WHERE "
+                        "       event_id = nordic_event.id"
+                        "   ), "
+                        "   ("
+                        "   SELECT "
+                        "       json_agg(json_build_array("
+                        "           station_code, sp_instrument_type, sp_component, quality_indicator, "
+                        "           phase_type, weight, first_motion, observation_time, "
+                        "           signal_duration, max_amplitude, max_amplitude_period, back_azimuth, "
+                        "           apparent_velocity, signal_to_noise, azimuth_residual, "
+                        "           travel_time_residual, location_weight, epicenter_distance, "
+                        "           epicenter_to_station_azimuth, event_id, id"
+                        "       ) ORDER BY id) "
+                        "   FROM "
+                        "       nordic_phase_data "
+                        "   WHERE "
+                        "       event_id = nordic_event.id"
+                        "   ) "
+                        "FROM "
+                        "   nordic_event, creation_info "
+                        "WHERE "
+                        "   nordic_event.id IN %s "
+                        "AND "
+                        "   creation_info.id = nordic_event.creation_id "
+                        "ORDER BY "
+                        "   nordic_event.id"
+                        )
+
+JSON_HEADER_CLASSES = [
+                        NordicMain,
+                        NordicMacroseismic,
+                        NordicComment,
+                        NordicWaveform,
+                        NordicData
+                      ]
+
+def json2Datetime(value):
+    """
+    Function for converting a timestamp written by the database to json into a datetime. The database leaves out the fraction of the seconds when it is zero and the trailing zeros of the fraction otherwise.
+
+    :param str value: timestamp in format YYYY-MM-DDTHH:MM:SS[.ffffff]
+    :returns: datetime object
+    """
+    if "." in value:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+
+def json2Time(value):
+    """
+    Function for converting a time written by the database to json into a time.
+
+    :param str value: time in format HH:MM:SS[.ffffff]
+    :returns: time object
+    """
+    if "." in value:
+        return datetime.strptime(value, "%H:%M:%S.%f").time()
+    return datetime.strptime(value, "%H:%M:%S").time()
+
+def json2Date(value):
+    """
+    Function for converting a date written by the database to json into a date.
+
+    :param str value: date in format YYYY-MM-DD
+    :returns: date object
+    """
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+JSON_CONVERSIONS =  {
+                    NordicMain.header_type:[
+                        (NordicMain.ORIGIN_TIME, json2Time),
+                        (NordicMain.ORIGIN_DATE, json2Date),
+                        (NordicMain.EPICENTER_LATITUDE, float),
+                        (NordicMain.EPICENTER_LONGITUDE, float),
+                        (NordicMain.DEPTH, float),
+                        (NordicMain.RMS_TIME_RESIDUALS, float),
+                        (NordicMain.MAGNITUDE_1, float),
+                        (NordicMain.MAGNITUDE_2, float),
+                        (NordicMain.MAGNITUDE_3, float)
+                    ],
+                    NordicMacroseismic.header_type:[
+                        (NordicMacroseismic.MACROSEISMIC_LATITUDE, float),
+                        (NordicMacroseismic.MACROSEISMIC_LONGITUDE, float),
+                        (NordicMacroseismic.MACROSEISMIC_MAGNITUDE, float),
+                        (NordicMacroseismic.LOGARITHM_OF_RADIUS, float),
+                        (NordicMacroseismic.LOGARITHM_OF_AREA_1, float),
+                        (NordicMacroseismic.LOGARITHM_OF_AREA_2, float)
+                    ],
+                    NordicComment.header_type:[],
+                    NordicError.header_type:[
+                        (NordicError.SECOND_ERROR, float),
+                        (NordicError.EPICENTER_LATITUDE_ERROR, float),
+                        (NordicError.EPICENTER_LONGITUDE_ERROR, float),
+                        (NordicError.DEPTH_ERROR, float),
+                        (NordicError.MAGNITUDE_ERROR, float)
+                    ],
+                    NordicWaveform.header_type:[],
+                    NordicData.header_type:[
+                        (NordicData.OBSERVATION_TIME, json2Datetime),
+                        (NordicData.MAX_AMPLITUDE, float),
+                        (NordicData.MAX_AMPLITUDE_PERIOD, float),
+                        (NordicData.BACK_AZIMUTH, float),
+                        (NordicData.APPARENT_VELOCITY, float),
+                        (NordicData.SIGNAL_TO_NOISE, float),
+                        (NordicData.TRAVEL_TIME_RESIDUAL, float)
+                    ]
+                    }
+
+def getMaxEventId(db_conn = None):
+    """
+    Function for getting the largest event id in the database.
+
+    :returns: event id as integer or 0 if there are no events
+    """
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    cur = conn.cursor()
+
+    cur.execute(SELECT_MAX_EVENT_ID)
+    ans = cur.fetchone()[0]
+
+    if db_conn is None:
+        conn.close()
+
+    if ans is None:
+        return 0
+
+    return ans
+
 def getEventRootId(event_id, db_conn = None):
     """
     Function for getting nordic event root id from nordic event.
@@ -153,20 +454,33 @@ def getNordicsRoot(root_id, db_conn = None):
     else:
         conn = db_conn
 
-    cur = conn.cursor()
-    cur.execute(SELECT_ROOT_ID, (root_id,))
-    e_ids = cur.fetchall()
-    conn.close()
-    nordic_root = []
+    nordics = getNordic(getNordicRootIds(root_id, db_conn = conn), db_conn = conn)
 
-    e_ids = [e_id[0] for e_id in e_ids]
+    if db_conn is None:
+        conn.close()
 
-    nordics = getNordic(e_ids, db_conn = conn)
+    return nordics
+
+def getNordicRootIds(root_id, db_conn = None):
+    """
+    Method for getting the ids of all events attached to a root id from the database.
+
+    :param int root_id: root id of the event root
+    :returns: list of event ids
+    """
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    cur = conn.cursor()
+    cur.execute(SELECT_ROOT_ID, (root_id,))
+    e_ids = [e_id[0] for e_id in cur.fetchall()]
 
     if db_conn is None:
         conn.close()
 
-    return nordics
+    return e_ids
 
 def getNordic(event_id, db_conn = None):
     """
@@ -221,7 +535,7 @@ def getNordic(event_id, db_conn = None):
     main_ids = []
 
     for a in ans:
-       nordic_events[a[-2]].main_h.append(NordicMain(a))
+       nordic_events[a[-2]].main_h.append(NordicMain.fromDatabase(a))
        main_ids.append(a[-1])
 
     main_ids = tuple(main_ids)
@@ -230,13 +544,13 @@ def getNordic(event_id, db_conn = None):
     ans = cur.fetchall()
 
     for a in ans:
-        nordic_events[a[-2]].macro_h.append(NordicMacroseismic(a))
+        nordic_events[a[-2]].macro_h.append(NordicMacroseismic.fromDatabase(a))
 
     cur.execute(SELECT_QUERY[NordicComment.header_type], (event_ids,))
     ans = cur.fetchall()
 
     for a in ans:
-        nordic_events[a[-2]].comment_h.append(NordicComment(a))
+        nordic_events[a[-2]].comment_h.append(NordicComment.fromDatabase(a))
 
     cur.execute(SELECT_QUERY[NordicError.header_type], (main_ids, ))
     ans = cur.fetchall()
@@ -244,7 +558,7 @@ def getNordic(event_id, db_conn = None):
     for a in ans:
         for main_h in nordic_events[a[-1]].main_h:
             if main_h.h_id == a[-3]:
-                main_h.error_h = NordicError(a[:-1])
+                main_h.error_h = NordicError.fromDatabase(a)
                 break
 
 
@@ -252,15 +566,244 @@ def getNordic(event_id, db_conn = None):
     ans = cur.fetchall()
 
     for a in ans:
-        nordic_events[a[-2]].waveform_h.append(NordicWaveform(a))
+        nordic_events[a[-2]].waveform_h.append(NordicWaveform.fromDatabase(a))
 
     cur.execute(SELECT_QUERY[NordicData.header_type], (event_ids,))
     ans = cur.fetchall()
 
     for a in ans:
-        nordic_events[a[-2]].data.append(NordicData(a))
+        nordic_events[a[-2]].data.append(NordicData.fromDatabase(a))
 
     if db_conn is None:
         conn.close()
 
     return list(nordic_events.values())
+
+def getNordicJson(event_id, db_conn = None):
+    """
+    Method that reads nordic events like :func:`getNordic` but with a single query. Every event row of the query has its creation info and all of its headers aggregated into json arrays with the error header of a main header as the last value of the main header, so the whole result is fetched with one round trip to the database instead of seven. Use this when the latency to the database is high and only a few events are read at a time.
+
+    :param list int event_id: Event id of the event or list of event_ids
+    :returns: List of NordicEvent objects ordered by the event id or an empty list if none are found
+    """
+    if isinstance(event_id, int):
+        event_ids = tuple([event_id])
+    elif isinstance(event_id, list):
+        event_ids = tuple(event_id)
+    elif isinstance(event_id, tuple):
+        event_ids = event_id
+    else:
+        raise Exception('event_id is not in a integer or list!')
+
+    if len(event_ids) == 0:
+        return []
+
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+    cur = conn.cursor()
+
+    cur.execute(SELECT_NORDIC_JSON, (event_ids,))
+    ans = cur.fetchall()
+
+    if db_conn is None:
+        conn.close()
+
+    nordic_events = []
+    for a in ans:
+        nordic_event = NordicEvent(a[0], a[1], a[2], a[3])
+        nordic_event.creation_info = CreationInfo(a[5], a[2], a[4], a[6], a[7])
+
+        headers = {}
+        for header_class, rows in zip(JSON_HEADER_CLASSES, a[8:]):
+            headers[header_class.header_type] = []
+            for row in (rows or []):
+                if header_class is NordicMain:
+                    error_row = row.pop()
+                    main_h = NordicMain.fromDatabase(jsonRow2Header(row, NordicMain.header_type))
+                    if error_row is not None:
+                        main_h.error_h = NordicError.fromDatabase(jsonRow2Header(error_row, NordicError.header_type))
+                    headers[NordicMain.header_type].append(main_h)
+                else:
+                    headers[header_class.header_type].append(header_class.fromDatabase(jsonRow2Header(row, header_class.header_type)))
+
+        nordic_event.main_h = headers[NordicMain.header_type]
+        nordic_event.macro_h = headers[NordicMacroseismic.header_type]
+        nordic_event.comment_h = headers[NordicComment.header_type]
+        nordic_event.waveform_h = headers[NordicWaveform.header_type]
+        nordic_event.data = headers[NordicData.header_type]
+
+        nordic_events.append(nordic_event)
+
+    return nordic_events
+
+def jsonRow2Header(row, header_type):
+    """
+    Function for converting a header row decoded from json back to the types the row would have when fetched with :data:`SELECT_QUERY`. Json has no date or time types and it writes floats with integer values as integers, so those columns are converted with :data:`JSON_CONVERSIONS`.
+
+    :param list row: header row decoded from json
+    :param int header_type: type of the header
+    :returns: the converted row
+    """
+    for index, conversion in JSON_CONVERSIONS[header_type]:
+        if row[index] is not None:
+            row[index] = conversion(row[index])
+    return row
+
+def iterNordic(event_ids, batch_size = ITER_BATCH_SIZE, db_conn = None):
+    """
+    Generator that reads nordic events with ids in event_ids from the database and yields them one by one as NordicEvent objects. Every table is read through its own named server-side cursor ordered by the event id, so only about batch_size rows of each table are held in memory at once. The events are yielded in the order of their event ids.
+
+    :param list int event_ids: list of event ids
+    :param int batch_size: amount of rows fetched from the database at once from each table
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :returns: generator of NordicEvent objects
+    """
+    event_ids = tuple(event_ids)
+    if len(event_ids) == 0:
+        return
+
+    for nordic_event in iterNordicQueries(sql.SQL(ITER_IDS_FILTER), (event_ids,), batch_size, db_conn):
+        yield nordic_event
+
+def iterNordicFromTable(id_table, batch_size = ITER_BATCH_SIZE, db_conn = None):
+    """
+    Generator that reads the nordic events with ids in the id column of table id_table from the database and yields them one by one as NordicEvent objects like :func:`iterNordic`. The table is joined to the header tables in the database, so the event ids are never sent between the database and python. The table is usually a temporary table, so db_conn has to be the connection that created it.
+
+    :param str id_table: name of the table that has the event ids in its id column
+    :param int batch_size: amount of rows fetched from the database at once from each table
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :returns: generator of NordicEvent objects
+    """
+    event_filter = sql.SQL(ITER_TABLE_FILTER).format(id_table = sql.Identifier(id_table))
+
+    for nordic_event in iterNordicQueries(event_filter, None, batch_size, db_conn):
+        yield nordic_event
+
+def iterNordicQueries(event_filter, query_vals, batch_size, db_conn):
+    """
+    Generator that runs the queries of :data:`ITER_QUERY` with event_filter in place of their event id filter and query_vals through named server-side cursors and yields the NordicEvent objects built from the rows.
+
+    :param psycopg2.sql.Composable event_filter: condition the event ids of the rows are compared with
+    :param tuple query_vals: values given to every query or None
+    :param int batch_size: amount of rows fetched from the database at once from each table
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :returns: generator of NordicEvent objects
+    """
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    cursors = {}
+    try:
+        counter = next(CURSOR_COUNTER)
+        for h_type, query in ITER_QUERY.items():
+            cursors[h_type] = conn.cursor("nordic_iter_{0}_{1}".format(counter, h_type))
+            cursors[h_type].itersize = batch_size
+            cursors[h_type].execute(sql.SQL(query).format(event_filter = event_filter), query_vals)
+
+        headers = {}
+        for h_type in ITER_QUERY.keys():
+            if h_type == 5:
+                headers[h_type] = HeaderRows(cursors[h_type], -1)
+            elif h_type != 0:
+                headers[h_type] = HeaderRows(cursors[h_type], -2)
+
+        creation_infos = {}
+        batch = []
+        for n_event in cursors[0]:
+            batch.append(NordicEvent(n_event[0], n_event[1], n_event[2], n_event[4]))
+            if len(batch) == batch_size:
+                for nordic_event in completeNordics(batch, headers, creation_infos, conn):
+                    yield nordic_event
+                batch = []
+
+        for nordic_event in completeNordics(batch, headers, creation_infos, conn):
+            yield nordic_event
+    finally:
+        for cur in cursors.values():
+            if not cur.closed:
+                cur.close()
+        if db_conn is None:
+            conn.close()
+
+class HeaderRows:
+    """
+    Class for reading the rows of a header cursor ordered by the event id in groups of rows with the same event id.
+
+    :ivar psycopg2.cursor cur: cursor from which the rows are read
+    :ivar int event_id_column: index of the event id in the rows
+    """
+    def __init__(self, cur, event_id_column):
+        self.groups = itertools.groupby(cur, key = lambda row: row[event_id_column])
+        self.pending = None
+
+    def rowsUntil(self, last_id):
+        """
+        Generator that yields (event_id, rows) tuples of all groups with event id smaller or equal to last_id. The first group after last_id is kept for the next call.
+
+        :param int last_id: largest event id that is read
+        :returns: generator of (event_id, list of rows) tuples
+        """
+        while True:
+            if self.pending is None:
+                try:
+                    event_id, rows = next(self.groups)
+                except StopIteration:
+                    return
+                self.pending = (event_id, list(rows))
+
+            if self.pending[0] > last_id:
+                return
+
+            yield self.pending
+            self.pending = None
+
+def completeNordics(nordic_events, headers, creation_infos, conn):
+    """
+    Function for adding the creation info and all headers to a batch of NordicEvent objects that are ordered by their event ids.
+
+    :param list nordic_events: list of NordicEvent objects ordered by the event id
+    :param dict headers: HeaderRows objects with the header type as key
+    :param dict creation_infos: CreationInfo objects that have already been fetched with the creation id as key
+    :param psycopg2.connection conn: connection to the database
+    :returns: the list of NordicEvent objects
+    """
+    if not nordic_events:
+        return nordic_events
+
+    missing_ids = [e.creation_id for e in nordic_events if e.creation_id not in creation_infos]
+    if missing_ids:
+        creation_infos.update(getCreationInfo(missing_ids, conn))
+
+    events = {}
+    for nordic_event in nordic_events:
+        nordic_event.creation_info = creation_infos[nordic_event.creation_id]
+        events[nordic_event.event_id] = nordic_event
+
+    last_id = nordic_events[-1].event_id
+    for h_type in sorted(headers.keys()):
+        for event_id, rows in headers[h_type].rowsUntil(last_id):
+            if event_id not in events:
+                continue
+            nordic_event = events[event_id]
+            for a in rows:
+                if h_type == NordicMain.header_type:
+                    nordic_event.main_h.append(NordicMain.fromDatabase(a))
+                elif h_type == NordicMacroseismic.header_type:
+                    nordic_event.macro_h.append(NordicMacroseismic.fromDatabase(a))
+                elif h_type == NordicComment.header_type:
+                    nordic_event.comment_h.append(NordicComment.fromDatabase(a))
+                elif h_type == NordicError.header_type:
+                    for main_h in nordic_event.main_h:
+                        if main_h.h_id == a[-3]:
+                            main_h.error_h = NordicError.fromDatabase(a)
+                            break
+                elif h_type == NordicWaveform.header_type:
+                    nordic_event.waveform_h.append(NordicWaveform.fromDatabase(a))
+                elif h_type == NordicData.header_type:
+                    nordic_event.data.append(NordicData.fromDatabase(a))
+
+    return nordic_events
@@ -9,7 +9,10 @@ Functions and Classes
 import datetime
 import time
 
+import numpy as np
+
 from nordb.core import usernameUtilities
+from nordb.database import metadataCache
 from nordb.nordic.response import FapResponse, PazResponse
 
 SELECT_RESPONSE_ID =    (
@@ -90,6 +93,18 @@ SELECT_RESPONSE =   (
                     "   )"
                     )
 
+SELECT_SENSOR_CHANGES =  (
+                         "SELECT "
+                         "   sensor.time, sensor.endtime "
+                         "FROM "
+                         "   sensor, sitechan, station "
+                         "WHERE "
+                         "   sensor.sitechan_id = sitechan.id AND "
+                         "   sitechan.station_id = station.id AND "
+                         "   station_code = %s AND "
+                         "   sitechan.channel_code = %s"
+                         )
+
 SELECT_RESPONSES =  (
                     "SELECT "
                     "   response.file_name, response.source, "
@@ -111,7 +126,7 @@ SELECT_FAPS =   (
                 "   response_id IN %(response_ids)s AND "
                 "   fap.fap_id = fap_response.id "
                 "ORDER BY "
-                "   frequency "
+                "   response_id, frequency "
                 )
 
 SELECT_PAZS =   (
@@ -135,7 +150,7 @@ SELECT_ALL_POLES =  (
                     "   pole.paz_id = paz_response.id AND "
                     "   paz_response.response_id = response.id "
                     "ORDER BY "
-                    "   real "
+                    "   response_id, real "
                     )
 
 SELECT_ALL_ZEROS =  (
@@ -148,10 +163,13 @@ SELECT_ALL_ZEROS =  (
                     "   zero.paz_id = paz_response.id AND "
                     "   paz_response.response_id = response.id "
                     "ORDER BY "
-                    "   real"
+                    "   response_id, real"
                     )
 
 
+FAP_COLUMNS = 5
+PAZ_COLUMNS = 4
+
 def responses2instruments(instruments, db_conn = None):
     """
     Function for attaching responses to instrument information
@@ -169,7 +187,7 @@ def responses2instruments(instruments, db_conn = None):
         response_ids.append(instrument.response_id)
 
 
-    response_ids = tuple(response_ids)
+    response_ids = tuple(set(response_ids))
 
     if len(response_ids) == 0:
         if db_conn is None:
@@ -179,55 +197,110 @@ def responses2instruments(instruments, db_conn = None):
     cur = conn.cursor()
 
     cur.execute(SELECT_RESPONSES, {'response_ids':response_ids})
+    response_rows = cur.fetchall()
 
-    ans = cur.fetchall()
-    responses = []
-    response_ids = []
-
-    for a in ans:
-        response_ids.append(a[-1])
+    response_ids = tuple(a[-1] for a in response_rows)
 
-    response_ids = tuple(response_ids)
+    if len(response_ids) == 0:
+        if db_conn is None:
+            conn.close()
+        return
 
     cur.execute(SELECT_FAPS, {'response_ids':response_ids})
-    fap_resp = cur.fetchall()
+    fap_rows = cur.fetchall()
     cur.execute(SELECT_PAZS, {'response_ids':response_ids})
-    paz_resp = cur.fetchall()
+    paz_rows = cur.fetchall()
     cur.execute(SELECT_ALL_POLES, {'response_ids':response_ids})
-    poles_resp = cur.fetchall()
+    pole_rows = cur.fetchall()
     cur.execute(SELECT_ALL_ZEROS, {'response_ids':response_ids})
-    zeros_resp = cur.fetchall()
-
-    for resp in ans:
-        for instrument in instruments:
-            if instrument.response_id == resp[-1]:
-                if resp[4] == 'fap':
-                    faps = []
-                    for f in fap_resp:
-                        if f[-1] == resp[-1]:
-                            faps.append(f[:-1])
-                    instrument.response = FapResponse(resp, faps)
-
-                elif resp[4] == 'paz':
-                    poles = []
-                    zeros = []
-                    for pole in poles_resp:
-                        if pole[-1] == resp[-1]:
-                            poles.append(pole[:-1])
-                    for zero in zeros_resp:
-                        if zero[-1] == resp[-1]:
-                            zeros.append(zero[:-1])
-                    for paz in paz_resp:
-                        if paz[-1] == resp[-1]:
-                            instrument.response = PazResponse(resp,
-                                                            paz[0],
-                                                            poles,
-                                                            zeros)
-                            break
+    zero_rows = cur.fetchall()
+
+    responses = assembleResponses(response_rows, fap_rows, paz_rows, pole_rows, zero_rows)
+
+    for instrument in instruments:
+        if instrument.response_id in responses:
+            instrument.response = responses[instrument.response_id]
 
     if db_conn is None:
         conn.close()
 
+def assembleResponses(response_rows, fap_rows, paz_rows, pole_rows, zero_rows):
+    """
+    Function for creating the response objects out of the rows of SELECT_RESPONSES, SELECT_FAPS, SELECT_PAZS, SELECT_ALL_POLES and SELECT_ALL_ZEROS. The coefficient rows have the response id as the last value and they have to be ordered by it. The coefficients are grouped by the response id in one pass, so the time taken grows linearly with the amount of rows.
+
+    :param list response_rows: rows of the responses
+    :param list fap_rows: rows of the fap coefficients
+    :param list paz_rows: rows of the scale factors of the paz responses
+    :param list pole_rows: rows of the poles
+    :param list zero_rows: rows of the zeros
+    :returns: dict of :class:`PazResponse` and :class:`FapResponse` objects where the key is the id of the response
+    """
+    faps = groupCoefficients(fap_rows, FAP_COLUMNS)
+    poles = groupCoefficients(pole_rows, PAZ_COLUMNS)
+    zeros = groupCoefficients(zero_rows, PAZ_COLUMNS)
+    scale_factors = dict((a[-1], a[0]) for a in paz_rows)
+
+    responses = {}
+    for resp in response_rows:
+        response_id = resp[-1]
+        if resp[FapResponse.RESPONSE_FORMAT] == 'paz' and response_id not in scale_factors:
+            continue
+        responses[response_id] = createResponse(resp,
+                                                faps.get(response_id, []),
+                                                scale_factors.get(response_id),
+                                                poles.get(response_id, []),
+                                                zeros.get(response_id, []))
+
+    return responses
+
+def groupCoefficients(rows, columns):
+    """
+    Function for grouping coefficient rows ordered by the response id into NumPy arrays.
+
+    :param list rows: rows of coefficients where the last value is the response id
+    :param int columns: amount of coefficient values in a row
+    :returns: dict of arrays of shape (n, columns) where the key is the response id
+    """
+    if len(rows) == 0:
+        return {}
+
+    values = np.array(rows, dtype=np.float64)
+    response_ids = values[:, -1].astype(np.int64)
+    starts = np.flatnonzero(np.diff(response_ids)) + 1
+
+    groups = np.split(values[:, :columns], starts)
+    return dict(zip(response_ids[np.concatenate(([0], starts))].tolist(), groups))
+
+def coefficientArray(rows, columns):
+    """
+    Function for turning coefficient rows into a NumPy array of shape (n, columns). Missing values are NaN.
+
+    :param list rows: rows of coefficients
+    :param int columns: amount of coefficient values in a row
+    :returns: NumPy array
+    """
+    return np.asarray(rows, dtype=np.float64).reshape(-1, columns)
+
+def createResponse(response_data, fap, scale_factor, poles, zeros):
+    """
+    Function for creating a response object of the right type with the coefficients as NumPy arrays.
+
+    :param tuple response_data: row of the response
+    :param list fap: fap coefficients of a fap response
+    :param float scale_factor: scale factor of a paz response
+    :param list poles: poles of a paz response
+    :param list zeros: zeros of a paz response
+    :returns: :class:`PazResponse` or :class:`FapResponse` object or None if the format is unknown
+    """
+    if response_data[FapResponse.RESPONSE_FORMAT] == 'fap':
+        return FapResponse(response_data, coefficientArray(fap, FAP_COLUMNS))
+    elif response_data[FapResponse.RESPONSE_FORMAT] == 'paz':
+        return PazResponse(response_data,
+                           scale_factor,
+                           coefficientArray(poles, PAZ_COLUMNS),
+                           coefficientArray(zeros, PAZ_COLUMNS))
+    return None
+
 def getResponseFromDB(response_id, db_conn = None):
     """
     Function for reading a response from database by id
@@ -235,6 +308,10 @@ def getResponseFromDB(response_id, db_conn = None):
     :param int response_id: id of the Response wanted
     :returns: :class:`PazResponse` or :class:`FapResponse` object
     """
+    found, response = metadataCache.cache.get(("response_id", response_id), None)
+    if found:
+        return response
+
     if db_conn is None:
         conn = usernameUtilities.log2nordb()
     else:
@@ -248,12 +325,18 @@ def getResponseFromDB(response_id, db_conn = None):
     response_data = cur.fetchone()
 
     if response_data is None:
+        if db_conn is None:
+            conn.close()
         return None
 
+    fap = []
+    scale_factor = None
+    poles = []
+    zeros = []
+
     if response_data[FapResponse.RESPONSE_FORMAT] == 'fap':
         cur.execute(SELECT_FAP, (response_id,))
         fap = cur.fetchall()
-        response = FapResponse(response_data, fap)
 
     elif response_data[FapResponse.RESPONSE_FORMAT] == 'paz':
         cur.execute(SELECT_PAZ, (response_id,))
@@ -265,8 +348,9 @@ def getResponseFromDB(response_id, db_conn = None):
         cur.execute(SELECT_ZEROS, (response_id,))
         zeros = cur.fetchall()
 
-        response = PazResponse(response_data, scale_factor, poles, zeros)
+    response = createResponse(response_data, fap, scale_factor, poles, zeros)
 
+    metadataCache.cache.put(("response_id", response_id), (None, False, None, False), response)
 
     if db_conn is None:
         conn.close()
@@ -274,29 +358,37 @@ def getResponseFromDB(response_id, db_conn = None):
 
 def getResponse(station, channel, date=datetime.datetime.now(), db_conn = None):
     """
-    Function for getting response information from the database.
+    Function for getting response information from the database. The responses are cached in :mod:`metadataCache` for the time interval in which no sensor of the channel starts or ends.
 
     :param string station: Station code of the station
     :param string channel: Channel code of the channel
     :param datetime date: date for which you want the response
     :returns: Response object
     """
+    timestamp = metadataCache.date2timestamp(date)
+
+    found, response = metadataCache.cache.get(("response", station, channel), timestamp)
+    if found:
+        return response
+
     if db_conn is None:
         conn = usernameUtilities.log2nordb()
     else:
         conn = db_conn
     cur = conn.cursor()
 
-    timestamp = time.mktime(date.timetuple())
-
     cur.execute(SELECT_RESPONSE, (station, channel, timestamp, timestamp,
                                   timestamp))
     resp_id = cur.fetchone()
 
     if resp_id is None:
-        return None
+        response = None
+    else:
+        response = getResponseFromDB(resp_id[0], conn)
 
-    response = getResponseFromDB(resp_id[0], conn)
+    cur.execute(SELECT_SENSOR_CHANGES, (station, channel))
+    interval = metadataCache.validityInterval(timestamp, [(start, end, True) for start, end in cur.fetchall()])
+    metadataCache.cache.put(("response", station, channel), interval, response)
 
     if db_conn is None:
         conn.close()
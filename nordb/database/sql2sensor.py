@@ -79,14 +79,17 @@ def allSensors2Sitechans(sitechans, db_conn = None):
 
     ans = cur.fetchall()
 
+    sitechans_by_id = {}
+    for chan in sitechans:
+        sitechans_by_id.setdefault(chan.s_id, []).append(chan)
+
     sensors = []
 
     for a in ans:
         sensor = Sensor(a[:-1])
         sensors.append(sensor)
-        for chan in sitechans:
-            if chan.s_id == sensor.channel_id:
-                chan.sensors.append(sensor)
+        for chan in sitechans_by_id.get(sensor.channel_id, []):
+            chan.sensors.append(sensor)
 
     if len(ans) != 0:
         sql2instrument.instruments2sensors( sensors,
@@ -121,14 +124,17 @@ def sensors2sitechans(sitechans, station_date=datetime.datetime.now(), db_conn =
 
     ans = cur.fetchall()
 
+    sitechans_by_id = {}
+    for chan in sitechans:
+        sitechans_by_id.setdefault(chan.s_id, []).append(chan)
+
     sensors = []
 
     for a in ans:
         sensor = Sensor(a[:-1])
         sensors.append(sensor)
-        for chan in sitechans:
-            if chan.s_id == sensor.channel_id:
-                chan.sensors.append(sensor)
+        for chan in sitechans_by_id.get(sensor.channel_id, []):
+            chan.sensors.append(sensor)
 
     if len(ans) != 0:
         sql2instrument.instruments2sensors( sensors,
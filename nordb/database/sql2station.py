@@ -5,11 +5,13 @@ Functions and Classes
 ---------------------
 """
 
+import copy
 import datetime
 import psycopg2
-import numpy
 
 from nordb.database import sql2sitechan
+from nordb.database import metadataCache
+from nordb.database import spatialSearch
 from nordb.nordic.station import Station
 from nordb.core import usernameUtilities
 from nordb.core.utils import addFloat2String
@@ -43,19 +45,13 @@ SELECT_ALL_STATIONS =   (
                         )
 
 SELECT_STATIONS_NEAR_POINT =    (
-                                "SELECT "
-                                "   id "
                                 "FROM "
                                 "   station "
                                 "WHERE "
-                                "   ABS(latitude - %(p_lat)s) <= %(lat_diff)s "
-                                "AND "
-                                "   ABS(longitude - %(p_lon)s) <= %(lon_diff)s "
-                                "AND "
                                 "   ( "
-                                "       (on_date <= %(station_date)s AND off_date >= %(station_date)s) "
+                                "       (on_date <= %s AND off_date >= %s) "
                                 "   OR "
-                                "       (on_date <= %(station_date)s AND off_date IS NULL) "
+                                "       (on_date <= %s AND off_date IS NULL) "
                                 "   ) "
                                 )
 
@@ -79,25 +75,19 @@ SELECT_STATIONS_ID =   (
                         "   network_id = network.id "
                     )
 
-SELECT_STATIONS_CODE =  (
-                        "SELECT "
-                        "   station_code, on_date, off_date, latitude, "
-                        "   longitude, elevation, station_name, station_type, "
-                        "   reference_station, north_offset, east_offset, "
-                        "   load_date, network.network, network_id, station.id "
-                        "FROM "
-                        "   station, network "
-                        "WHERE "
-                        "   station_code in %(station_codes)s "
-                        "AND "
-                        "   ( "
-                        "       (on_date <= %(station_date)s AND off_date >= %(station_date)s) "
-                        "   OR "
-                        "       (on_date <=%(station_date)s AND off_date IS NULL) "
-                        "   ) "
-                        "AND "
-                        "   network_id = network.id "
-                        )
+SELECT_ALL_STATIONS_CODE =   (
+                            "SELECT "
+                            "   station_code, on_date, off_date, latitude, "
+                            "   longitude, elevation, station_name, station_type, "
+                            "   reference_station, north_offset, east_offset, "
+                            "   load_date, network.network, network_id, station.id "
+                            "FROM "
+                            "   station, network "
+                            "WHERE "
+                            "   station_code IN %(station_codes)s "
+                            "AND "
+                            "   network_id = network.id "
+                            )
 
 ALL_STATION_CODES = (
                     "SELECT "
@@ -224,6 +214,9 @@ def getStations(station_ids, station_date = datetime.datetime.now(), db_conn = N
     if len(station_ids) == 0:
         return []
 
+    if isinstance(station_ids[0], str):
+        return getStationsByCode(station_ids, station_date, db_conn)
+
     if db_conn is None:
         conn = usernameUtilities.log2nordb()
     else:
@@ -234,12 +227,8 @@ def getStations(station_ids, station_date = datetime.datetime.now(), db_conn = N
     if isinstance(station_ids, type([])):
         station_ids = tuple(station_ids)
 
-    if isinstance(station_ids[0], str):
-        cur.execute(SELECT_STATIONS_CODE, { 'station_codes':station_ids,
-                                            'station_date':station_date})
-    else:
-        cur.execute(SELECT_STATIONS_ID, {'station_ids':station_ids,
-                                         'station_date':station_date})
+    cur.execute(SELECT_STATIONS_ID, {'station_ids':station_ids,
+                                     'station_date':station_date})
 
     ans = cur.fetchall()
 
@@ -260,36 +249,193 @@ def getStations(station_ids, station_date = datetime.datetime.now(), db_conn = N
 
     return list(stations.values())
 
-def getStation(station_id, station_date = datetime.datetime.now(), db_conn = None):
+def getStationsByCode(station_codes, station_date = datetime.datetime.now(), db_conn = None):
     """
-    Function for reading a station from database by id or code and datetime.
+    Function that returns all stations with station code in station_codes to the user.
 
-    :param int,str station_id: id of the station wanted or the station code of the station
-    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :param Array station_codes: array of station codes to be fetched
     :param datetime station_date: date for which the station info will be taken
-    :returns: Station object
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :returns: Array of Station objects in the order of the codes
+    """
+    codes = list(dict.fromkeys(station_codes))
+    lookups = getStationsAtDates([(code, station_date) for code in codes], db_conn)
+
+    return [stat for stations in lookups for stat in stations]
+
+def getStationsOfEvents(nordic_events, db_conn = None):
     """
+    Function for getting the stations of all picks of the events at the origin times of the events. All stations are fetched with a constant amount of queries through one connection.
+
+    :param Array nordic_events: array of NordicEvent objects
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :returns: array of arrays of Station objects in the order of the events and in the order in which the stations appear in the picks of the event
+    """
+    lookups = []
+    event_codes = []
+    for nordic_event in nordic_events:
+        codes = list(dict.fromkeys(pick.station_code for pick in nordic_event.data))
+        origin_time = nordic_event.getOriginTime().val
+        lookups.extend((code, origin_time) for code in codes)
+        event_codes.append(len(codes))
+
+    lookup_stations = getStationsAtDates(lookups, db_conn)
+
+    event_stations = []
+    start = 0
+    for code_count in event_codes:
+        event_stations.append([stat for stations in lookup_stations[start:start + code_count]
+                                    for stat in stations])
+        start += code_count
+
+    return event_stations
+
+def getStationsAtDates(lookups, db_conn = None):
+    """
+    Function for getting the stations of station codes at given dates. The stations of every code are cached in :mod:`metadataCache` for the time interval in which none of the stations, sitechans or sensors of the code opens or closes. The codes that are not in the cache are fetched from the database with all of their stations, sitechans and sensors in one go, so the amount of queries doesn't depend on the amount of lookups.
+
+    :param Array lookups: array of (station_code, date) tuples
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :returns: array of arrays of Station objects in the order of the lookups
+    """
+    results = [None] * len(lookups)
+    missing = []
+    for i, (code, station_date) in enumerate(lookups):
+        found, stations = metadataCache.cache.get(("station", code),
+                                                  metadataCache.date2datetime(station_date))
+        if found:
+            results[i] = stations
+        else:
+            missing.append(i)
+
+    if not missing:
+        return results
+
     if db_conn is None:
         conn = usernameUtilities.log2nordb()
     else:
         conn = db_conn
+
     cur = conn.cursor()
 
-    temp = getStations([station_id], station_date, db_conn=conn)
+    codes = tuple(sorted(set(lookups[i][0] for i in missing)))
+    cur.execute(SELECT_ALL_STATIONS_CODE, {'station_codes':codes})
 
-    if len(temp) == 0:
-        stat = None
-    else:
-        stat = temp[0]
+    stations = {}
+    for a in cur.fetchall():
+        stations[a[-1]] = Station(a)
+
+    if len(stations.keys()) != 0:
+        sql2sitechan.allSitechans2Stations(stations, db_conn=conn)
 
     if db_conn is None:
         conn.close()
 
+    histories = {}
+    for stat in stations.values():
+        histories.setdefault(stat.station_code, []).append(stat)
+
+    computed = {}
+    for i in missing:
+        code, station_date = lookups[i]
+        moment = metadataCache.date2datetime(station_date)
+
+        for interval, code_stations in computed.get(code, []):
+            if metadataCache.inInterval(moment, interval):
+                results[i] = code_stations
+                break
+        else:
+            history = histories.get(code, [])
+            code_stations = [stat for stat in (stationAtDate(stat, moment) for stat in history) if stat is not None]
+            interval = metadataCache.validityInterval(moment, stationHistoryRows(history))
+            metadataCache.cache.put(("station", code), interval, code_stations)
+            computed.setdefault(code, []).append((interval, code_stations))
+            results[i] = code_stations
+
+    return results
+
+def isOpen(on_date, off_date, moment):
+    """
+    Function for checking if a station or a sitechan with on_date and off_date is open at moment.
+
+    :param date on_date: the date when the station was opened
+    :param date off_date: the date when the station was closed or None
+    :param datetime moment: the moment
+    :returns: True or False
+    """
+    if on_date is None or metadataCache.date2datetime(on_date) > moment:
+        return False
+    return off_date is None or metadataCache.date2datetime(off_date) >= moment
+
+def stationAtDate(station, moment):
+    """
+    Function for getting a copy of a station with all of its sitechans and sensors from :func:`sql2sitechan.allSitechans2Stations` with only the sitechans and sensors that are valid at moment. The validity is the same as in the station, sitechan and sensor queries of :func:`getStations`.
+
+    :param Station station: station with all of its sitechans and sensors
+    :param datetime moment: the moment
+    :returns: Station object or None if the station is not open at moment
+    """
+    if not isOpen(station.on_date, station.off_date, moment):
+        return None
+
+    unix_time = metadataCache.date2timestamp(moment)
+
+    stat = copy.copy(station)
+    stat.sitechans = []
+    for chan in station.sitechans:
+        if not isOpen(chan.on_date, chan.off_date, moment):
+            continue
+        new_chan = copy.copy(chan)
+        new_chan.sensors = [sen for sen in chan.sensors
+                                if sen.time is not None and sen.endtime is not None and
+                                   sen.time <= unix_time and
+                                   (sen.endtime >= unix_time or sen.endtime == 9999999999.999)]
+        stat.sitechans.append(new_chan)
+
     return stat
 
+def stationHistoryRows(stations):
+    """
+    Function for getting the rows of opening and closing times of stations, their sitechans and sensors for :func:`metadataCache.validityInterval`.
+
+    :param Array stations: array of stations with all of their sitechans and sensors
+    :returns: array of (start, end, end_inclusive) tuples
+    """
+    rows = []
+    sensor_rows = []
+    for stat in stations:
+        for item in [stat] + stat.sitechans:
+            if item.on_date is None:
+                continue
+            off_date = item.off_date
+            if off_date is not None:
+                off_date = metadataCache.date2datetime(off_date)
+            rows.append((metadataCache.date2datetime(item.on_date), off_date, True))
+        for chan in stat.sitechans:
+            sensor_rows.extend((sen.time, sen.endtime) for sen in chan.sensors)
+
+    rows.extend(metadataCache.sensorRows2Datetimes(sensor_rows))
+    return rows
+
+def getStation(station_id, station_date = datetime.datetime.now(), db_conn = None):
+    """
+    Function for reading a station from database by id or code and datetime.
+
+    :param int,str station_id: id of the station wanted or the station code of the station
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :param datetime station_date: date for which the station info will be taken
+    :returns: Station object
+    """
+    temp = getStations([station_id], station_date, db_conn=db_conn)
+
+    if len(temp) == 0:
+        return None
+
+    return temp[0]
+
 def getStationsNearPoint(latitude, longitude, radius = 10.0, station_date = datetime.datetime.now(), db_conn = None):
     """
-    Function for getting all stations that are less than radius away from point (latitude, longitude) radius is in kilometers.
+    Function for getting all stations that are less than radius away from point (latitude, longitude) radius is in kilometers. The distance is the great-circle distance between the station and the point.
 
     :param float latitude: latitude of the point
     :param float lognitude: longitude of the point
@@ -304,13 +450,9 @@ def getStationsNearPoint(latitude, longitude, radius = 10.0, station_date = date
 
     cur = conn.cursor()
 
-    lat_diff = radius*(1/110.574)
-    lon_diff = radius*(1/(111.320*numpy.cos(numpy.radians(latitude))))
-    cur.execute(SELECT_STATIONS_NEAR_POINT, {'p_lat':latitude,
-                                             'lat_diff':lat_diff,
-                                             'p_lon':longitude,
-                                             'lon_diff':lon_diff,
-                                             'station_date':station_date})
+    criteria, values = spatialSearch.radiusQuery("latitude", "longitude", latitude, longitude, radius)
+    cur.execute("SELECT id " + SELECT_STATIONS_NEAR_POINT + "AND " + criteria,
+                [station_date]*3 + values)
 
     ans = cur.fetchall()
     stations = []
@@ -328,3 +470,40 @@ def getStationsNearPoint(latitude, longitude, radius = 10.0, station_date = date
         conn.close()
 
     return stations
+
+def getNearestStations(latitude, longitude, count = 1, station_date = datetime.datetime.now(), db_conn = None):
+    """
+    Function for getting the stations closest to the point (latitude, longitude).
+
+    :param float latitude: latitude of the point
+    :param float lognitude: longitude of the point
+    :param int count: maximum amount of stations returned. Defaults to 1
+    :param datetime station_date: date for the station fetching. Defaults to this date
+    :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
+    :returns: list of Station objects ordered by the distance
+    """
+    if db_conn is None:
+        conn = usernameUtilities.log2nordb()
+    else:
+        conn = db_conn
+
+    cur = conn.cursor()
+
+    ans = spatialSearch.searchNearestIds(   cur,
+                                            "id",
+                                            SELECT_STATIONS_NEAR_POINT,
+                                            [station_date]*3,
+                                            "latitude",
+                                            "longitude",
+                                            latitude,
+                                            longitude,
+                                            count)
+
+    stations = {}
+    for stat in getStations([a[0] for a in ans], station_date, db_conn=conn):
+        stations[stat.s_id] = stat
+
+    if db_conn is None:
+        conn.close()
+
+    return [stations[a[0]] for a in ans if a[0] in stations]
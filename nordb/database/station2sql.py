@@ -11,6 +11,7 @@ import unidecode
 
 from nordb.nordic.station import Station
 from nordb.core import usernameUtilities
+from nordb.database import metadataCache
 from nordb.database import creationInfo
 
 STATION_INSERT =    (
@@ -78,6 +79,7 @@ def closeStationInDB(station_id, off_date, db_conn = None):
         cur.execute("UPDATE station SET off_date = %s WHERE id = %s", (off_date, station_id))
 
     conn.commit()
+    metadataCache.invalidate()
     if db_conn is None:
         conn.close()
 
@@ -139,4 +141,5 @@ def insertStation2Database(station, network, privacy_level = 'public'):
         raise e
 
     conn.commit()
+    metadataCache.invalidate()
     conn.close()
@@ -32,6 +32,12 @@ class NordicComment:
     EVENT_ID = 1
     H_ID = 2
 
+    __slots__ = (
+                 '_h_comment',
+                 'event_id',
+                 'h_id',
+                )
+
     def __init__(self, header = None):
         if header is None:
             self.h_comment = None
@@ -42,6 +48,21 @@ class NordicComment:
             self.event_id = header[self.EVENT_ID]
             self.h_id = header[self.H_ID]
 
+    @classmethod
+    def fromDatabase(cls, header):
+        """
+        Create a NordicComment object from a row fetched from the database without validating the values again. Only use this for values that come from the database, all other values have to go through the normal constructor.
+
+        :param list header: values of the header in the same order as in the normal constructor
+        :returns: NordicComment object
+        """
+        comment = cls.__new__(cls)
+        comment._h_comment = header[cls.H_COMMENT]
+        comment.event_id = header[cls.EVENT_ID]
+        comment.h_id = header[cls.H_ID]
+
+        return comment
+
     h_comment = property(operator.attrgetter('_h_comment'), doc="")
 
     @h_comment.setter
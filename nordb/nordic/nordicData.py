@@ -84,6 +84,30 @@ class NordicData:
     EVENT_ID = 19
     D_ID = 20
 
+    __slots__ = (
+                 '_station_code',
+                 '_sp_instrument_type',
+                 '_sp_component',
+                 '_quality_indicator',
+                 '_phase_type',
+                 '_weight',
+                 '_first_motion',
+                 '_observation_time',
+                 '_signal_duration',
+                 '_max_amplitude',
+                 '_max_amplitude_period',
+                 '_back_azimuth',
+                 '_apparent_velocity',
+                 '_signal_to_noise',
+                 '_azimuth_residual',
+                 '_travel_time_residual',
+                 '_location_weight',
+                 '_epicenter_distance',
+                 '_epicenter_to_station_azimuth',
+                 'event_id',
+                 'd_id',
+                )
+
     def __init__(self, data=None):
         if data is None:
             self.station_code = None
@@ -130,6 +154,39 @@ class NordicData:
             self.event_id = data[self.EVENT_ID]
             self.d_id = data[self.D_ID]
 
+    @classmethod
+    def fromDatabase(cls, data):
+        """
+        Create a NordicData object from a row fetched from the database without validating the values again. Only use this for values that come from the database, all other values have to go through the normal constructor.
+
+        :param list data: values of the phase data in the same order as in the normal constructor
+        :returns: NordicData object
+        """
+        phase_data = cls.__new__(cls)
+        phase_data._station_code = data[cls.STATION_CODE]
+        phase_data._sp_instrument_type = data[cls.SP_INSTRUMENT_TYPE]
+        phase_data._sp_component = data[cls.SP_COMPONENT]
+        phase_data._quality_indicator = data[cls.QUALITY_INDICATOR]
+        phase_data._phase_type = data[cls.PHASE_TYPE]
+        phase_data._weight = data[cls.WEIGHT]
+        phase_data._first_motion = data[cls.FIRST_MOTION]
+        phase_data._observation_time = data[cls.OBSERVATION_TIME]
+        phase_data._signal_duration = data[cls.SIGNAL_DURATION]
+        phase_data._max_amplitude = data[cls.MAX_AMPLITUDE]
+        phase_data._max_amplitude_period = data[cls.MAX_AMPLITUDE_PERIOD]
+        phase_data._back_azimuth = data[cls.BACK_AZIMUTH]
+        phase_data._apparent_velocity = data[cls.APPARENT_VELOCITY]
+        phase_data._signal_to_noise = data[cls.SIGNAL_TO_NOISE]
+        phase_data._azimuth_residual = data[cls.AZIMUTH_RESIDUAL]
+        phase_data._travel_time_residual = data[cls.TRAVEL_TIME_RESIDUAL]
+        phase_data._location_weight = data[cls.LOCATION_WEIGHT]
+        phase_data._epicenter_distance = data[cls.EPICENTER_DISTANCE]
+        phase_data._epicenter_to_station_azimuth = data[cls.EPICENTER_TO_STATION_AZIMUTH]
+        phase_data.event_id = data[cls.EVENT_ID]
+        phase_data.d_id = data[cls.D_ID]
+
+        return phase_data
+
     station_code = property(operator.attrgetter('_station_code'), doc="")
 
     @station_code.setter
@@ -47,6 +47,17 @@ class NordicError:
     HEADER_ID = 6
     H_ID = 7
 
+    __slots__ = (
+                 '_gap',
+                 '_second_error',
+                 '_epicenter_latitude_error',
+                 '_epicenter_longitude_error',
+                 '_depth_error',
+                 '_magnitude_error',
+                 'header_id',
+                 'h_id',
+                )
+
     def __init__(self, header = None):
         if header is None:
             self.gap = None
@@ -67,6 +78,26 @@ class NordicError:
             self.header_id = header[self.HEADER_ID]
             self.h_id = header[self.H_ID]
 
+    @classmethod
+    def fromDatabase(cls, header):
+        """
+        Create a NordicError object from a row fetched from the database without validating the values again. Only use this for values that come from the database, all other values have to go through the normal constructor.
+
+        :param list header: values of the header in the same order as in the normal constructor
+        :returns: NordicError object
+        """
+        error = cls.__new__(cls)
+        error._gap = header[cls.GAP]
+        error._second_error = header[cls.SECOND_ERROR]
+        error._epicenter_latitude_error = header[cls.EPICENTER_LATITUDE_ERROR]
+        error._epicenter_longitude_error = header[cls.EPICENTER_LONGITUDE_ERROR]
+        error._depth_error = header[cls.DEPTH_ERROR]
+        error._magnitude_error = header[cls.MAGNITUDE_ERROR]
+        error.header_id = header[cls.HEADER_ID]
+        error.h_id = header[cls.H_ID]
+
+        return error
+
     gap = property(operator.attrgetter('_gap'), doc="")
 
     @gap.setter
@@ -15,7 +15,7 @@ from nordb.core.validationTools import validateDate
 from nordb.core.nordic2quakeml import nordicEvents2QuakeML
 from nordb.core.nordic2sc3 import nordicEvents2SC3
 from nordb.database.nordic2sql import event2Database
-from nordb.database.sql2station import getStation
+from nordb.database.sql2station import getStationsOfEvents
 
 from nordb.nordic.misc import CreationInfo
 from nordb.nordic.misc import Magnitude
@@ -251,23 +251,14 @@ class NordicEvent:
         """
         event2Database(self, solution_type, filename, creation_id, e_id)
 
-    def getStations(self):
+    def getStations(self, db_conn = None):
         """
-        Get all stations as an array that are in the data array of this event
+        Get all stations as an array that are in the data array of this event. The stations are in the order in which they appear in the data array. Use :func:`sql2station.getStationsOfEvents` for getting the stations of several events at once.
 
+        :param psycopg2.connection db_conn: Existing connection to the database. Defaults to None
         :returns: array of Station objects
         """
-        stations = []
-        stat_codes = []
-        for pick in self.data:
-            if pick.station_code not in stat_codes:
-                stat_codes.append(pick.station_code)
-
-        for stat_code in stat_codes:
-            stations.append(getStation(stat_code,
-                                       self.getOriginTime().val))
-
-        return [stat for stat in stations if stat is not None]
+        return getStationsOfEvents([self], db_conn)[0]
 
     def getHeaderString(self, *args):
         """
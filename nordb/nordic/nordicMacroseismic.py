@@ -89,6 +89,31 @@ class NordicMacroseismic:
     EVENT_ID = 20
     H_ID = 21
 
+    __slots__ = (
+                 '_description',
+                 '_diastrophism_code',
+                 '_tsunami_code',
+                 '_seiche_code',
+                 '_cultural_effects',
+                 '_unusual_effects',
+                 '_maximum_observed_intensity',
+                 '_maximum_intensity_qualifier',
+                 '_intensity_scale',
+                 '_macroseismic_latitude',
+                 '_macroseismic_longitude',
+                 '_macroseismic_magnitude',
+                 '_type_of_magnitude',
+                 '_logarithm_of_radius',
+                 '_logarithm_of_area_1',
+                 '_bordering_intensity_1',
+                 '_logarithm_of_area_2',
+                 '_bordering_intensity_2',
+                 '_quality_rank',
+                 '_reporting_agency',
+                 'event_id',
+                 'h_id',
+                )
+
     def __init__(self, header = None):
         if header is None:
             self.description = None
@@ -137,6 +162,40 @@ class NordicMacroseismic:
             self.event_id = header[self.EVENT_ID]
             self.h_id = header[self.H_ID]
 
+    @classmethod
+    def fromDatabase(cls, header):
+        """
+        Create a NordicMacroseismic object from a row fetched from the database without validating the values again. Only use this for values that come from the database, all other values have to go through the normal constructor.
+
+        :param list header: values of the header in the same order as in the normal constructor
+        :returns: NordicMacroseismic object
+        """
+        macro = cls.__new__(cls)
+        macro._description = header[cls.DESCRIPTION]
+        macro._diastrophism_code = header[cls.DIASTROPHISM_CODE]
+        macro._tsunami_code = header[cls.TSUNAMI_CODE]
+        macro._seiche_code = header[cls.SEICHE_CODE]
+        macro._cultural_effects = header[cls.CULTURAL_EFFECTS]
+        macro._unusual_effects = header[cls.UNUSUAL_EFFECTS]
+        macro._maximum_observed_intensity = header[cls.MAXIMUM_OBSERVED_INTENSITY]
+        macro._maximum_intensity_qualifier = header[cls.MAXIMUM_INTENSITY_QUALIFIER]
+        macro._intensity_scale = header[cls.INTENSITY_SCALE]
+        macro._macroseismic_latitude = header[cls.MACROSEISMIC_LATITUDE]
+        macro._macroseismic_longitude = header[cls.MACROSEISMIC_LONGITUDE]
+        macro._macroseismic_magnitude = header[cls.MACROSEISMIC_MAGNITUDE]
+        macro._type_of_magnitude = header[cls.TYPE_OF_MAGNITUDE]
+        macro._logarithm_of_radius = header[cls.LOGARITHM_OF_RADIUS]
+        macro._logarithm_of_area_1 = header[cls.LOGARITHM_OF_AREA_1]
+        macro._bordering_intensity_1 = header[cls.BORDERING_INTENSITY_1]
+        macro._logarithm_of_area_2 = header[cls.LOGARITHM_OF_AREA_2]
+        macro._bordering_intensity_2 = header[cls.BORDERING_INTENSITY_2]
+        macro._quality_rank = header[cls.QUALITY_RANK]
+        macro._reporting_agency = header[cls.REPORTING_AGENCY]
+        macro.event_id = header[cls.EVENT_ID]
+        macro.h_id = header[cls.H_ID]
+
+        return macro
+
     description = property(operator.attrgetter('_description'), doc="")
 
     @description.setter
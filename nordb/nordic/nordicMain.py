@@ -99,6 +99,34 @@ class NordicMain:
     EVENT_ID = 22
     H_ID = 23
 
+    __slots__ = (
+                 '_error_h',
+                 '_origin_time',
+                 '_origin_date',
+                 '_location_model',
+                 '_distance_indicator',
+                 '_event_desc_id',
+                 '_epicenter_latitude',
+                 '_epicenter_longitude',
+                 '_depth',
+                 '_depth_control',
+                 '_locating_indicator',
+                 '_epicenter_reporting_agency',
+                 '_stations_used',
+                 '_rms_time_residuals',
+                 '_magnitude_1',
+                 '_type_of_magnitude_1',
+                 '_magnitude_reporting_agency_1',
+                 '_magnitude_2',
+                 '_type_of_magnitude_2',
+                 '_magnitude_reporting_agency_2',
+                 '_magnitude_3',
+                 '_type_of_magnitude_3',
+                 '_magnitude_reporting_agency_3',
+                 'event_id',
+                 'h_id',
+                )
+
     def __init__(self, header=None, error_h = None):
         self.error_h = error_h
         if header is None:
@@ -152,6 +180,43 @@ class NordicMain:
             self.event_id = header[self.EVENT_ID]
             self.h_id = header[self.H_ID]
 
+    @classmethod
+    def fromDatabase(cls, header):
+        """
+        Create a NordicMain object from a row fetched from the database without validating the values again. Only use this for values that come from the database, all other values have to go through the normal constructor.
+
+        :param list header: values of the header in the same order as in the normal constructor
+        :returns: NordicMain object
+        """
+        main = cls.__new__(cls)
+        main._error_h = None
+        main._origin_time = header[cls.ORIGIN_TIME]
+        main._origin_date = header[cls.ORIGIN_DATE]
+        main._location_model = header[cls.LOCATION_MODEL]
+        main._distance_indicator = header[cls.DISTANCE_INDICATOR]
+        main._event_desc_id = header[cls.EVENT_DESC_ID]
+        main._epicenter_latitude = header[cls.EPICENTER_LATITUDE]
+        main._epicenter_longitude = header[cls.EPICENTER_LONGITUDE]
+        main._depth = header[cls.DEPTH]
+        main._depth_control = header[cls.DEPTH_CONTROL]
+        main._locating_indicator = header[cls.LOCATING_INDICATOR]
+        main._epicenter_reporting_agency = header[cls.EPICENTER_REPORTING_AGENCY]
+        main._stations_used = header[cls.STATIONS_USED]
+        main._rms_time_residuals = header[cls.RMS_TIME_RESIDUALS]
+        main._magnitude_1 = header[cls.MAGNITUDE_1]
+        main._type_of_magnitude_1 = header[cls.TYPE_OF_MAGNITUDE_1]
+        main._magnitude_reporting_agency_1 = header[cls.MAGNITUDE_REPORTING_AGENCY_1]
+        main._magnitude_2 = header[cls.MAGNITUDE_2]
+        main._type_of_magnitude_2 = header[cls.TYPE_OF_MAGNITUDE_2]
+        main._magnitude_reporting_agency_2 = header[cls.MAGNITUDE_REPORTING_AGENCY_2]
+        main._magnitude_3 = header[cls.MAGNITUDE_3]
+        main._type_of_magnitude_3 = header[cls.TYPE_OF_MAGNITUDE_3]
+        main._magnitude_reporting_agency_3 = header[cls.MAGNITUDE_REPORTING_AGENCY_3]
+        main.event_id = header[cls.EVENT_ID]
+        main.h_id = header[cls.H_ID]
+
+        return main
+
     error_h = property(operator.attrgetter('_error_h'), doc="")
 
     @error_h.setter
@@ -32,6 +32,12 @@ class NordicWaveform:
     EVENT_ID = 1
     H_ID = 2
 
+    __slots__ = (
+                 '_waveform_info',
+                 'event_id',
+                 'h_id',
+                )
+
     def __init__(self, header = None):
         if header is None:
             self.waveform_info = None
@@ -42,6 +48,21 @@ class NordicWaveform:
             self.event_id = header[self.EVENT_ID]
             self.h_id = header[self.H_ID]
 
+    @classmethod
+    def fromDatabase(cls, header):
+        """
+        Create a NordicWaveform object from a row fetched from the database without validating the values again. Only use this for values that come from the database, all other values have to go through the normal constructor.
+
+        :param list header: values of the header in the same order as in the normal constructor
+        :returns: NordicWaveform object
+        """
+        waveform = cls.__new__(cls)
+        waveform._waveform_info = header[cls.WAVEFORM_INFO]
+        waveform.event_id = header[cls.EVENT_ID]
+        waveform.h_id = header[cls.H_ID]
+
+        return waveform
+
     waveform_info = property(operator.attrgetter('_waveform_info'), doc="")
 
     @waveform_info.setter
@@ -139,7 +139,7 @@ class PazResponse(Response):
 
     :ivar float scale_factor: scale factor of the response
     :ivar Array poles: array of all the poles in the response. Poles are arrays of floats and contain the imaginary value of the pole and the error of the pole
-    :ivar Array zeros: array of all the zeros in the response. Poles are arrays of floats and contain the imaginary value of the zero and the error of the zero
+    :ivar Array zeros: array of all the zeros in the response. Poles are arrays of floats and contain the imaginary value of the zero and the error of the zero. Responses read from the database have the poles and zeros as NumPy arrays of shape (n, 4)
     """
     def __init__(self, response_data = None, scale_factor=None, poles=[], zeros=[]):
         Response.__init__(self, response_data)
@@ -198,7 +198,7 @@ class FapResponse(Response):
     """
     Class for frequency, amplitude and phase type response. Inherits Response class.
 
-    :ivar Array fap: an array of five float values which contain the frequency, amplitude, phase, amplitude_error, phase_error in that order
+    :ivar Array fap: an array of five float values which contain the frequency, amplitude, phase, amplitude_error, phase_error in that order. Responses read from the database have the values as a NumPy array of shape (n, 5)
     """
     def __init__(self, response_data = None, fap = []):
         Response.__init__(self, response_data)
@@ -10,6 +10,10 @@ def init():
     global database_settings
     database_settings = {}
     global active_database
+    global pool_min_size
+    pool_min_size = 1
+    global pool_max_size
+    pool_max_size = 10
     try:
         config_file = open(config_file_name, 'r').readlines()
     except:
@@ -24,6 +28,18 @@ def init():
         if line[:len("Active database:")] == "Active database:":
             active_database = line[len("Active database:"):].strip()
 
+        elif line[:len("Pool minimum size:")] == "Pool minimum size:":
+            try:
+                pool_min_size = int(line[len("Pool minimum size:"):].strip())
+            except ValueError:
+                raise Exception("Pool minimum size not in correct format")
+
+        elif line[:len("Pool maximum size:")] == "Pool maximum size:":
+            try:
+                pool_max_size = int(line[len("Pool maximum size:"):].strip())
+            except ValueError:
+                raise Exception("Pool maximum size not in correct format")
+
         elif read_info == 5:
             if line[:len("host_port:")] == "host_port:":
                 database_config["port"] = line[len("host_port:"):].strip()
@@ -79,6 +95,9 @@ def init():
             read_name = None
             database_config = {}
 
+    if pool_min_size < 0 or pool_max_size < 1 or pool_min_size > pool_max_size:
+        raise Exception("Connection pool sizes are not valid! (min: {0}, max: {1})".format(pool_min_size, pool_max_size))
+
 def updateUsername():
     init()
 
@@ -0,0 +1,29 @@
+/*
++------------------------+
+|CREATION INFO VISIBILITY|
++------------------------+
+
+This file contains the functions the row level security policies use for 
+finding out which creation infos the current user is allowed to see. The 
+policies compare the creation id of their row to the set returned by these 
+functions with IN, so the set is computed once per query and kept in a hash 
+table instead of looking up the privacy setting and owner of the creation 
+info again for every row. The functions are simple enough for the planner to 
+inline them. All commands can be run again against an existing database when 
+migrating it.
+*/
+
+--Ids of the creation infos that are public, secure or owned by the current user
+CREATE OR REPLACE FUNCTION visible_creation_ids() RETURNS SETOF INTEGER AS $$
+    SELECT id FROM creation_info WHERE privacy_setting != 'private' OR owner = current_user;
+$$ LANGUAGE SQL STABLE;
+
+--Ids of the creation infos that are public or secure
+CREATE OR REPLACE FUNCTION non_private_creation_ids() RETURNS SETOF INTEGER AS $$
+    SELECT id FROM creation_info WHERE privacy_setting != 'private';
+$$ LANGUAGE SQL STABLE;
+
+--Ids of the public creation infos
+CREATE OR REPLACE FUNCTION public_creation_ids() RETURNS SETOF INTEGER AS $$
+    SELECT id FROM creation_info WHERE privacy_setting = 'public';
+$$ LANGUAGE SQL STABLE;
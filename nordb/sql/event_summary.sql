@@ -0,0 +1,89 @@
+/*
++----------------------------+
+|EVENT SUMMARY TABLE CREATION|
++----------------------------+
+
+This sql file has all the commands for creating the event_summary table and
+the function that keeps it up to date. Every event has one row in the table
+with the values of its preferred main header, which is the main header with
+the smallest id, and the privacy setting and the owner of its creation info.
+Listing and counting events only read this table, so the policies of the
+nordic tables are not evaluated for every row. The rows are refreshed with
+refresh_event_summary whenever an event is inserted or its solution type or
+root changes and they are deleted together with the event. All commands can
+be run again against an existing database when migrating it.
+*/
+
+--Create event_summary table
+CREATE TABLE IF NOT EXISTS event_summary (
+    event_id INTEGER PRIMARY KEY REFERENCES nordic_event(id) ON DELETE CASCADE,
+    root_id INTEGER,
+    creation_id INTEGER,
+    solution_type VARCHAR(6),
+    owner VARCHAR(32),
+    creation_date TIMESTAMP,
+    privacy_setting PRIVACY_LEVEL,
+    main_id INTEGER,
+    origin_time TIME,
+    origin_date DATE,
+    origin_datetime TIMESTAMP,
+    location_model VARCHAR(1),
+    distance_indicator VARCHAR(1),
+    event_desc_id VARCHAR(1),
+    epicenter_latitude FLOAT,
+    epicenter_longitude FLOAT,
+    depth FLOAT,
+    depth_control VARCHAR(1),
+    locating_indicator VARCHAR(1),
+    epicenter_reporting_agency VARCHAR(3),
+    stations_used INTEGER,
+    rms_time_residuals FLOAT,
+    magnitude_1 FLOAT,
+    type_of_magnitude_1 VARCHAR(1),
+    magnitude_reporting_agency_1 VARCHAR(3),
+    magnitude_2 FLOAT,
+    type_of_magnitude_2 VARCHAR(1),
+    magnitude_reporting_agency_2 VARCHAR(3),
+    magnitude_3 FLOAT,
+    type_of_magnitude_3 VARCHAR(1),
+    magnitude_reporting_agency_3 VARCHAR(3)
+);
+
+--Enable row level security
+ALTER TABLE event_summary ENABLE ROW LEVEL SECURITY;
+
+--Function for refreshing the rows of the given events. The function is run with the rights of the owner of the database so that users can refresh the rows of events they cannot see, like the other events of a root whose solution types change.
+CREATE OR REPLACE FUNCTION refresh_event_summary(event_ids INTEGER[]) RETURNS VOID AS $$
+    DELETE FROM event_summary WHERE event_id = ANY(event_ids);
+
+    INSERT INTO event_summary
+    SELECT
+        nordic_event.id, nordic_event.root_id, nordic_event.creation_id,
+        nordic_event.solution_type, creation_info.owner, creation_info.creation_date,
+        creation_info.privacy_setting, preferred.id,
+        preferred.origin_time, preferred.origin_date, preferred.origin_datetime,
+        preferred.location_model, preferred.distance_indicator, preferred.event_desc_id,
+        preferred.epicenter_latitude, preferred.epicenter_longitude, preferred.depth,
+        preferred.depth_control, preferred.locating_indicator,
+        preferred.epicenter_reporting_agency, preferred.stations_used,
+        preferred.rms_time_residuals,
+        preferred.magnitude_1, preferred.type_of_magnitude_1, preferred.magnitude_reporting_agency_1,
+        preferred.magnitude_2, preferred.type_of_magnitude_2, preferred.magnitude_reporting_agency_2,
+        preferred.magnitude_3, preferred.type_of_magnitude_3, preferred.magnitude_reporting_agency_3
+    FROM
+        nordic_event
+    JOIN creation_info ON
+        creation_info.id = nordic_event.creation_id
+    LEFT JOIN LATERAL
+        (SELECT
+            *
+        FROM
+            nordic_header_main
+        WHERE
+            nordic_header_main.event_id = nordic_event.id
+        ORDER BY
+            nordic_header_main.id
+        LIMIT 1) AS preferred ON true
+    WHERE
+        nordic_event.id = ANY(event_ids);
+$$ LANGUAGE SQL SECURITY DEFINER SET search_path = public;
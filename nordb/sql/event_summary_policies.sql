@@ -0,0 +1,38 @@
+/*
++----------------------+
+|EVENT SUMMARY POLICIES|
++----------------------+
+
+This file contains the sql commands for creating the correct policies for the event_summary table. The rows carry the privacy setting and the owner of the event, so the policies don't need to look them up from creation_info. The rows are only written by refresh_event_summary.
+*/
+
+/*
+ADMIN POLICIES
+--------------
+*/
+
+--Admin policy. Allow admins to access all operations freely.
+CREATE POLICY admin_all_policy ON event_summary FOR ALL TO admins USING (true) WITH CHECK (true);
+
+/*
+DEFAULT USER POLICIES
+---------------------
+*/
+
+--Default user view policy. Allow users to select the summaries of all secure and public events and their own private events
+CREATE POLICY user_view_policy ON event_summary FOR SELECT TO default_users
+    USING   (
+            'private' != privacy_setting OR
+            current_user = owner
+            );
+
+/*
+GUEST POLICIES
+--------------
+*/
+
+--Guest select policy. Allow Guests to see the summaries of all public events
+CREATE POLICY guest_select_policy ON event_summary FOR SELECT TO guests
+    USING   (
+            'public' = privacy_setting
+            );
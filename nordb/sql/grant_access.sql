@@ -39,6 +39,14 @@ ON
 TO
     default_users;
 
+--Event summaries are only written by refresh_event_summary
+GRANT
+    SELECT
+ON
+    event_summary
+TO
+    default_users;
+
 --Give user a right to update off_date value of station
 GRANT
     UPDATE(off_date)
@@ -66,7 +74,7 @@ GUEST RIGHTS
 GRANT
     SELECT
 ON
-    creation_info, fap_response, fap, instrument, network,
+    creation_info, event_summary, fap_response, fap, instrument, network,
     nordb_user, nordic_event, nordic_event_root, nordic_file,
     nordic_header_comment, nordic_header_error, nordic_header_macroseismic,
     nordic_header_main, nordic_header_waveform, nordic_phase_data,
@@ -0,0 +1,64 @@
+/*
++----------------+
+|INDEX CREATION  |
++----------------+
+
+This file contains the sql commands for creating the indexes of the nordic 
+tables. All foreign keys pointing to nordic_event are indexed so that 
+fetching a whole event from the database and deleting events doesn't scan 
+the header and phase tables. The rest of the indexes are for the columns used
+by the search and duplicate checks. All commands use IF NOT EXISTS so that 
+the file can be run again against an existing database when migrating it.
+*/
+
+--Indexes for nordic_event
+CREATE INDEX IF NOT EXISTS nordic_event_root_id_idx 
+    ON nordic_event (root_id);
+CREATE INDEX IF NOT EXISTS nordic_event_creation_id_idx 
+    ON nordic_event (creation_id);
+
+--Index for finding nordic files by their location
+CREATE INDEX IF NOT EXISTS nordic_file_file_location_idx 
+    ON nordic_file (file_location);
+
+--Indexes for nordic_header_main
+CREATE INDEX IF NOT EXISTS nordic_header_main_event_id_idx 
+    ON nordic_header_main (event_id);
+CREATE INDEX IF NOT EXISTS nordic_header_main_origin_idx 
+    ON nordic_header_main (origin_date, origin_time);
+CREATE INDEX IF NOT EXISTS nordic_header_main_origin_datetime_idx 
+    ON nordic_header_main (origin_datetime);
+CREATE INDEX IF NOT EXISTS nordic_header_main_epicenter_idx 
+    ON nordic_header_main (epicenter_latitude, epicenter_longitude);
+CREATE INDEX IF NOT EXISTS nordic_header_main_magnitude_1_idx 
+    ON nordic_header_main (magnitude_1);
+CREATE INDEX IF NOT EXISTS nordic_header_main_epicenter_point_idx 
+    ON nordic_header_main USING gist (point(epicenter_longitude, epicenter_latitude));
+
+--Index for nordic_header_error
+CREATE INDEX IF NOT EXISTS nordic_header_error_header_id_idx 
+    ON nordic_header_error (header_id);
+
+--Indexes for the other nordic headers
+CREATE INDEX IF NOT EXISTS nordic_header_macroseismic_event_id_idx 
+    ON nordic_header_macroseismic (event_id);
+CREATE INDEX IF NOT EXISTS nordic_header_comment_event_id_idx 
+    ON nordic_header_comment (event_id);
+CREATE INDEX IF NOT EXISTS nordic_header_waveform_event_id_idx 
+    ON nordic_header_waveform (event_id);
+
+--Indexes for nordic_phase_data
+CREATE INDEX IF NOT EXISTS nordic_phase_data_event_id_idx 
+    ON nordic_phase_data (event_id);
+CREATE INDEX IF NOT EXISTS nordic_phase_data_station_idx 
+    ON nordic_phase_data (station_code, observation_time);
+
+--Indexes for listing and counting events from event_summary
+CREATE INDEX IF NOT EXISTS event_summary_origin_key_idx 
+    ON event_summary (COALESCE(origin_datetime, 'infinity'::TIMESTAMP), event_id);
+CREATE INDEX IF NOT EXISTS event_summary_solution_type_idx 
+    ON event_summary (solution_type);
+
+--Index for the spatial searches of stations
+CREATE INDEX IF NOT EXISTS station_point_idx 
+    ON station USING gist (point(longitude, latitude));
@@ -21,6 +21,7 @@ Generated tables in their recursive form
         C. nordic_header_comment
         D. nordic_header_waveform
         E. nordic_phase_data
+        F. event_summary
 4. network
     a. station
         A. sitechan
@@ -39,6 +40,7 @@ Generated tables in their recursive form
 
 --3. Run creation_info.sql      -- Create creation metainformation tables
 \i creation_info.sql
+\i creation_info_visibility.sql
 
 --4. Run nordic_event_root.sql  -- Create nordic_event related tables
 \i nordic_event_root.sql
@@ -51,6 +53,7 @@ Generated tables in their recursive form
         \i nordic_header_comment.sql
         \i nordic_header_waveform.sql
         \i nordic_phase_data.sql
+        \i event_summary.sql
 
 --5. Run network.sql            -- Create station related tables
 \i network.sql
@@ -62,8 +65,12 @@ Generated tables in their recursive form
                 \i instrument.sql
                     \i sensor.sql
 
---6. Run all policy files
+--6. Run indexes.sql            -- Create the indexes of the nordic tables
+\i indexes.sql
+
+--7. Run all policy files
 \i creation_info_policies.sql
+\i event_summary_policies.sql
 \i fap_response_policies.sql
 \i instrument_policies.sql
 \i network_policies.sql
@@ -84,6 +91,6 @@ Generated tables in their recursive form
 \i solution_type_policies.sql
 \i station_policies.sql
 
---7. Run grant_access.sql        -- Grant all roles their required access in the database
+--8. Run grant_access.sql        -- Grant all roles their required access in the database
 \i grant_access.sql
 
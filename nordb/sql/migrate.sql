@@ -0,0 +1,19 @@
+/*
++------------------+
+|DATABASE MIGRATION|
++------------------+
+
+This file contains the sql commands for bringing a database created with an 
+older version of nordb up to date with the current table definitions. All 
+commands can be run multiple times against the same database. The indexes 
+are created afterwards by running indexes.sql.
+*/
+
+--Add origin_datetime to nordic_header_main and fill it for the existing rows
+ALTER TABLE nordic_header_main ADD COLUMN IF NOT EXISTS origin_datetime TIMESTAMP;
+UPDATE nordic_header_main
+    SET origin_datetime = origin_date + COALESCE(origin_time, '00:00:00'::TIME)
+    WHERE origin_datetime IS NULL;
+
+--Replace the event_summary ordering index with one that puts events without an origin datetime last
+DROP INDEX IF EXISTS event_summary_origin_datetime_idx;
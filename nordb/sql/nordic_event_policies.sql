@@ -19,15 +19,14 @@ DEFAULT USER POLICIES
 ---------------------
 */
 
---Default user view policy. Allow users to select all event roots which have secure or public events in them
+--Default user view policy. Allow users to select all secure and public events and their own private events
 CREATE POLICY user_view_policy ON nordic_event FOR SELECT TO default_users 
     USING   (
-            'private' != (SELECT privacy_setting FROM creation_info WHERE nordic_event.creation_id = creation_info.id) OR
-            current_user = (SELECT owner FROM creation_info WHERE nordic_event.creation_id = creation_info.id)
+            creation_id IN (SELECT id FROM visible_creation_ids() AS id)
             );
 
 --view for evading possible infinite policy recursion for inserting nordic_events
-CREATE VIEW user_thing AS 
+CREATE OR REPLACE VIEW user_thing AS 
 	(
 	SELECT nordic_event.root_id as root_id, owner, privacy_setting FROM nordic_event, creation_info WHERE nordic_event.creation_id = creation_info.id
 	);
@@ -59,5 +58,5 @@ GUEST POLICIES
 --Guest select policy. Allow Guests to see all public events
 CREATE POLICY guest_select_policy ON nordic_event FOR SELECT TO guests
     USING   (
-            'public' = (SELECT privacy_setting from creation_info WHERE nordic_event.creation_id = creation_info.id)
+            creation_id IN (SELECT id FROM public_creation_ids() AS id)
             );
@@ -13,6 +13,7 @@ CREATE TABLE nordic_header_main (
 	event_id SERIAL REFERENCES nordic_event(id) ON DELETE CASCADE,
 	origin_time TIME,
     origin_date DATE,
+	origin_datetime TIMESTAMP,
 	location_model VARCHAR(1),
 	distance_indicator VARCHAR(1),
 	event_desc_id VARCHAR(1),
@@ -22,7 +22,7 @@ DEFAULT USER POLICIES
 --Default user view policy. Allow users to select all nordic_header_main rows which belong to secure or public events
 CREATE POLICY user_view_policy ON nordic_header_main FOR SELECT TO default_users 
     USING   (
-            'private' != (SELECT privacy_setting FROM creation_info, nordic_event WHERE nordic_event.creation_id = creation_info.id AND nordic_event.id = nordic_header_main.event_id)
+            EXISTS (SELECT 1 FROM nordic_event WHERE nordic_event.id = nordic_header_main.event_id AND creation_id IN (SELECT id FROM non_private_creation_ids() AS id))
             );
 
 --Default user insert policy. Allow users to insert main headers if the event in question belongs to them
@@ -48,5 +48,5 @@ GUEST POLICIES
 --Guest select policy. Allow Guests to see all nordic_header_main rows that belong to public events 
 CREATE POLICY guest_select_policy ON nordic_header_main FOR SELECT TO guests
     USING   (
-            'public' = (SELECT privacy_setting FROM creation_info, nordic_event WHERE creation_info.id = nordic_event.creation_id AND nordic_event.id = nordic_header_main.event_id)
+            EXISTS (SELECT 1 FROM nordic_event WHERE nordic_event.id = nordic_header_main.event_id AND creation_id IN (SELECT id FROM public_creation_ids() AS id))
             );
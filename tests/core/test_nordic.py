@@ -1,4 +1,5 @@
 import pytest
+import io
 from nordb.core.nordic import *
 
 @pytest.mark.usefixtures("nordicEvents", "faultyNordicEvents", "fixableNordicEvent")
@@ -14,3 +15,39 @@ class TestReadNordic(object):
                 readNordic(ev, False)
 
 
+
+@pytest.mark.usefixtures("nordicEvents", "faultyNordicEvents")
+class TestIterNordicEvents(object):
+    def testIterNordicEvents(self, nordicEvents):
+        nordic_file = io.StringIO("\n".join(["".join(ev) for ev in nordicEvents]))
+        nordic_events = list(iterNordicEvents(nordic_file, False))
+
+        assert len(nordic_events) == len(nordicEvents)
+        for nordic_event, ev in zip(nordic_events, nordicEvents):
+            assert str(nordic_event) == "".join(ev)
+
+    def testIterNordicEventsCollectsFailures(self, nordicEvents, faultyNordicEvents):
+        nordic_file = io.StringIO("".join(nordicEvents[0]) + "\n" + "".join(faultyNordicEvents[0]))
+        failed = []
+        nordic_events = list(iterNordicEvents(nordic_file, False, failed=failed))
+
+        assert len(nordic_events) == 1
+        assert len(failed) == 1
+        assert "line {0} ".format(len(nordicEvents[0]) + 2) in failed[0][0]
+
+    def testIterNordicEventsRaisesWithoutFailedList(self, faultyNordicEvents):
+        nordic_file = io.StringIO("".join(faultyNordicEvents[0]))
+        with pytest.raises(Exception):
+            list(iterNordicEvents(nordic_file, False))
+
+    def testIterNordicEventsWithJobs(self, nordicEvents, faultyNordicEvents):
+        nordic_string = "\n".join(["".join(ev) for ev in nordicEvents + faultyNordicEvents[:1]] * 3)
+        failed = []
+        parallel_failed = []
+
+        nordic_events = list(iterNordicEvents(io.StringIO(nordic_string), False, failed=failed))
+        parallel_events = list(iterNordicEvents(io.StringIO(nordic_string), False, failed=parallel_failed, jobs=2, chunk_size=2))
+
+        assert [str(e) for e in parallel_events] == [str(e) for e in nordic_events]
+        assert parallel_failed == failed
+        assert len(failed) == 3
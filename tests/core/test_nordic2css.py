@@ -0,0 +1,25 @@
+import pytest
+from nordb.core.nordic2css import *
+from nordb.core.nordic import readNordic
+
+@pytest.mark.usefixtures("nordicEvents")
+class TestNordic2CSS(object):
+    def testNordicEvents2CSS(self, nordicEvents, tmpdir):
+        nordic_events = [readNordic(e, False) for e in nordicEvents]
+        css_filename = str(tmpdir.join("catalog"))
+
+        assert nordicEvents2CSS(iter(nordic_events), css_filename) == len(nordic_events)
+
+        origins = [l.split() for l in open(css_filename + ".origin")]
+        arrivals = [l.split() for l in open(css_filename + ".arrival")]
+        assocs = [l.split() for l in open(css_filename + ".assoc")]
+        events = [l.split() for l in open(css_filename + ".event")]
+
+        assert [int(o[4]) for o in origins] == list(range(1, len(origins) + 1))
+        assert [int(o[5]) for o in origins] == [1, 1, 1, 2, 3]
+        assert [int(a[2]) for a in arrivals] == list(range(1, sum(len(e.data) for e in nordic_events) + 1))
+        assert [int(a[0]) for a in assocs] == [int(a[2]) for a in arrivals]
+        assert [(int(e[0]), int(e[2])) for e in events] == [(1, 1), (2, 4), (3, 5)]
+        assert set(int(a[1]) for a in assocs[-len(nordic_events[-1].data):]) == {5}
+
+        assert open(css_filename + ".origin").readline() == nordic2Origin(nordic_events[0].main_h[0], 1, 1)
@@ -1,4 +1,6 @@
 import pytest
+import io
+from lxml import etree
 from nordb.core.nordic2quakeml import *
 from nordb.core.nordic import readNordic
 
@@ -14,3 +16,21 @@ class TestNordic2Quakeml(object):
 
         assert True
 
+    def testWriteQuakeML(self, nordicEvents):
+        nordic_events = [readNordic(e) for e in nordicEvents]
+        f = io.BytesIO()
+
+        assert writeQuakeML(iter(nordic_events), f) == len(nordic_events)
+
+        parser = etree.XMLParser(remove_blank_text=True)
+        streamed = etree.fromstring(f.getvalue(), parser)
+        getQuakeMLSchema().assertValid(streamed)
+
+        quakeml = etree.fromstring(etree.tostring(nordicEvents2QuakeML(nordic_events)), parser)
+        assert etree.tostring(streamed, method="c14n") == etree.tostring(quakeml, method="c14n")
+
+    def testWriteQuakeMLWithoutEvents(self):
+        f = io.BytesIO()
+
+        assert writeQuakeML([], f) == 0
+        getQuakeMLSchema().assertValid(etree.fromstring(f.getvalue()))
@@ -1,7 +1,31 @@
 import pytest
+import io
+from lxml import etree
 from nordb.core.nordic2sc3 import *
 from nordb.core.nordic import readNordic
 
+def readEvents(nordicEvents):
+    nordic_events = []
+    for i, e in enumerate(nordicEvents):
+        nordic_event = readNordic(e, False)
+        for j, main in enumerate(nordic_event.main_h):
+            main.h_id = 10 * i + j + 1
+        for j, data in enumerate(nordic_event.data):
+            data.d_id = 100 * i + j + 1
+        nordic_events.append(nordic_event)
+    return nordic_events
+
+def sc3Values(event_parameters):
+    values = []
+    for element in event_parameters.iter():
+        text = (element.text or "").strip()
+        try:
+            text = float(text)
+        except ValueError:
+            pass
+        values.append((etree.QName(element).localname, sorted(element.attrib.items()), text))
+    return values
+
 @pytest.mark.usefixture("nordicEvents")
 class TestNordic2SC3(object):
 
@@ -14,3 +38,21 @@ class TestNordic2SC3(object):
 
         assert True
 
+    def testWriteSC3(self, nordicEvents):
+        nordic_events = readEvents(nordicEvents)
+        f = io.BytesIO()
+
+        assert writeSC3(iter(nordic_events), f) == len(nordic_events)
+
+        sc3 = etree.fromstring(f.getvalue())
+        getSC3Schema().assertValid(sc3)
+        assert sc3Values(sc3[0]) == sc3Values(nordicEvents2SC3(nordic_events).getroot()[0])
+
+    def testWriteSC3WithoutEvents(self):
+        f = io.BytesIO()
+
+        assert writeSC3([], f) == 0
+
+        sc3 = etree.fromstring(f.getvalue())
+        getSC3Schema().assertValid(sc3)
+        assert len(sc3[0]) == 0
@@ -0,0 +1,80 @@
+import pytest
+import warnings
+from datetime import datetime
+from nordb.core.nordic import createStringPhaseData
+from nordb.core.nordicPhaseParser import *
+
+def getPhaseLines(nordic_events):
+    lines = []
+    for ev in nordic_events:
+        data_start = [i for i, line in enumerate(ev) if line[79] == ' '][0]
+        if ev[data_start][1:5] == "STAT":
+            data_start += 1
+        lines.extend(ev[data_start:])
+    return lines
+
+def readPhaseLine(line, fix_nordic, obs_datetime):
+    try:
+        return createStringPhaseData(line, fix_nordic, obs_datetime).getAsList(), None
+    except Exception as e:
+        return None, str(e)
+
+@pytest.mark.usefixtures("nordicEvents", "fixableNordicEvent")
+class TestParsePhaseLines(object):
+    def testParsePhaseLines(self, nordicEvents):
+        lines = getPhaseLines(nordicEvents)
+        obs_datetime = datetime(2013, 1, 3, 6, 13)
+        phase_data, errors = parsePhaseLines(lines, obs_datetime)
+
+        assert errors == []
+        assert len(phase_data) == len(lines)
+        for data, line in zip(phase_data, lines):
+            assert data.getAsList() == createStringPhaseData(line, False, obs_datetime).getAsList()
+
+    def testParsePhaseLinesWithFix(self, fixableNordicEvent):
+        lines = getPhaseLines(fixableNordicEvent[:1])
+        obs_datetime = datetime(2017, 8, 1, 23, 0)
+        phase_data, errors = parsePhaseLines(lines, obs_datetime, True)
+
+        assert errors == []
+        assert phase_data[0].back_azimuth == 0.0
+        assert phase_data[2].observation_time == datetime(2017, 8, 2, 2, 0, 39, 210000)
+        assert phase_data[2].epicenter_to_station_azimuth == 0
+        for data, line in zip(phase_data, lines):
+            assert data.getAsList() == readPhaseLine(line, True, obs_datetime)[0]
+
+    def testParsePhaseLinesCollectsErrors(self, nordicEvents):
+        line = getPhaseLines(nordicEvents)[0]
+        lines = [
+                    line,
+                    line[:14] + "X" + line[15:],
+                    line[:18] + "06as" + line[22:],
+                    line,
+                    line[:46] + " 400.0" + line[52:],
+                    line[:6] + "Q" + line[7:],
+                    line[:63] + "  nan" + line[68:],
+                ]
+        obs_datetimes = [datetime(2013, 1, 3, 6, 13)] * len(lines)
+        phase_data, errors = parsePhaseLines(lines, obs_datetimes)
+
+        assert [i for i, error in errors] == [1, 2, 4, 5, 6]
+        assert phase_data[0].getAsList() == phase_data[3].getAsList()
+        for i, error in errors:
+            assert phase_data[i] is None
+            assert error == readPhaseLine(lines[i], False, obs_datetimes[i])[1]
+
+    def testParsePhaseLinesWithHugeDistance(self, nordicEvents):
+        line = getPhaseLines(nordicEvents)[0]
+        lines = [line, line[:70] + " 9e99" + line[75:], line[:70] + "  inf" + line[75:]]
+        obs_datetimes = [datetime(2013, 1, 3, 6, 13)] * len(lines)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            phase_data, errors = parsePhaseLines(lines, obs_datetimes, True)
+
+        assert [i for i, error in errors] == [1, 2]
+        for i, error in errors:
+            assert error == readPhaseLine(lines[i], True, obs_datetimes[i])[1]
+
+    def testParsePhaseLinesEmpty(self):
+        assert parsePhaseLines([], datetime(2013, 1, 3)) == ([], [])
@@ -91,3 +91,29 @@ class TestReadNordicFile(object):
         with pytest.raises(Exception):
             readNordicFile(DUMMY_NORDIC_TOO_SHORT)
 
+
+class TestIterNordicFile(object):
+    def testPositionsOfEvents(self):
+        event = DUMMY_NORDIC.getvalue()
+        nordics = list(iterNordicFile(io.StringIO(event + event)))
+
+        assert len(nordics) == 2
+        assert nordics[0][1:] == (1, 0)
+        assert nordics[1][1:] == (event.count("\n") + 1, len(event.encode()))
+        assert nordics[0][0] == nordics[1][0]
+
+    def testPositionsOfEventsWithCrlf(self):
+        event = DUMMY_NORDIC.getvalue()
+        crlf_event = event.replace("\n", "\r\n")
+
+        for f in [io.StringIO(crlf_event + crlf_event, newline = ""), io.BytesIO((crlf_event + crlf_event).encode())]:
+            nordics = list(iterNordicFile(f))
+
+            assert nordics[1][1:] == (event.count("\n") + 1, len(crlf_event.encode()))
+            assert nordics[0][0] == list(iterNordicFile(io.StringIO(event)))[0][0]
+
+    def testTooShortLinePosition(self):
+        with pytest.raises(Exception) as e:
+            list(iterNordicFile(io.StringIO(DUMMY_NORDIC_TOO_SHORT.getvalue())))
+        assert "line:8" in str(e.value)
+        assert "byte:{0}".format(7*81) in str(e.value)
@@ -0,0 +1,49 @@
+import pytest
+import io
+from nordb.core.nordic import readNordic
+from nordb.core.nordicWriter import *
+
+@pytest.mark.usefixtures("nordicEvents")
+class TestNordicWriter(object):
+    def testFormatNordicEvent(self, nordicEvents):
+        for ev in nordicEvents:
+            nordic_event = readNordic(ev, False)
+            assert formatNordicEvent(nordic_event) == str(nordic_event)
+            nordic_event.event_id = 123
+            assert formatNordicEvent(nordic_event) == str(nordic_event)
+
+    def testFormatMissingValues(self, nordicEvents):
+        nordic_event = readNordic(nordicEvents[0], False)
+        main = nordic_event.main_h[0]
+        main.origin_time = None
+        assert formatMainHeader(main) == str(main) + "\n"
+        main.origin_date = None
+        assert formatMainHeader(main) == str(main) + "\n"
+
+        for data in nordic_event.data:
+            data.weight = None
+            data.travel_time_residual = None
+            assert formatPhaseData(data) == str(data) + "\n"
+
+    def testFormatValuesThatDoNotFit(self, nordicEvents):
+        nordic_event = readNordic(nordicEvents[0], False)
+        main = nordic_event.main_h[0]
+        main.magnitude_1 = -0.45
+        main.epicenter_latitude = 60.12345678
+        assert formatMainHeader(main) == str(main) + "\n"
+
+        data = nordic_event.data[0]
+        data.max_amplitude_period = -0.5
+        data.travel_time_residual = -0.3
+        assert formatPhaseData(data) == str(data) + "\n"
+
+        data.max_amplitude_period = 12.345
+        with pytest.raises(ValueError):
+            formatPhaseData(data)
+
+    def testWriteNordicEvents(self, nordicEvents):
+        nordic_events = [readNordic(ev, False) for ev in nordicEvents]
+        f = io.StringIO()
+        writeNordicEvents(nordic_events, f)
+
+        assert f.getvalue() == "".join([str(e) + "\n" for e in nordic_events])
@@ -26,3 +26,66 @@ from nordb import settings
 #        usernameUtilities.confUser("wrong")
 #        with pytest.raises(psycopg2.OperationalError):
 #            usernameUtilities.log2nordb()
+
+@pytest.mark.usefixtures("setupdb")
+class TestConnectionPool(object):
+    def testClosedConnectionIsReused(self, setupdb):
+        conn = usernameUtilities.log2nordb()
+        raw_conn = conn._conn
+        conn.close()
+
+        conn = usernameUtilities.log2nordb()
+        assert conn._conn is raw_conn
+        conn.close()
+
+    def testClosedConnectionCannotBeUsed(self, setupdb):
+        conn = usernameUtilities.log2nordb()
+        conn.close()
+
+        assert conn.closed
+        with pytest.raises(psycopg2.InterfaceError):
+            conn.cursor()
+
+    def testUncommittedChangesAreRolledBack(self, setupdb):
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        cur.execute("INSERT INTO nordic_file (file_location) VALUES ('rollback')")
+        conn.close()
+
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM nordic_file")
+        assert cur.fetchone()[0] == 0
+        conn.close()
+
+    def testContextManagerCommits(self, setupdb):
+        with usernameUtilities.log2nordb() as conn:
+            cur = conn.cursor()
+            cur.execute("INSERT INTO nordic_file (file_location) VALUES ('commit')")
+
+        assert conn.closed
+
+        with usernameUtilities.log2nordb() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*) FROM nordic_file")
+            assert cur.fetchone()[0] == 1
+
+    def testBrokenConnectionIsReplaced(self, setupdb):
+        conn = usernameUtilities.log2nordb()
+        raw_conn = conn._conn
+        conn.close()
+        raw_conn.close()
+
+        conn = usernameUtilities.log2nordb()
+        assert conn._conn is not raw_conn
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        assert cur.fetchone()[0] == 1
+        conn.close()
+
+    def testPoolDoesNotExceedMaximumSize(self, setupdb):
+        conns = [usernameUtilities.log2nordb() for i in range(settings.pool_max_size)]
+        with pytest.raises(Exception):
+            usernameUtilities.log2nordb()
+        for conn in conns:
+            conn.close()
@@ -125,6 +125,44 @@ class TestValidateString(object):
         with pytest.raises(Exception):
             validateString("test", "value", 5, 10, None, nType)
 
+class TestValidateDatetime(object):
+    def testWithCorrectStringWorks(self):
+        assert validateDatetime("2013 0103 0613 15.3 ", "value", nType) == datetime(2013, 1, 3, 6, 13, 15, 300000)
+
+    def testWithEmptyStringWorks(self):
+        assert validateDatetime("          ", "value", nType) is None
+
+    def testWithFaultyDateFails(self):
+        with pytest.raises(Exception):
+            validateDatetime("2013 0132 0613 15.30", "value", nType)
+
+    def testWithFaultyTimeFails(self):
+        with pytest.raises(Exception):
+            validateDatetime("2013 0103 06as 15.30", "value", nType)
+
+    def testDatePartIsCached(self):
+        parseDateParts.cache_clear()
+        validateDatetime("2013 0103 0613 15.30", "value", nType)
+        validateDatetime("2013 0103 0614 01.00", "value", nType)
+        assert parseDateParts.cache_info().hits == 1
+
+class TestValidateDateAndTime(object):
+    def testDateWorks(self):
+        assert validateDate("2013 0103", "value", nType) == date(2013, 1, 3)
+        assert validateDate("2013  1 3", "value", nType) == date(2013, 1, 3)
+        assert validateDate("2013 01 03", "value", nType) == date(2013, 1, 3)
+
+    def testFaultyDateFails(self):
+        with pytest.raises(Exception):
+            validateDate("2013 01AR", "value", nType)
+
+    def testTimeWorks(self):
+        assert validateTime("0613 04.1", "value", nType) == time(6, 13, 4, 100000)
+
+    def testFaultyTimeFails(self):
+        with pytest.raises(Exception):
+            validateTime("06as 04.1", "value", nType)
+
 
 
 #class TestValidateDate(object):
@@ -0,0 +1,33 @@
+import pytest
+from nordb.core import usernameUtilities
+from nordb.database import eventSummary
+from nordb.database import norDBManagement
+from nordb.database import sql2nordic
+from nordb.database.nordicSearch import NordicSearch
+
+@pytest.mark.usefixtures("setupdbWithEvents")
+class TestEventSummary(object):
+    def testSummariesMatchEvents(self, setupdbWithEvents):
+        events = dict((e.event_id, e) for e in sql2nordic.getNordic([1, 2, 3]))
+        summaries = list(NordicSearch().iterEventSummaries(order_by = "id"))
+
+        assert [e.event_id for e in summaries] == [1, 2, 3]
+        for e in summaries:
+            assert len(e.main_h) == 1
+            assert str(e.main_h[0]) == str(events[e.event_id].main_h[0])
+            assert e.solution_type == events[e.event_id].solution_type
+            assert e.root_id == events[e.event_id].root_id
+            assert e.creation_info.creation_date == events[e.event_id].creation_info.creation_date
+
+        assert norDBManagement.countEvents() == 3
+        assert norDBManagement.countEvents("F") == 3
+
+    def testRefreshAllEventSummaries(self, setupdbWithEvents):
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        cur.execute("DELETE FROM event_summary")
+        assert norDBManagement.countEvents(db_conn = conn) == 0
+
+        eventSummary.refreshAllEventSummaries(conn)
+        assert norDBManagement.countEvents(db_conn = conn) == 3
+        conn.close()
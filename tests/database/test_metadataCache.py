@@ -0,0 +1,104 @@
+import pytest
+from datetime import datetime
+
+from nordb.database import station2sql
+from nordb.database import sitechan2sql
+from nordb.database import sensor2sql
+from nordb.database import instrument2sql
+from nordb.database import response2sql
+from nordb.database import sql2station
+from nordb.database import sql2response
+from nordb.database import metadataCache
+from nordb.database.metadataCache import MetadataCache, validityInterval, inInterval
+from nordb.nordic import station
+from nordb.nordic import sitechan
+from nordb.nordic import sensor
+from nordb.nordic import instrument
+from nordb.nordic import response
+
+def insertMetadata(stationFiles, siteChanFiles, sensorFiles, instrumentFiles, responseFiles):
+    for resp in responseFiles:
+        response2sql.insertResponse2Database(response.readResponseArrayToResponse(resp[0], resp[1]))
+    for stat in stationFiles:
+        stat = station.readStationStringToStation(stat, "HE")
+        station2sql.insertStation2Database(stat, stat.network)
+    for chan in siteChanFiles:
+        sitechan2sql.insertSiteChan2Database(sitechan.readSiteChanStringToSiteChan(chan))
+    for ins in instrumentFiles:
+        instrument2sql.insertInstrument2Database(instrument.readInstrumentStringToInstrument(ins))
+    for sen in sensorFiles:
+        sensor2sql.insertSensor2Database(sensor.readSensorStringToSensor(sen))
+
+class TestMetadataCache(object):
+    def testValidityInterval(self):
+        rows = [(1, 5, True), (3, None, True), (7, 9, False), (None, 2, True)]
+
+        assert validityInterval(4, rows) == (3, True, 5, True)
+        assert validityInterval(5, rows) == (3, True, 5, True)
+        assert validityInterval(6, rows) == (5, False, 7, False)
+        assert validityInterval(9, rows) == (9, True, None, False)
+        assert validityInterval(0, rows) == (None, False, 1, False)
+
+        assert inInterval(5, (3, True, 5, True))
+        assert not inInterval(5, (5, False, 7, False))
+        assert not inInterval(7, (5, False, 7, False))
+        assert inInterval(100, (9, True, None, False))
+
+    def testLRUEviction(self):
+        cache = MetadataCache(max_size = 2)
+        cache.put(("a",), (None, False, None, False), 1)
+        cache.put(("b",), (None, False, None, False), 2)
+
+        assert cache.get(("a",), 0) == (True, 1)
+
+        cache.put(("c",), (None, False, None, False), 3)
+
+        assert cache.get(("b",), 0) == (False, None)
+        assert cache.get(("a",), 0) == (True, 1)
+        assert cache.get(("c",), 0) == (True, 3)
+        assert cache.getStatistics() == {"hits":3, "misses":1, "size":2, "max_size":2}
+
+        cache.invalidate()
+        assert cache.get(("a",), 0) == (False, None)
+
+@pytest.mark.usefixtures("setupdb", "stationFiles", "siteChanFiles", "sensorFiles", "instrumentFiles", "responseFiles")
+class TestMetadataCacheDatabase(object):
+    def testResponseCache(self, setupdb, stationFiles, siteChanFiles, sensorFiles, instrumentFiles, responseFiles):
+        insertMetadata(stationFiles, siteChanFiles, sensorFiles, instrumentFiles, responseFiles)
+        hits = metadataCache.getStatistics()["hits"]
+
+        old_response = sql2response.getResponse("AFI", "BHZ", datetime(2008, 1, 1))
+        assert sql2response.getResponse("AFI", "BHZ", datetime(2009, 6, 1)) is old_response
+        assert metadataCache.getStatistics()["hits"] == hits + 1
+
+        new_response = sql2response.getResponse("AFI", "BHZ", datetime(2011, 1, 1))
+        assert new_response is not None
+        assert sql2response.getResponse("AFI", "BHZ", datetime(2000, 1, 1)) is None
+        assert sql2response.getResponse("AFI", "BHZ", datetime(2003, 1, 1)) is None
+
+    def testStationCache(self, setupdb, stationFiles, siteChanFiles, sensorFiles, instrumentFiles, responseFiles):
+        insertMetadata(stationFiles, siteChanFiles, sensorFiles, instrumentFiles, responseFiles)
+
+        stat = sql2station.getStation("AFI", datetime(2008, 1, 1))
+        assert len(stat.sitechans) == 3
+        assert sql2station.getStation("AFI", datetime(2009, 1, 1)) is stat
+        assert sql2station.getStation("AFI", datetime(2011, 1, 1)) is not stat
+        assert sql2station.getStation("AL31", datetime(2008, 1, 1)) is None
+
+        stations = sql2station.getStations(["AK02", "AFI", "AK02"], datetime(2008, 1, 1))
+        assert [s.station_code for s in stations] == ["AK02", "AFI"]
+        assert stations[1] is stat
+
+    def testInsertInvalidatesCache(self, setupdb, stationFiles, siteChanFiles, sensorFiles, instrumentFiles, responseFiles):
+        insertMetadata(stationFiles, siteChanFiles, sensorFiles, instrumentFiles, responseFiles)
+
+        stat = sql2station.getStation("AK03", datetime(2008, 1, 1))
+        assert stat.sitechans == []
+        assert metadataCache.getStatistics()["size"] > 0
+
+        sitechan2sql.insertSiteChan2Database(sitechan.readSiteChanStringToSiteChan(
+            siteChanFiles[-1].replace("AK02", "AK03").replace("1117201", "1117300")))
+        assert metadataCache.getStatistics()["size"] == 0
+
+        stat = sql2station.getStation("AK03", datetime(2008, 1, 1))
+        assert [chan.channel_code for chan in stat.sitechans] == ["BHZ"]
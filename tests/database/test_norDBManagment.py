@@ -1,6 +1,8 @@
 import pytest
 from nordb.core import usernameUtilities
+from nordb.core import nordic
 from nordb.database import norDBManagement
+from nordb.database import nordic2sql
 from nordb import settings
 
 @pytest.mark.usefixtures("setupdb")
@@ -14,3 +16,149 @@ class TestNorDBManagment(object):
         with pytest.raises(Exception):
             norDBManagement.destroyDatabase()
             
+
+    def testCreateDatabaseCreatesIndexes(self, setupdb):
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'nordic_phase_data'")
+        indexes = [a[0] for a in cur.fetchall()]
+        conn.close()
+
+        assert "nordic_phase_data_event_id_idx" in indexes
+        assert "nordic_phase_data_station_idx" in indexes
+
+    def testMigrateDatabaseAddsMissingIndexes(self, setupdb):
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        cur.execute("DROP INDEX nordic_header_main_event_id_idx")
+        conn.commit()
+
+        norDBManagement.migrateDatabase(conn)
+        norDBManagement.migrateDatabase(conn)
+
+        cur.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'nordic_header_main_event_id_idx'")
+        ans = cur.fetchall()
+        conn.close()
+
+        assert len(ans) == 1
+
+POLICY_TABLES = [
+                    "nordic_event", "nordic_header_main", "nordic_header_error",
+                    "nordic_header_macroseismic", "nordic_header_comment",
+                    "nordic_header_waveform", "nordic_phase_data"
+                ]
+
+HEADER_TABLES = POLICY_TABLES[3:] + ["nordic_header_main"]
+
+OLD_SELECT_POLICIES = [
+    "CREATE POLICY user_view_policy ON nordic_event FOR SELECT TO default_users USING ("
+    "'private' != (SELECT privacy_setting FROM creation_info WHERE nordic_event.creation_id = creation_info.id) OR "
+    "current_user = (SELECT owner FROM creation_info WHERE nordic_event.creation_id = creation_info.id))",
+    "CREATE POLICY guest_select_policy ON nordic_event FOR SELECT TO guests USING ("
+    "'public' = (SELECT privacy_setting from creation_info WHERE nordic_event.creation_id = creation_info.id))",
+    "CREATE POLICY user_view_policy ON nordic_header_error FOR SELECT TO default_users USING ("
+    "'private' != (SELECT privacy_setting FROM creation_info, nordic_event, nordic_header_main "
+    "WHERE nordic_event.creation_id = creation_info.id AND nordic_event.id = nordic_header_main.event_id "
+    "AND nordic_header_error.header_id = nordic_header_main.id))",
+    "CREATE POLICY guest_select_policy ON nordic_header_error FOR SELECT TO guests USING ("
+    "'public' = (SELECT privacy_setting FROM creation_info, nordic_event, nordic_header_main "
+    "WHERE nordic_event.creation_id = creation_info.id AND nordic_event.id = nordic_header_main.event_id "
+    "AND nordic_header_error.header_id = nordic_header_main.id))",
+] + [
+    "CREATE POLICY {0} ON {1} FOR SELECT TO {2} USING ("
+    "{3} (SELECT privacy_setting FROM creation_info, nordic_event "
+    "WHERE nordic_event.creation_id = creation_info.id AND nordic_event.id = {1}.event_id))".format(policy, table, role, comparison)
+    for table in HEADER_TABLES
+    for policy, role, comparison in [("user_view_policy", "default_users", "'private' !="), ("guest_select_policy", "guests", "'public' =")]
+]
+
+POLICY_ROLES = [("nordb_test_user", "default_users"), ("nordb_test_guest", "guests")]
+
+def visibleRows(cur):
+    """
+    Function for collecting the ids of the rows each test role sees in POLICY_TABLES.
+    """
+    visible = {}
+    for role, group in POLICY_ROLES:
+        cur.execute("SET ROLE {0}".format(role))
+        for table in POLICY_TABLES:
+            cur.execute("SELECT id FROM {0} ORDER BY id".format(table))
+            visible[role, table] = [a[0] for a in cur.fetchall()]
+        cur.execute("RESET ROLE")
+    return visible
+
+@pytest.mark.usefixtures("setupdb", "nordicEvents")
+class TestPolicies(object):
+    def testSelectPoliciesMatchOldPolicies(self, setupdb, nordicEvents):
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        try:
+            for role, group in POLICY_ROLES:
+                cur.execute("CREATE ROLE {0} IN ROLE {1}".format(role, group))
+                cur.execute("INSERT INTO nordb_user (username, role) VALUES (%s, %s)", (role, group))
+
+            event_ids = {}
+            for privacy_level in ["public", "secure", "private", "own private"]:
+                nordic_event = nordic.readNordic(nordicEvents[0], False)
+                nordic2sql.events2Database([nordic_event], privacy_level = privacy_level.split()[-1], db_conn = conn)
+                event_ids[privacy_level] = nordic_event.event_id
+            cur.execute("UPDATE creation_info SET owner = 'nordb_test_user' WHERE id = (SELECT creation_id FROM nordic_event WHERE id = %s)",
+                        (event_ids["own private"],))
+            conn.commit()
+
+            visible = visibleRows(cur)
+            norDBManagement.migrateDatabase(conn)
+            assert visibleRows(cur) == visible
+
+            assert visible["nordb_test_user", "nordic_event"] == [event_ids["public"], event_ids["secure"], event_ids["own private"]]
+            assert visible["nordb_test_guest", "nordic_event"] == [event_ids["public"]]
+            cur.execute("SELECT event_id, id FROM nordic_header_main")
+            main_events = dict((a[1], a[0]) for a in cur.fetchall())
+            for role, events in [("nordb_test_user", ["public", "secure"]), ("nordb_test_guest", ["public"])]:
+                for table in HEADER_TABLES:
+                    cur.execute("SELECT id FROM {0} WHERE event_id IN %s ORDER BY id".format(table),
+                                (tuple(event_ids[e] for e in events),))
+                    assert visible[role, table] == [a[0] for a in cur.fetchall()]
+                cur.execute("SELECT id, header_id FROM nordic_header_error ORDER BY id")
+                assert visible[role, "nordic_header_error"] == [a[0] for a in cur.fetchall()
+                                                                  if main_events[a[1]] in [event_ids[e] for e in events]]
+
+            for policy in OLD_SELECT_POLICIES:
+                policy_name, table = policy.split()[2], policy.split()[4]
+                cur.execute("DROP POLICY {0} ON {1}".format(policy_name, table))
+                cur.execute(policy)
+            assert visibleRows(cur) == visible
+        finally:
+            conn.rollback()
+            for role, group in POLICY_ROLES:
+                cur.execute("DROP ROLE IF EXISTS {0}".format(role))
+            conn.commit()
+            conn.close()
+
+@pytest.mark.usefixtures("setupdbWithEvents")
+class TestMigrateDatabase(object):
+    def testMigrateDatabaseBackfillsOriginDatetime(self, setupdbWithEvents):
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        cur.execute("UPDATE nordic_header_main SET origin_datetime = NULL")
+        conn.commit()
+
+        norDBManagement.migrateDatabase(conn)
+
+        cur.execute("SELECT COUNT(*) FROM nordic_header_main WHERE origin_datetime IS DISTINCT FROM origin_date + origin_time")
+        ans = cur.fetchone()[0]
+        conn.close()
+
+        assert ans == 0
+
+    def testMigrateDatabaseCreatesEventSummary(self, setupdbWithEvents):
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        cur.execute("DROP TABLE event_summary")
+        conn.commit()
+
+        norDBManagement.migrateDatabase(conn)
+        norDBManagement.migrateDatabase(conn)
+
+        assert norDBManagement.countEvents(db_conn = conn) == 3
+        conn.close()
@@ -45,6 +45,21 @@ class TestNordic2SQL(object):
         assert ans[0][0] == ans[1][0]
         assert ans[0][1] != ans[1][1]
         
+    def testMainHeaderWithoutDate(self, setupdb, nordicEvents):
+        event = nordic.readNordic(nordicEvents[0], False)
+        event.main_h[-1].origin_date = None
+        event.main_h[-1].origin_time = None
+
+        nordic2sql.event2Database(event, "F", "dummy")
+
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM nordic_header_main WHERE origin_date IS NULL AND origin_datetime IS NULL")
+        ans = cur.fetchone()[0]
+        conn.close()
+
+        assert ans == 1
+
     def testAttachToNonExistingEvent(self, setupdb, nordicEvents):
         event = nordic.readNordic(nordicEvents[0], False) 
         creation_id = creationInfo.createCreationInfo('public')
@@ -53,3 +68,31 @@ class TestNordic2SQL(object):
             nordic2sql.event2Database(event, "F", "dummy", creation_id, 3)
    
 
+    def testBulkInsert(self, setupdb, nordicEvents):
+        events = []
+        for e in nordicEvents:
+            events.append(nordic.readNordic(e, False))
+
+        nordic2sql.events2Database(events, "F", "dummy_name")
+
+        for e in events:
+            assert e.event_id != -1
+            assert e.root_id != -1
+            assert str(sql2nordic.getNordic(e.event_id)[0]) == str(e)
+
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(DISTINCT root_id), COUNT(*) FROM nordic_event")
+        ans = cur.fetchone()
+        conn.close()
+
+        assert ans[0] == len(events)
+        assert ans[1] == len(events)
+
+    def testBulkInsertWithInvalidSolutionType(self, setupdb, nordicEvents):
+        events = [nordic.readNordic(nordicEvents[0], False)]
+
+        with pytest.raises(Exception):
+            nordic2sql.events2Database(events, "XXXXX", "dummy_name")
+
+        assert events[0].root_id == -1
@@ -4,6 +4,8 @@ from nordb.database.nordicModify import *
 from nordb.database import nordic2sql
 from nordb.database import creationInfo
 from nordb.database import sql2nordic
+from nordb.database import norDBManagement
+from nordb.database.nordicSearch import NordicSearch
 
 @pytest.mark.usefixtures("setupdb", "nordicEvents")
 class TestNordicChangeType(object):
@@ -64,3 +66,22 @@ class TestNordicChangeRoot(object):
         with pytest.raises(Exception):
             changeEventRoot(1, 12)
 
+@pytest.mark.usefixtures("setupdb", "nordicEvents")
+class TestNordicModifyEventSummary(object):
+    def testModifyingEventsRefreshesSummaries(self, setupdb, nordicEvents):
+        creation_id = creationInfo.createCreationInfo('public')
+        nordic2sql.event2Database(readNordic(nordicEvents[0], False), "F", "dummy_name", creation_id, -1)
+        nordic2sql.events2Database([readNordic(nordicEvents[1], False)], "F", "dummy_name", creation_id)
+
+        assert norDBManagement.countEvents("F") == 2
+
+        changeSolutionType(1, "A")
+        assert norDBManagement.countEvents("A") == 1
+
+        changeEventRoot(2, sql2nordic.getEventRootId(1))
+        summaries = list(NordicSearch().iterEventSummaries(order_by = "id"))
+        assert summaries[0].root_id == summaries[1].root_id
+
+        nordic2sql.event2Database(readNordic(nordicEvents[0], False), "F", "dummy_name", creation_id, 2)
+        assert norDBManagement.countEvents("F") == 1
+        assert norDBManagement.countEvents("O") == 1
@@ -2,6 +2,8 @@ import pytest
 from nordb.database.nordicSearch import *
 from nordb.database import nordic2sql
 from datetime import date
+from datetime import datetime
+from datetime import time
 from nordb.core import usernameUtilities
 from nordb.core import nordic
 
@@ -22,6 +24,19 @@ class TestNordicSearchWithCriteria(object):
         assert len(foundEvents) == 1
         assert foundEvents[0].event_id == 1
 
+    def testFindEventsWithOriginDatetime(self, setupdbWithEvents):
+        search = NordicSearch()
+        search.addSearchBetween("origin_datetime", datetime(2013, 1, 3, 6, 14), datetime(2013, 1, 3, 6, 14, 1))
+        foundEvents = search.searchEvents()
+
+        assert len(foundEvents) == 1
+        assert foundEvents[0].event_id == 1
+
+    def testFindEventsWithDateSearchesWholeDay(self, setupdbWithEvents):
+        assert len(searchEvents(date = date(2013, 1, 3))) == 1
+        assert len(searchEvents(date = date(2013, 1, 2))) == 0
+        assert len(searchEvents(date = date(2013, 1, 2), date_diff = 1.0)) == 1
+
     def testFindEventsWithMagnitude(self, setupdbWithEvents):
         search = NordicSearch()
         search.addSearchExactly("magnitude_1", 1.6)
@@ -157,6 +172,56 @@ class TestNordicSearchWithCriteria(object):
         foundEvents = search.searchEvents()
         assert len(foundEvents) == 0
 
+@pytest.mark.usefixtures("setupdbWithEvents")
+class TestIterEventIdAndDate(object):
+    def testPagesMatchWholeSearch(self, setupdbWithEvents):
+        search = NordicSearch()
+        rows = list(search.iterEventIdAndDate())
+
+        assert [r[0] for r in rows] == [1, 2, 3]
+        assert rows[0][1:] == (date(2013, 1, 3), time(6, 14, 0, 100000))
+        assert list(search.iterEventIdAndDate(page_size = 1)) == rows
+        assert list(search.iterEventIdAndDate(order_by = "id", page_size = 2)) == rows
+
+    def testLimitAndOffset(self, setupdbWithEvents):
+        search = NordicSearch()
+        search.addSearchOver("epicenter_latitude", 63.632)
+
+        assert [r[0] for r in search.iterEventIdAndDate(limit = 2, page_size = 1)] == [1, 2]
+        assert [r[0] for r in search.iterEventIdAndDate(offset = 1, page_size = 1)] == [2, 3]
+        assert [r[0] for r in search.iterEventIdAndDate(limit = 1, offset = 2)] == [3]
+        assert list(search.iterEventIdAndDate(limit = 0)) == []
+
+        with pytest.raises(Exception):
+            list(search.iterEventIdAndDate(order_by = "magnitude"))
+
+    def testIterEvents(self, setupdbWithEvents):
+        search = NordicSearch()
+
+        events = list(search.iterEvents(order_by = "origin_datetime", offset = 1, page_size = 1))
+        assert [e.event_id for e in events] == [2, 3]
+        assert str(events[0]) == str(search.searchEvents()[1])
+
+    def testSearchEventsOnServer(self, setupdbWithEvents):
+        search = NordicSearch()
+        search.addSearchOver("epicenter_latitude", 63.632)
+
+        events = search.searchEvents(server_side = True)
+        assert [e.event_id for e in events] == [1, 2, 3]
+        assert [str(e) for e in events] == [str(e) for e in sorted(search.searchEvents(), key = lambda e: e.event_id)]
+
+        search.addSearchExactly("event_desc_id", "P")
+        assert [e.event_id for e in search.iterEventsOnServer(batch_size = 1)] == [1]
+
+    def testCountEvents(self, setupdbWithEvents):
+        search = NordicSearch()
+        assert search.countEvents() == 3
+
+        search.addSearchExactly("solution_type", "F")
+        search.addSearchOver("origin_date", date(2017, 1, 1))
+        assert search.countEvents() == 2
+        assert [r[0] for r in search.iterEventIdAndDate()] == [2, 3]
+
 @pytest.mark.usefixtures("setupdbWithEvents", "nordicEvents")
 class TestSearchSameEvents(object):
     def testSearchSameEvent(self, setupdbWithEvents, nordicEvents):
@@ -170,3 +235,67 @@ class TestSearchSimilarEvents(object):
         events = searchSimilarEvents(e)
         assert len(events) == 1
 
+    def testSearchSimilarEventAcrossMidnight(self, setupdbWithEvents, nordicEvents):
+        e = nordic.readNordic(nordicEvents[0], False)
+        e.main_h[0].origin_date = date(2013, 1, 2)
+        e.main_h[0].origin_time = time(23, 59, 55)
+        nordic2sql.event2Database(e)
+
+        e = nordic.readNordic(nordicEvents[0], False)
+        e.main_h[0].origin_time = time(0, 0, 5)
+        events = searchSimilarEvents(e)
+
+        assert len(events) == 1
+        assert events[0].main_h[0].origin_date == date(2013, 1, 2)
+
+    def testSearchSimilarEventSkipsUnknownOriginTime(self, setupdbWithEvents, nordicEvents):
+        e = nordic.readNordic(nordicEvents[0], False)
+        e.main_h[0].origin_date = date(2014, 5, 5)
+        e.main_h[0].origin_time = None
+        nordic2sql.event2Database(e)
+
+        e = nordic.readNordic(nordicEvents[0], False)
+        e.main_h[0].origin_date = date(2014, 5, 5)
+        e.main_h[0].origin_time = time(0, 0, 5)
+
+        assert searchSimilarEvents(e) == []
+
+
+@pytest.mark.usefixtures("setupdbWithEvents", "nordicEvents")
+class TestSearchDuplicateCandidates(object):
+    def testDuplicateCandidatesMatchSingleSearches(self, setupdbWithEvents, nordicEvents):
+        events = [nordic.readNordic(e, False) for e in nordicEvents]
+        candidates = searchDuplicateCandidates(events)
+
+        for e, c in zip(events, candidates):
+            assert [s[0] for s in c.same] == [s.event_id for s in searchSameEvents(e)]
+            assert [s[0] for s in c.similar] == [s.event_id for s in searchSimilarEvents(e)]
+
+    def testDuplicateCandidatesInBatch(self, setupdbWithEvents, nordicEvents):
+        events = [nordic.readNordic(nordicEvents[0], False),
+                  nordic.readNordic(nordicEvents[1], False),
+                  nordic.readNordic(nordicEvents[0], False)]
+        events[2].main_h[0].epicenter_latitude += 0.1
+        candidates = searchDuplicateCandidates(events)
+
+        assert candidates[0].same_in_batch == []
+        assert candidates[2].same_in_batch == []
+        assert candidates[2].similar_in_batch == [0]
+        assert candidates[2].same == []
+        assert len(candidates[2].similar) == 1
+
+@pytest.mark.usefixtures("setupdbWithEvents", "nordicEvents")
+class TestSearchPagesWithoutOriginDatetime(object):
+    def testPagesIncludeEventsWithoutOriginDate(self, setupdbWithEvents, nordicEvents):
+        e = nordic.readNordic(nordicEvents[0], False)
+        e.main_h[0].origin_date = None
+        e.main_h[0].origin_time = None
+        nordic2sql.event2Database(e)
+
+        search = NordicSearch()
+        rows = list(search.iterEventIdAndDate())
+
+        assert len(rows) == search.countEvents()
+        assert rows[-1] == (e.event_id, None, None)
+        assert list(search.iterEventIdAndDate(page_size = 1)) == rows
+        assert [r[0] for r in search.iterEventIdAndDate(offset = len(rows) - 2, page_size = 1)] == [r[0] for r in rows[-2:]]
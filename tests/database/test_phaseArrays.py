@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+from nordb.database import sql2nordic
+from nordb.database.phaseArrays import getPhaseArrays
+from nordb.database.nordicSearch import NordicSearch
+
+@pytest.mark.usefixtures("setupdbWithEvents")
+class TestGetPhaseArrays(object):
+    def testPhaseArraysMatchEvents(self, setupdbWithEvents):
+        arrays = getPhaseArrays()
+        phase_data = []
+        for e in sorted(sql2nordic.getNordic([1, 2, 3]), key = lambda e: e.event_id):
+            phase_data.extend(sorted(e.data, key = lambda d: d.d_id))
+
+        assert len(arrays["d_id"]) == len(phase_data)
+        for i, data in enumerate(phase_data):
+            assert arrays["event_id"][i] == data.event_id
+            assert arrays["d_id"][i] == data.d_id
+            assert arrays["station_code_categories"][arrays["station_code"][i]] == data.station_code
+            assert arrays["observation_time"][i] == np.datetime64(data.observation_time)
+            if data.travel_time_residual is None:
+                assert np.isnan(arrays["travel_time_residual"][i])
+            else:
+                assert arrays["travel_time_residual"][i] == data.travel_time_residual
+            if data.epicenter_distance is None:
+                assert np.isnan(arrays["epicenter_distance"][i])
+            else:
+                assert arrays["epicenter_distance"][i] == data.epicenter_distance
+            if data.phase_type is None:
+                assert arrays["phase_type"][i] == -1
+            else:
+                assert arrays["phase_type_categories"][arrays["phase_type"][i]] == data.phase_type
+
+    def testPhaseArraysWithSearch(self, setupdbWithEvents):
+        search = NordicSearch()
+        search.addSearchExactly("event_id", 2)
+        arrays = getPhaseArrays(search)
+
+        assert len(arrays["event_id"]) > 0
+        assert (arrays["event_id"] == 2).all()
+        assert arrays["observation_time"].dtype == np.dtype("datetime64[us]")
+
+    def testPhaseArraysWithoutResults(self, setupdbWithEvents):
+        search = NordicSearch()
+        search.addSearchExactly("event_id", 100)
+        arrays = getPhaseArrays(search)
+
+        assert len(arrays["event_id"]) == 0
+        assert len(arrays["station_code_categories"]) == 0
+
+    def testPhaseArraysAsArrow(self, setupdbWithEvents):
+        pyarrow = pytest.importorskip("pyarrow")
+        table = getPhaseArrays(as_arrow = True)
+
+        assert table.num_rows == len(getPhaseArrays()["event_id"])
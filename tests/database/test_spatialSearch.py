@@ -0,0 +1,70 @@
+import pytest
+from nordb.database import spatialSearch
+from nordb.database.nordicSearch import NordicSearch
+from nordb.database.nordicSearch import searchNearestEvents
+from nordb.database.nordicSearch import searchEvents
+
+class TestBoundingBoxes(object):
+    def testBoxContainsCircle(self):
+        boxes = spatialSearch.boundingBoxes(60.0, 25.0, 100.0)
+
+        assert len(boxes) == 1
+        lat_min, lat_max, lon_min, lon_max = boxes[0]
+        assert lat_min < 60.0 - 0.89 and lat_max > 60.0 + 0.89
+        assert spatialSearch.haversineDistance(60.0, 25.0, 60.0, lon_max) >= 100.0
+
+    def testBoxIsSplitAtAntimeridian(self):
+        boxes = spatialSearch.boundingBoxes(0.0, 179.5, 200.0)
+
+        assert len(boxes) == 2
+        assert boxes[0][3] == 180.0
+        assert boxes[1][2] == -180.0
+        assert boxes[1][3] > -179.0
+
+    def testBoxCoversAllLongitudesAtPole(self):
+        boxes = spatialSearch.boundingBoxes(89.5, 10.0, 100.0)
+
+        assert boxes == [(pytest.approx(89.5 - 100.0 / 6371.0 * 57.29577951308232), 90.0, -180.0, 180.0)]
+
+    def testNegativeRadiusFails(self):
+        with pytest.raises(Exception):
+            spatialSearch.boundingBoxes(0.0, 0.0, -1.0)
+
+    def testHaversineDistance(self):
+        assert spatialSearch.haversineDistance(0.0, 0.0, 0.0, 1.0) == pytest.approx(111.195, abs = 0.001)
+        assert spatialSearch.haversineDistance(0.0, 179.5, 0.0, -179.5) == pytest.approx(111.195, abs = 0.001)
+
+    def testPolygonNeedsThreePoints(self):
+        with pytest.raises(Exception):
+            spatialSearch.polygonQuery("lat", "lon", [(0.0, 0.0), (1.0, 1.0)])
+
+@pytest.mark.usefixtures("setupdbWithEvents")
+class TestSpatialSearch(object):
+    def testSearchRadius(self, setupdbWithEvents):
+        search = NordicSearch()
+        search.addSearchRadius(63.6, 22.9, 10.0)
+        assert [e.event_id for e in search.searchEvents()] == [1]
+
+        search.clear()
+        search.addSearchRadius(63.6, 22.9, 300.0)
+        assert len(search.searchEvents()) == 3
+
+    def testSearchRadiusUsesGreatCircleDistance(self, setupdbWithEvents):
+        assert len(searchEvents(latitude = 63.635, longitude = 22.0, distance = 40.0)) == 1
+        assert len(searchEvents(latitude = 63.635, longitude = 22.0, distance = 33.0)) == 0
+
+    def testSearchPolygon(self, setupdbWithEvents):
+        search = NordicSearch()
+        search.addSearchPolygon([(63.0, 22.0), (64.0, 22.0), (64.0, 23.0), (63.0, 23.0)])
+
+        assert [e.event_id for e in search.searchEvents()] == [1]
+
+    def testSearchNearestEvents(self, setupdbWithEvents):
+        events = searchNearestEvents(64.8, 25.0, 2)
+
+        assert len(events) == 2
+        assert events[0].main_h[0].epicenter_latitude == 64.812
+        assert events[1].main_h[0].epicenter_latitude == 63.889
+
+    def testSearchNearestEventsFromFarAway(self, setupdbWithEvents):
+        assert len(searchNearestEvents(-60.0, -150.0, 10)) == 3
@@ -0,0 +1,85 @@
+import pytest
+from datetime import date
+from datetime import datetime
+from datetime import time
+from nordb.database import sql2nordic
+from nordb.core import usernameUtilities
+from nordb.nordic.nordicMain import NordicMain
+from nordb.nordic.nordicMacroseismic import NordicMacroseismic
+from nordb.nordic.nordicComment import NordicComment
+from nordb.nordic.nordicError import NordicError
+from nordb.nordic.nordicWaveform import NordicWaveform
+from nordb.nordic.nordicData import NordicData
+
+@pytest.mark.usefixtures("setupdbWithEvents")
+class TestIterNordic(object):
+    def testIterNordicMatchesGetNordic(self, setupdbWithEvents):
+        events = dict((e.event_id, str(e)) for e in sql2nordic.getNordic([1, 2, 3]))
+
+        for batch_size in [1, 2, 1000]:
+            iter_events = list(sql2nordic.iterNordic([3, 1, 2], batch_size = batch_size))
+
+            assert [e.event_id for e in iter_events] == [1, 2, 3]
+            for e in iter_events:
+                assert str(e) == events[e.event_id]
+
+    def testIterNordicWithoutIds(self, setupdbWithEvents):
+        assert list(sql2nordic.iterNordic([])) == []
+
+    def testIterNordicWithMissingIds(self, setupdbWithEvents):
+        assert [e.event_id for e in sql2nordic.iterNordic([2, 100])] == [2]
+
+    def testGetNordicJsonMatchesGetNordic(self, setupdbWithEvents):
+        events = dict((e.event_id, e) for e in sql2nordic.getNordic([1, 2, 3]))
+        json_events = sql2nordic.getNordicJson([3, 1, 2, 100])
+
+        assert [e.event_id for e in json_events] == [1, 2, 3]
+        for e in json_events:
+            assert str(e) == str(events[e.event_id])
+            assert [h.getAsList() for h in e.main_h] == [h.getAsList() for h in events[e.event_id].main_h]
+            assert [d.getAsList() for d in e.data] == [d.getAsList() for d in events[e.event_id].data]
+            assert e.creation_info.creation_date == events[e.event_id].creation_info.creation_date
+
+        assert sql2nordic.getNordicJson([]) == []
+
+    def testJsonRow2HeaderWithTrimmedFractions(self):
+        main_row = [None] * 24
+        main_row[NordicMain.ORIGIN_TIME] = "06:14:00.1"
+        main_row[NordicMain.ORIGIN_DATE] = "2013-01-03"
+        main_row = sql2nordic.jsonRow2Header(main_row, NordicMain.header_type)
+
+        assert main_row[NordicMain.ORIGIN_TIME] == time(6, 14, 0, 100000)
+        assert main_row[NordicMain.ORIGIN_DATE] == date(2013, 1, 3)
+
+        data_row = [None] * 21
+        for observation_time, expected in [("2013-01-03T06:13:15.3", datetime(2013, 1, 3, 6, 13, 15, 300000)),
+                                           ("2013-01-03T06:13:15.25", datetime(2013, 1, 3, 6, 13, 15, 250000)),
+                                           ("2013-01-03T06:13:15", datetime(2013, 1, 3, 6, 13, 15))]:
+            data_row[NordicData.OBSERVATION_TIME] = observation_time
+            assert sql2nordic.jsonRow2Header(data_row, NordicData.header_type)[NordicData.OBSERVATION_TIME] == expected
+
+    def testGetNordicRootIds(self, setupdbWithEvents):
+        root_id = sql2nordic.getEventRootId(1)
+
+        assert 1 in sql2nordic.getNordicRootIds(root_id)
+
+@pytest.mark.usefixtures("setupdbWithEvents")
+class TestFromDatabase(object):
+    def testFromDatabaseMatchesConstructor(self, setupdbWithEvents):
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+
+        for header_class in [NordicMain, NordicMacroseismic, NordicComment, NordicWaveform, NordicData]:
+            cur.execute(sql2nordic.SELECT_QUERY[header_class.header_type], ((1, 2, 3),))
+            for a in cur.fetchall():
+                header = header_class.fromDatabase(a)
+                assert header.getAsList() == header_class(a).getAsList()
+                assert str(header) == str(header_class(a))
+                assert not hasattr(header, "__dict__")
+
+        cur.execute("SELECT id FROM nordic_header_main")
+        cur.execute(sql2nordic.SELECT_QUERY[NordicError.header_type], (tuple(a[0] for a in cur.fetchall()),))
+        for a in cur.fetchall():
+            assert NordicError.fromDatabase(a).getAsList() == NordicError(a[:-1]).getAsList()
+
+        conn.close()
@@ -0,0 +1,93 @@
+import pytest
+import copy
+import numpy as np
+
+from nordb.core import usernameUtilities
+from nordb.database import response2sql
+from nordb.database import sql2response
+from nordb.nordic import response
+from nordb.nordic.instrument import Instrument
+
+def pazValues(paz_response):
+    return (paz_response.scale_factor,
+            sorted(map(list, paz_response.poles)),
+            sorted(map(list, paz_response.zeros)))
+
+class TestAssembleResponses(object):
+    def testAssembleResponses(self):
+        response_rows = [
+                            ("fap_1", "theoretical", 0, "instrument", "fap", "Kortstrom", 1),
+                            ("paz_2", "theoretical", 0, "instrument", "paz", "Kortstrom", 2),
+                            ("paz_3", "theoretical", 0, "instrument", "paz", "Kortstrom", 3),
+                            ("fap_4", "theoretical", 0, "instrument", "fap", "Kortstrom", 4),
+                        ]
+        fap_rows = [(0.1, 1.0, 0.0, 0.0, 0.0, 1), (0.2, 2.0, 0.0, 0.0, 0.0, 1)]
+        paz_rows = [(5.0, 2)]
+        pole_rows = [(-1.0, 1.0, 0.0, 0.0, 2), (-1.0, -1.0, 0.0, 0.0, 2)]
+        zero_rows = [(0.0, 0.0, 0.0, 0.0, 2)]
+
+        responses = sql2response.assembleResponses(response_rows, fap_rows, paz_rows, pole_rows, zero_rows)
+
+        assert sorted(responses.keys()) == [1, 2, 4]
+        assert responses[1].fap.tolist() == [list(f[:-1]) for f in fap_rows]
+        assert responses[2].scale_factor == 5.0
+        assert responses[2].poles.tolist() == [list(p[:-1]) for p in pole_rows]
+        assert responses[2].zeros.shape == (1, 4)
+        assert responses[4].fap.shape == (0, 5)
+
+@pytest.mark.usefixtures("setupdb", "responseFiles")
+class TestSQL2Response(object):
+    def testGetResponseFromDB(self, setupdb, responseFiles):
+        original = []
+        for resp in responseFiles:
+            original.append(response.readResponseArrayToResponse(resp[0], resp[1]))
+            response2sql.insertResponse2Database(original[-1])
+
+        fap_response = sql2response.getResponseFromDB(1)
+        assert isinstance(fap_response.fap, np.ndarray)
+        assert str(fap_response) == str(original[0])
+        assert pazValues(sql2response.getResponseFromDB(2)) == pazValues(original[1])
+
+        fap_copy = copy.copy(fap_response)
+        fap_copy.file_name = "fap_copy"
+        response2sql.insertResponse2Database(fap_copy)
+        assert str(sql2response.getResponseFromDB(3)) == str(original[0])
+
+    def testNullPhaseStaysNull(self, setupdb, responseFiles):
+        response2sql.insertResponse2Database(response.readResponseArrayToResponse(responseFiles[0][0], responseFiles[0][1]))
+        conn = usernameUtilities.log2nordb()
+        cur = conn.cursor()
+        cur.execute("UPDATE fap SET phase = NULL")
+        conn.commit()
+
+        fap_response = sql2response.getResponseFromDB(1)
+        assert np.isnan(fap_response.fap[:, 2]).all()
+        fap_response.file_name = "fap_copy"
+        response2sql.insertResponse2Database(fap_response)
+
+        cur.execute("SELECT COUNT(*) FROM fap WHERE phase IS NULL")
+        null_phases = cur.fetchone()[0]
+        cur.execute("SELECT COUNT(*) FROM fap")
+        faps = cur.fetchone()[0]
+        conn.close()
+
+        assert null_phases == faps
+
+    def testResponses2Instruments(self, setupdb, responseFiles):
+        original = []
+        for resp in responseFiles:
+            original.append(response.readResponseArrayToResponse(resp[0], resp[1]))
+            response2sql.insertResponse2Database(original[-1])
+
+        instruments = []
+        for response_id in [1, 2, 1, 5]:
+            instrument = Instrument()
+            instrument.response_id = response_id
+            instruments.append(instrument)
+
+        sql2response.responses2instruments(instruments)
+
+        assert str(instruments[0].response) == str(original[0])
+        assert pazValues(instruments[1].response) == pazValues(original[1])
+        assert instruments[2].response is instruments[0].response
+        assert getattr(instruments[3], "response", None) is None
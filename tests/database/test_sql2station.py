@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime
 
 from nordb.database import station2sql
 from nordb.database import sitechan2sql
@@ -8,6 +9,7 @@ from nordb.database import response2sql
 from nordb.database import sql2station
 from nordb.database.norDBManagement import countStations
 from nordb.core import usernameUtilities
+from nordb.core.nordic import readNordic
 from nordb.nordic import station
 from nordb.nordic import sitechan
 from nordb.nordic import sensor
@@ -76,3 +78,67 @@ class TestSQL2Station(object):
 
         assert str(stat).strip() == stationFiles[0].strip()
 
+
+    def testGetStationsNearPoint(self, setupdb, stationFiles):
+        for stat in stationFiles:
+            stat = station.readStationStringToStation(stat, "HE")
+            station2sql.insertStation2Database(stat, stat.network)
+
+        stations = sql2station.getStationsNearPoint(50.69, 29.21, 10.0)
+        assert sorted(stat.station_code for stat in stations) == ["AK01", "AK02", "AK03"]
+
+        stations = sql2station.getStationsNearPoint(-13.9, 179.5, 1500.0)
+        assert [stat.station_code for stat in stations] == ["AFI"]
+
+    def testGetNearestStations(self, setupdb, stationFiles):
+        for stat in stationFiles:
+            stat = station.readStationStringToStation(stat, "HE")
+            station2sql.insertStation2Database(stat, stat.network)
+
+        stations = sql2station.getNearestStations(50.66, 29.2, 2)
+
+        assert [stat.station_code for stat in stations] == ["AK02", "AK01"]
+
+    def testGetStationsByCodeMatchesIds(self, setupdb, stationFiles, responseFiles,
+                                        siteChanFiles, instrumentFiles, sensorFiles):
+        for resp in responseFiles:
+            response2sql.insertResponse2Database(response.readResponseArrayToResponse(resp[0], resp[1]))
+        for stat in stationFiles:
+            stat = station.readStationStringToStation(stat, "HE")
+            station2sql.insertStation2Database(stat, stat.network)
+        for chan in siteChanFiles:
+            sitechan2sql.insertSiteChan2Database(sitechan.readSiteChanStringToSiteChan(chan))
+        for ins in instrumentFiles:
+            instrument2sql.insertInstrument2Database(instrument.readInstrumentStringToInstrument(ins))
+        for sen in sensorFiles:
+            sensor2sql.insertSensor2Database(sensor.readSensorStringToSensor(sen))
+
+        codes = ["AFI", "AK01", "AK02", "AK03", "AKTO", "AL31"]
+        for station_date in [datetime(2000, 1, 1), datetime(2004, 11, 30), datetime(2008, 1, 1), datetime(2011, 1, 1)]:
+            by_code = sql2station.getStations(codes, station_date)
+            by_id = sql2station.getStations([stat.s_id for stat in by_code], station_date)
+            by_id = dict((stat.s_id, stat) for stat in by_id)
+
+            assert len(by_code) == len(by_id)
+            for stat in by_code:
+                other = by_id[stat.s_id]
+                assert str(stat) == str(other)
+                assert sorted(str(chan) for chan in stat.sitechans) == sorted(str(chan) for chan in other.sitechans)
+                assert (sorted(str(sen) for chan in stat.sitechans for sen in chan.sensors) ==
+                        sorted(str(sen) for chan in other.sitechans for sen in chan.sensors))
+
+    def testGetStationsOfEvents(self, setupdb, stationFiles, nordicEvents):
+        for stat in stationFiles:
+            stat = station.readStationStringToStation(stat, "HE")
+            station2sql.insertStation2Database(stat, stat.network)
+
+        nordic_events = [readNordic(ev, False) for ev in nordicEvents[:2]]
+        for pick, code in zip(nordic_events[0].data, ["AK02", "AFI", "AK02", "AL31"]):
+            pick.station_code = code
+        for pick in nordic_events[1].data:
+            pick.station_code = "AK01"
+
+        event_stations = sql2station.getStationsOfEvents(nordic_events)
+
+        assert [[stat.station_code for stat in stations] for stations in event_stations] == [["AK02", "AFI"], ["AK01"]]
+        assert [stat.station_code for stat in nordic_events[0].getStations()] == ["AK02", "AFI"]